@@ -0,0 +1,160 @@
+# Backend/admissions/approvals.py
+
+"""
+Approval of admission applications, one or many at a time.
+
+Approving an application marks it reviewed and makes sure the student has
+an active, approved User and a UserProfile with a student UID. Work is done
+per chunk in one transaction with a fixed number of queries: users and
+profiles are written with bulk_create / bulk_update, and each
+(year, school, class, batch) gets its UIDs as one contiguous block.
+
+Re-approving is safe: existing users are reused and existing UIDs kept.
+"""
+
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from users.models import UserProfile
+from users.services import allocate_student_uids
+from .models import AdmissionApplication
+
+User = get_user_model()
+
+DEFAULT_CHUNK_SIZE = 200
+
+# Applications carry no school reference; kept for the UID format.
+UNKNOWN_SCHOOL_CODE = "UNK"
+
+
+def _split_name(full_name):
+    first, _, last = (full_name or "").strip().rpartition(" ")
+    return (first or None), (last or "Student")
+
+
+def _uid_key(app):
+    return (
+        timezone.localtime(app.created_at).year,
+        UNKNOWN_SCHOOL_CODE,
+        app.current_class,
+        app.batch.batch_number,
+    )
+
+
+def _ensure_users(apps):
+    """Link every application to a user, creating missing ones in bulk."""
+    missing = [app for app in apps if app.user_id is None]
+    if missing:
+        wanted = {
+            app.pk: User.objects.normalize_email(app.student_email or f"student_{app.pk}@example.com")
+            for app in missing
+        }
+        existing = {u.email: u for u in User.objects.filter(email__in=set(wanted.values()))}
+
+        new_users = {}
+        for app in missing:
+            email = wanted[app.pk]
+            if email in existing:
+                app.user = existing[email]
+                continue
+            if email in new_users:
+                # Siblings sharing a contact email each get their own account
+                email = f"student_{app.pk}@example.com"
+            f_name, l_name = _split_name(app.student_name)
+            user = User(
+                email=email,
+                f_name=f_name,
+                l_name=l_name,
+                phone=app.student_mobile,
+                is_active=True,
+                is_approved=True,
+            )
+            # Students set a password through the reset flow; skips hashing per row
+            user.set_unusable_password()
+            new_users[email] = user
+            app.user = user
+        User.objects.bulk_create(new_users.values())
+        for app in missing:
+            app.user_id = app.user.pk
+
+    # Accounts that existed before approval (e.g. self-registered)
+    User.objects.filter(pk__in={app.user_id for app in apps}).filter(
+        Q(is_active=False) | Q(is_approved=False)
+    ).update(is_active=True, is_approved=True)
+
+
+def _ensure_profiles(apps):
+    """Create / update profiles and hand out UIDs in contiguous blocks."""
+    profiles = {p.user_id: p for p in UserProfile.objects.filter(user_id__in=[a.user_id for a in apps])}
+
+    needs_uid = defaultdict(list)
+    queued = set()  # user ids; one student may have several applications
+    to_create, to_update = [], []
+    for app in apps:
+        profile = profiles.get(app.user_id)
+        if profile is None:
+            profile = UserProfile(user_id=app.user_id, phone=app.student_mobile or "")
+            profiles[app.user_id] = profile
+            to_create.append(profile)
+        elif profile not in to_update:
+            to_update.append(profile)
+        profile.current_class = app.current_class
+        profile.group_name = app.batch.group_name or ""
+        profile.school_name = app.ssc_school_name or app.jsc_school_name or ""
+        profile.current_batch_id = app.batch_id
+        if not profile.student_uid and app.user_id not in queued:
+            queued.add(app.user_id)
+            needs_uid[_uid_key(app)].append(profile)
+
+    for key in sorted(needs_uid):
+        block = needs_uid[key]
+        for profile, uid in zip(block, allocate_student_uids(*key, len(block))):
+            profile.student_uid = uid
+
+    UserProfile.objects.bulk_create(to_create)
+    if to_update:
+        now = timezone.now()
+        for profile in to_update:
+            profile.updated_at = now
+        UserProfile.objects.bulk_update(
+            to_update,
+            ["current_class", "group_name", "school_name", "current_batch", "student_uid", "updated_at"],
+        )
+
+
+def _approve_chunk(ids):
+    with transaction.atomic():
+        apps = list(
+            AdmissionApplication.objects.select_for_update(of=("self",))
+            .select_related("batch", "user")
+            .filter(pk__in=ids)
+            .order_by("pk")
+        )
+        if not apps:
+            return []
+        _ensure_users(apps)
+        _ensure_profiles(apps)
+
+        now = timezone.now()
+        for app in apps:
+            app.is_reviewed = True
+            app.updated_at = now
+        AdmissionApplication.objects.bulk_update(apps, ["user", "is_reviewed", "updated_at"])
+    return [app.pk for app in apps]
+
+
+def approve_applications(ids, *, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Approve the given application ids.
+    Returns {"approved": [ids], "not_found": [ids]}.
+    """
+    ids = sorted(set(ids))
+    approved = []
+    for start in range(0, len(ids), chunk_size):
+        approved += _approve_chunk(ids[start:start + chunk_size])
+    found = set(approved)
+    return {"approved": approved, "not_found": [pk for pk in ids if pk not in found]}
@@ -1,5 +1,7 @@
 # Backend/admissions/apps.py
 from django.apps import AppConfig
+from django.core import checks
+from django.db.models.signals import post_migrate
 
 
 class AdmissionsConfig(AppConfig):
@@ -7,3 +9,8 @@ class AdmissionsConfig(AppConfig):
     name = 'admissions'
     def ready(self):
         import admissions.receivers 
+        from admissions.archive import sync_archive_tables_after_migrate
+        from admissions.checks import check_queued_intake
+
+        post_migrate.connect(sync_archive_tables_after_migrate, sender=self)
+        checks.register(check_queued_intake)
@@ -0,0 +1,176 @@
+# Backend/admissions/archive.py
+
+"""
+Yearly archival of past admission seasons.
+
+A season is the calendar year (local time) of AdmissionApplication.created_at.
+`manage.py archive_admissions YEAR` moves a season's applications together
+with their guardians, seat holds and payments into same-named tables in the
+"archive" Postgres schema, so the live tables and their indexes only carry
+current data. Idempotency keys and intake tickets of archived applications
+are dropped.
+
+Archived rows stay readable through the "archive" database alias, whose
+search_path puts the archive schema first, so the normal models work:
+
+    AdmissionApplication.objects.using("archive").filter(batch=batch)
+
+Archive tables are created / kept in step with the live columns after every
+migrate. They carry no foreign keys and only the indexes needed to move rows.
+"""
+
+from collections import Counter
+from datetime import datetime
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.utils import timezone
+
+from payments.models import Payment
+from .models import (
+    AdmissionApplication,
+    AdmissionIdempotencyKey,
+    AdmissionIntakeTicket,
+    Guardian,
+    SeatHold,
+)
+
+ARCHIVE_DB = "archive"
+ARCHIVE_SCHEMA = "archive"
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Parents first; the column ties each row to its application
+ARCHIVED_MODELS = (
+    (AdmissionApplication, "id"),
+    (Guardian, "application_id"),
+    (SeatHold, "application_id"),
+    (Payment, "application_id"),
+)
+# Short-lived rows pointing at applications; deleted rather than archived
+DROPPED_MODELS = (AdmissionIdempotencyKey, AdmissionIntakeTicket)
+
+
+def _qn(name):
+    return connection.ops.quote_name(name)
+
+
+def _archived(table):
+    return f"{_qn(ARCHIVE_SCHEMA)}.{_qn(table)}"
+
+
+def _columns(cursor, relation):
+    """{name: type} of a table, or None if it does not exist."""
+    cursor.execute("SELECT to_regclass(%s)", [relation])
+    if cursor.fetchone()[0] is None:
+        return None
+    cursor.execute(
+        """
+        SELECT attname, format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+        ORDER BY attnum
+        """,
+        [relation],
+    )
+    return dict(cursor.fetchall())
+
+
+def sync_archive_tables(using=DEFAULT_DB_ALIAS):
+    """
+    Create missing archive tables and columns. Columns that no longer exist
+    live are kept (old rows still have them) but made nullable.
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {_qn(ARCHIVE_SCHEMA)}")
+        for model, link in ARCHIVED_MODELS:
+            table = model._meta.db_table
+            live = _columns(cursor, _qn(table))
+            if live is None:
+                continue
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {_archived(table)} "
+                f"(LIKE {_qn(table)} INCLUDING DEFAULTS)"
+            )
+            archived = _columns(cursor, _archived(table))
+            for name, type_ in live.items():
+                if name not in archived:
+                    cursor.execute(f"ALTER TABLE {_archived(table)} ADD COLUMN {_qn(name)} {type_}")
+            for name in archived.keys() - live.keys():
+                cursor.execute(f"ALTER TABLE {_archived(table)} ALTER COLUMN {_qn(name)} DROP NOT NULL")
+            cursor.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {_qn(table + '_pk')} ON {_archived(table)} (id)"
+            )
+            if link != "id":
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_qn(f'{table}_{link}')} ON {_archived(table)} ({_qn(link)})"
+                )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {_qn('admissions_admissionapplication_created_at')} "
+            f"ON {_archived(AdmissionApplication._meta.db_table)} (created_at)"
+        )
+
+
+def sync_archive_tables_after_migrate(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    if using == DEFAULT_DB_ALIAS:
+        sync_archive_tables(using)
+
+
+def season_bounds(year):
+    """[start, end) of a season as aware datetimes in the current timezone."""
+    return (
+        timezone.make_aware(datetime(year, 1, 1)),
+        timezone.make_aware(datetime(year + 1, 1, 1)),
+    )
+
+
+def _move_chunk(cursor, ids, *, to_archive):
+    moved = {}
+    for model, link in ARCHIVED_MODELS:
+        table = model._meta.db_table
+        source, target = (_qn(table), _archived(table))
+        if not to_archive:
+            source, target = target, source
+        # Only columns both sides have; drifted ones keep their defaults
+        columns = ", ".join(
+            _qn(name)
+            for name in _columns(cursor, source).keys() & _columns(cursor, target).keys()
+        )
+        cursor.execute(
+            f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {source} "
+            f"WHERE {_qn(link)} = ANY(%s) ON CONFLICT (id) DO NOTHING",
+            [ids],
+        )
+    if to_archive:
+        for model in DROPPED_MODELS:
+            cursor.execute(
+                f"DELETE FROM {_qn(model._meta.db_table)} WHERE application_id = ANY(%s)", [ids]
+            )
+    for model, link in reversed(ARCHIVED_MODELS):
+        table = model._meta.db_table
+        source = _qn(table) if to_archive else _archived(table)
+        cursor.execute(f"DELETE FROM {source} WHERE {_qn(link)} = ANY(%s)", [ids])
+        moved[model._meta.label] = cursor.rowcount
+    return moved
+
+
+def move_season(year, *, to_archive=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Move one season into the archive (or back with to_archive=False), one
+    transaction per `chunk_size` applications, bypassing model signals.
+    Safe to re-run after an interruption. Returns rows moved per model label.
+    """
+    start, end = season_bounds(year)
+    applications = AdmissionApplication._meta.db_table
+    source = _qn(applications) if to_archive else _archived(applications)
+    totals = Counter()
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT id FROM {source} WHERE created_at >= %s AND created_at < %s "
+                f"ORDER BY id LIMIT %s FOR UPDATE",
+                [start, end, chunk_size],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                return dict(totals)
+            totals.update(_move_chunk(cursor, ids, to_archive=to_archive))
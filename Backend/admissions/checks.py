@@ -0,0 +1,17 @@
+# Backend/admissions/checks.py
+
+from django.conf import settings
+from django.core import checks
+
+
+def check_queued_intake(app_configs, **kwargs):
+    if settings.ADMISSIONS_QUEUED_INTAKE and settings.CELERY_TASK_ALWAYS_EAGER:
+        return [
+            checks.Warning(
+                "ADMISSIONS_QUEUED_INTAKE is on but Celery tasks run eagerly, so every "
+                "queued application is still created inside the request.",
+                hint="Set CELERY_BROKER_URL and run workers, or turn queued intake off.",
+                id="admissions.W001",
+            )
+        ]
+    return []
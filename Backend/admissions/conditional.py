@@ -0,0 +1,80 @@
+# Backend/admissions/conditional.py
+
+"""
+Conditional GET (ETag / Last-Modified) for admission reads.
+
+Validators come from a small aggregate over updated_at (the application's,
+its batch's and its course's, all of which appear in the body) taken over
+exactly the rows the response returns, so a matching If-None-Match /
+If-Modified-Since is answered with 304 before any row is loaded or
+serialized. Guardian writes touch the application's updated_at (see
+receivers), so they invalidate too.
+"""
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+# Bump when the serialized representation changes shape.
+REPRESENTATION_VERSION = 1
+
+
+def _etag(request, *parts):
+    raw = "|".join(
+        str(p)
+        for p in (REPRESENTATION_VERSION, request.user.pk, request.get_full_path(), *parts)
+    )
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def _latest(*stamps):
+    stamps = [s for s in stamps if s is not None]
+    return max(stamps) if stamps else None
+
+
+# values() needed by detail_validators
+DETAIL_VALIDATOR_FIELDS = ("updated_at", "batch__updated_at", "batch__course__updated_at")
+
+
+def list_validators(request, qs):
+    """
+    (etag, last_modified) for the rows `qs` returns. Pass the sliced page
+    query, not the whole filtered list, so only the page is aggregated.
+    """
+    if not qs.query.is_sliced:
+        qs = qs.order_by()
+    agg = qs.aggregate(
+        n=Count("id"),
+        last=Max("updated_at"),
+        batch_last=Max("batch__updated_at"),
+        course_last=Max("batch__course__updated_at"),
+    )
+    last_modified = _latest(agg["last"], agg["batch_last"], agg["course_last"])
+    return _etag(request, agg["n"], last_modified), last_modified
+
+
+def detail_validators(request, row):
+    """row: values() dict with DETAIL_VALIDATOR_FIELDS."""
+    last_modified = _latest(*(row[name] for name in DETAIL_VALIDATOR_FIELDS))
+    return _etag(request, last_modified), last_modified
+
+
+def not_modified(request, etag, last_modified):
+    """A 304 (or 412) response when the client's copy is current, else None."""
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def with_validators(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    # Browsers keep a private copy but revalidate on every use
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Authorization", "Cookie"))
+    return response
@@ -0,0 +1,110 @@
+# Backend/admissions/duplicates.py
+
+"""
+Duplicate-application detection.
+
+An application's fingerprint is its batch, date of birth and normalized
+mobile number (falling back to the normalized student name when there is
+no mobile), so "01711-000111", "+8801711000111" and "1711 000 111" for the
+same child in the same batch collide. The fingerprint is indexed; checking
+new applications is one index lookup however large the table is.
+"""
+
+import re
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Count
+
+from .models import AdmissionApplication, AdmissionStatus
+
+CLUSTER_ROW_FIELDS = (
+    "id",
+    "student_name",
+    "student_mobile",
+    "date_of_birth",
+    "batch",
+    "status",
+    "possible_duplicate",
+    "created_at",
+)
+
+_NON_DIGITS = re.compile(r"\D+")
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_mobile(raw) -> str:
+    """Bangladeshi mobile numbers in their 11-digit local form (01XXXXXXXXX)."""
+    digits = _NON_DIGITS.sub("", raw or "")
+    if digits.startswith("880"):
+        digits = digits[3:]
+    if len(digits) == 10 and digits.startswith("1"):
+        digits = "0" + digits
+    return digits[-11:]
+
+
+def normalize_name(raw) -> str:
+    return _NON_WORD.sub("", (raw or "").casefold())
+
+
+def fingerprint(app) -> str:
+    if not app.batch_id or not app.date_of_birth:
+        return ""
+    mobile = normalize_mobile(app.student_mobile)
+    who = f"m:{mobile}" if mobile else f"n:{normalize_name(app.student_name)}"
+    if who in ("m:", "n:"):
+        return ""
+    return f"{app.batch_id}|{app.date_of_birth.isoformat()}|{who}"[:160]
+
+
+def _live():
+    return AdmissionApplication.objects.exclude(status=AdmissionStatus.CANCELLED)
+
+
+def flag_duplicates(apps):
+    """
+    Set duplicate_fingerprint and possible_duplicate on unsaved applications
+    (in order) with a single query; later entries in `apps` that repeat an
+    earlier one are flagged too.
+    """
+    for app in apps:
+        app.duplicate_fingerprint = fingerprint(app)
+    prints = {app.duplicate_fingerprint for app in apps if app.duplicate_fingerprint}
+    if not prints:
+        return
+    seen = set(
+        _live().filter(duplicate_fingerprint__in=prints).values_list("duplicate_fingerprint", flat=True)
+    )
+    for app in apps:
+        fp = app.duplicate_fingerprint
+        if fp:
+            app.possible_duplicate = fp in seen
+            seen.add(fp)
+
+
+def duplicate_clusters(qs, *, limit):
+    """
+    Groups of live applications in `qs` sharing a fingerprint, largest
+    first: [{"fingerprint", "count", "applications": [...]}, ...].
+    """
+    clusters = list(
+        qs.exclude(status=AdmissionStatus.CANCELLED)
+        .exclude(duplicate_fingerprint="")
+        .order_by()
+        .values("duplicate_fingerprint")
+        .annotate(count=Count("id"), ids=ArrayAgg("id", ordering="id"))
+        .filter(count__gt=1)
+        .order_by("-count", "duplicate_fingerprint")[:limit]
+    )
+    ids = [pk for cluster in clusters for pk in cluster["ids"]]
+    rows = {
+        row["id"]: row
+        for row in AdmissionApplication.objects.filter(pk__in=ids).values(*CLUSTER_ROW_FIELDS)
+    }
+    return [
+        {
+            "fingerprint": c["duplicate_fingerprint"],
+            "count": c["count"],
+            "applications": [rows[pk] for pk in c["ids"] if pk in rows],
+        }
+        for c in clusters
+    ]
@@ -0,0 +1,222 @@
+# Backend/admissions/exports.py
+
+"""
+Streaming CSV / XLSX export of admission applications.
+
+Rows are read with QuerySet.iterator(chunk_size=...) and guardians are
+prefetched once per chunk, so worker memory stays flat however many rows are
+exported. XLSX is written as a zip stream (no seeking) with inline strings,
+which keeps it dependency-free and streamable.
+"""
+
+import csv
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from .models import GuardianRole
+
+
+def _guardian(app, role):
+    for g in app.guardians.all():
+        if g.role == role:
+            return g
+    return None
+
+
+def _primary_contact(app):
+    for g in app.guardians.all():
+        if g.is_primary_contact:
+            return g.role
+    return ""
+
+
+def _batch_label(app):
+    batch = app.batch
+    if batch is None:
+        return ""
+    course = batch.course
+    parts = [course.grade_level if course else "", f"Batch {batch.batch_number}"]
+    return " ".join(p for p in parts if p)
+
+
+def _guardian_columns(role, prefix):
+    return [
+        (f"{prefix}_name", lambda a: getattr(_guardian(a, role), "name", "")),
+        (f"{prefix}_phone", lambda a: getattr(_guardian(a, role), "contact_number", "")),
+        (f"{prefix}_occupation", lambda a: getattr(_guardian(a, role), "occupation", "")),
+    ]
+
+
+EXPORT_COLUMNS = [
+    ("id", lambda a: a.id),
+    ("student_name", lambda a: a.student_name),
+    ("student_nick_name", lambda a: a.student_nick_name),
+    ("date_of_birth", lambda a: a.date_of_birth.isoformat() if a.date_of_birth else ""),
+    ("sex", lambda a: a.sex),
+    ("current_class", lambda a: a.current_class),
+    ("group_name", lambda a: a.group_name),
+    ("subject", lambda a: a.subject),
+    ("batch_id", lambda a: a.batch_id),
+    ("batch", _batch_label),
+    ("student_mobile", lambda a: a.student_mobile),
+    ("student_email", lambda a: a.student_email),
+    ("home_district", lambda a: a.home_district),
+    ("home_location", lambda a: a.home_location),
+    ("jsc_school_name", lambda a: a.jsc_school_name),
+    ("jsc_result", lambda a: a.jsc_result),
+    ("ssc_school_name", lambda a: a.ssc_school_name),
+    ("ssc_result", lambda a: a.ssc_result),
+    ("hear_about_us", lambda a: a.hear_about_us),
+    ("prev_student", lambda a: a.prev_student),
+    ("status", lambda a: a.status),
+    ("is_reviewed", lambda a: a.is_reviewed),
+    ("created_at", lambda a: a.created_at.isoformat() if a.created_at else ""),
+    *_guardian_columns(GuardianRole.FATHER, "father"),
+    *_guardian_columns(GuardianRole.MOTHER, "mother"),
+    *_guardian_columns(GuardianRole.OTHER, "other_guardian"),
+    ("primary_contact", _primary_contact),
+]
+
+EXPORT_HEADERS = [name for name, _ in EXPORT_COLUMNS]
+
+# Text a spreadsheet would read as a formula (values come from the public form)
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_export_rows(qs, *, chunk_size):
+    """
+    Yield one list of cell values per application. Guardians are fetched in
+    bulk for every `chunk_size` applications.
+    """
+    qs = qs.select_related("batch__course").prefetch_related("guardians").order_by("id")
+    for app in qs.iterator(chunk_size=chunk_size):
+        yield [_cell(getter(app)) for _, getter in EXPORT_COLUMNS]
+
+
+# ---------- CSV ----------
+
+
+class _Echo:
+    """File-like object whose write() just returns the value (for csv.writer)."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    # BOM so Excel opens Bangla names as UTF-8
+    yield "\ufeff" + writer.writerow(EXPORT_HEADERS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+# ---------- XLSX ----------
+
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Admissions" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+class _ChunkBuffer:
+    """
+    Write-only, unseekable sink for zipfile; drained after every chunk so the
+    compressed bytes never accumulate in memory.
+    """
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _xlsx_row(values):
+    cells = []
+    for value in values:
+        if isinstance(value, bool):
+            cells.append(f'<c t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, int):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            text = escape(_ILLEGAL_XML.sub("", str(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return "<row>" + "".join(cells) + "</row>"
+
+
+def stream_xlsx(rows, *, flush_every=500):
+    buf = _ChunkBuffer()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK)
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        yield buf.drain()
+
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((_SHEET_HEAD + _xlsx_row(EXPORT_HEADERS)).encode("utf-8"))
+            for i, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row).encode("utf-8"))
+                if i % flush_every == 0:
+                    data = buf.drain()
+                    if data:
+                        yield data
+            sheet.write(_SHEET_TAIL.encode("utf-8"))
+    yield buf.drain()
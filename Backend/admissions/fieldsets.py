@@ -0,0 +1,59 @@
+# Backend/admissions/fieldsets.py
+
+"""
+Sparse fieldsets for AdmissionApplicationSerializer responses.
+
+    ?fields=id,student_name,status       only these keys (and columns)
+    ?fields=id,student_name&expand=guardians,batch_detail
+                                         plus the named relations
+
+Without `fields` the full representation is returned, as before. Relations
+that are not requested are neither joined nor prefetched.
+"""
+
+from rest_framework.exceptions import ValidationError
+
+EXPANDABLE = ("guardians", "batch_detail")
+
+# Columns the views need whatever the client asked for (keyset cursor,
+# ownership check on detail).
+_ALWAYS_LOADED = ("id", "created_at", "user")
+
+
+def _split(raw):
+    return [part.strip() for part in (raw or "").split(",") if part.strip()]
+
+
+def parse_fieldset(params, available):
+    """
+    Return the set of serializer field names to render, or None for all.
+    Raises ValidationError (400) on unknown names.
+    """
+    fields, expand = _split(params.get("fields")), _split(params.get("expand"))
+    unknown = [f for f in fields if f not in available]
+    if unknown:
+        raise ValidationError({"fields": f"Unknown field(s): {', '.join(unknown)}."})
+    bad_expand = [f for f in expand if f not in EXPANDABLE]
+    if bad_expand:
+        raise ValidationError(
+            {"expand": f"Can only expand {', '.join(EXPANDABLE)}; got {', '.join(bad_expand)}."}
+        )
+    if not fields:
+        return None
+    return set(fields) | set(expand)
+
+
+def narrow_queryset(qs, fields):
+    """Restrict `qs` to the columns and relations `fields` needs."""
+    if fields is None:
+        return qs
+    model_fields = {f.name for f in qs.model._meta.concrete_fields}
+    columns = set(_ALWAYS_LOADED) | (fields & model_fields)
+
+    if "batch_detail" in fields:
+        columns.add("batch")
+    else:
+        qs = qs.select_related(None)
+    if "guardians" not in fields:
+        qs = qs.prefetch_related(None)
+    return qs.only(*sorted(columns))
@@ -0,0 +1,101 @@
+# Backend/admissions/filters.py
+
+import datetime
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import HEAR_ABOUT_US_CHOICES, AdmissionStatus
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+_HEAR_ABOUT_US = {key for key, _ in HEAR_ABOUT_US_CHOICES}
+
+
+def _parse_bool(name, raw):
+    value = raw.strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    raise ValidationError({name: "Expected true or false."})
+
+
+def _parse_moment(name, raw, *, end_of_day=False):
+    """
+    Accept either an ISO datetime or a plain date. A plain date used as an
+    upper bound covers the whole day.
+    """
+    try:
+        d = parse_date(raw)
+        dt = None if d else parse_datetime(raw)
+    except ValueError:
+        d = dt = None
+    if d is not None:
+        dt = datetime.datetime.combine(d, datetime.time.min)
+        if end_of_day:
+            dt += datetime.timedelta(days=1)
+    if dt is None:
+        raise ValidationError({name: "Expected an ISO date or datetime."})
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt, timezone.get_default_timezone())
+    return dt
+
+
+def filter_admissions(qs, params):
+    """
+    Narrow an AdmissionApplication queryset from dashboard query params.
+
+    Supported params (all optional, combined with AND):
+      - status          PENDING / PAID / CANCELLED (comma-separated for several)
+      - batch           batch id (comma-separated for several)
+      - current_class   exact class value, e.g. 'class-10'
+      - is_reviewed     true / false
+      - hear_about_us   one of HEAR_ABOUT_US_CHOICES
+      - created_after   ISO date/datetime, inclusive
+      - created_before  ISO date/datetime, exclusive (a plain date includes that day)
+
+    Raises ValidationError (HTTP 400) on malformed values.
+    """
+    status_raw = params.get("status")
+    if status_raw:
+        statuses = [s.strip().upper() for s in status_raw.split(",") if s.strip()]
+        invalid = [s for s in statuses if s not in AdmissionStatus.values]
+        if invalid:
+            raise ValidationError({"status": f"Unknown status: {', '.join(invalid)}"})
+        qs = qs.filter(status__in=statuses)
+
+    batch_raw = params.get("batch")
+    if batch_raw:
+        try:
+            batch_ids = [int(b) for b in batch_raw.split(",") if b.strip()]
+        except ValueError:
+            raise ValidationError({"batch": "Expected batch id(s)."})
+        qs = qs.filter(batch_id__in=batch_ids)
+
+    current_class = params.get("current_class")
+    if current_class:
+        qs = qs.filter(current_class=current_class.strip())
+
+    is_reviewed = params.get("is_reviewed")
+    if is_reviewed:
+        qs = qs.filter(is_reviewed=_parse_bool("is_reviewed", is_reviewed))
+
+    hear_about_us = params.get("hear_about_us")
+    if hear_about_us:
+        if hear_about_us not in _HEAR_ABOUT_US:
+            raise ValidationError({"hear_about_us": "Unknown value."})
+        qs = qs.filter(hear_about_us=hear_about_us)
+
+    created_after = params.get("created_after")
+    if created_after:
+        qs = qs.filter(created_at__gte=_parse_moment("created_after", created_after))
+
+    created_before = params.get("created_before")
+    if created_before:
+        qs = qs.filter(
+            created_at__lt=_parse_moment("created_before", created_before, end_of_day=True)
+        )
+
+    return qs
@@ -0,0 +1,88 @@
+# Backend/admissions/idempotency.py
+
+"""
+Idempotency-Key support for AdmissionApply.
+
+The key row is inserted in the same transaction as the application, so a
+retry either sees the committed response or (when racing the first request)
+blocks on the unique index and then replays it. Nothing is half-recorded.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import AdmissionIdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class KeyReused(Exception):
+    """The key was already used for a different payload."""
+
+
+def _cutoff():
+    return timezone.now() - timedelta(hours=settings.ADMISSION_IDEMPOTENCY_TTL_HOURS)
+
+
+def request_fingerprint(data, photo=None) -> str:
+    digest = hashlib.sha256(
+        json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    )
+    if photo is not None:
+        digest.update(f"|photo:{photo.name}:{photo.size}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def replay(key, fingerprint):
+    """
+    Return the stored response body for a live key, or None.
+    Raises KeyReused if the key belongs to a different payload.
+    """
+    record = (
+        AdmissionIdempotencyKey.objects.filter(key=key, created_at__gt=_cutoff())
+        .only("request_fingerprint", "response_body")
+        .first()
+    )
+    if record is None:
+        return None
+    if record.request_fingerprint != fingerprint:
+        raise KeyReused
+    return record.response_body
+
+
+def run_once(key, fingerprint, create):
+    """
+    Call create() -> (application, response_body) and record the key with
+    it atomically. Returns (response_body, replayed).
+    """
+    # An expired key may be reused; clear just that row so the unique index
+    # allows it. Bulk expiry is the prune_keys beat task.
+    AdmissionIdempotencyKey.objects.filter(key=key, created_at__lte=_cutoff()).delete()
+    try:
+        with transaction.atomic():
+            app, body = create()
+            AdmissionIdempotencyKey.objects.create(
+                key=key,
+                request_fingerprint=fingerprint,
+                application=app,
+                response_body=body,
+            )
+    except IntegrityError:
+        # A concurrent request with the same key committed first.
+        body = replay(key, fingerprint)
+        if body is None:
+            raise
+        return body, True
+    return body, False
+
+
+def prune_keys():
+    """Delete keys older than ADMISSION_IDEMPOTENCY_TTL_HOURS; returns how many."""
+    deleted, _ = AdmissionIdempotencyKey.objects.filter(created_at__lte=_cutoff()).delete()
+    return deleted
@@ -0,0 +1,157 @@
+# Backend/admissions/imports.py
+
+"""
+Bulk import of walk-in / paper applications from CSV.
+
+Each row is mapped to the public admission form payload and validated by
+PublicAdmissionApplicationSerializer, so the rules are exactly those of
+AdmissionApply. Valid rows are written with bulk_create in chunked
+transactions; invalid rows are reported and skipped.
+
+CSV columns (header row required; unknown columns are ignored):
+
+    full_name, nickname, date_of_birth, gender, phone, email, address,
+    home_district, class_level, group, subject, batch_id, hear_about_us,
+    prev_student, jsc_school, jsc_grade, ssc_school, ssc_grade,
+    father_name, father_phone, father_occupation,
+    mother_name, mother_phone, mother_occupation, guardian_relation
+"""
+
+import csv
+import logging
+
+from django.db import DatabaseError, transaction
+from rest_framework import serializers
+
+from courses_app.models import Batch
+from .duplicates import flag_duplicates
+from .models import AdmissionApplication, Guardian
+from .search import refresh_search_vectors
+from .serializers import PublicAdmissionApplicationSerializer
+from .signals import applications_bulk_created
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+
+_TRUE = {"1", "true", "yes", "y", "on"}
+
+
+def row_to_payload(row):
+    """Map one flat CSV row to the nested public admission form payload."""
+
+    def col(name):
+        return (row.get(name) or "").strip()
+
+    return {
+        "personalInformation": {
+            "fullName": col("full_name"),
+            "nickname": col("nickname"),
+            "dateOfBirth": col("date_of_birth"),
+            "gender": col("gender"),
+            "phone": col("phone"),
+            "email": col("email"),
+            "address": col("address"),
+            "homeDistrict": col("home_district"),
+        },
+        "parentsAndGuardian": {
+            "father": {
+                "name": col("father_name"),
+                "phone": col("father_phone"),
+                "occupation": col("father_occupation"),
+            },
+            "mother": {
+                "name": col("mother_name"),
+                "phone": col("mother_phone"),
+                "occupation": col("mother_occupation"),
+            },
+            "guardian": {"relation": col("guardian_relation")},
+        },
+        "education": {
+            "jsc": {"school": col("jsc_school"), "grade": col("jsc_grade")},
+            "ssc": {"school": col("ssc_school"), "grade": col("ssc_grade")},
+        },
+        "academicPreferences": {
+            "classLevel": col("class_level"),
+            "group": col("group"),
+            "subject": col("subject"),
+            "batchId": col("batch_id"),
+            "hearAboutUs": col("hear_about_us"),
+            "prevStudent": col("prev_student").lower() in _TRUE,
+        },
+    }
+
+
+def _build(row, batches):
+    """Return (application, guardians) or raise ValidationError."""
+    serializer = PublicAdmissionApplicationSerializer(
+        data=row_to_payload(row), context={"batches": batches}
+    )
+    serializer.is_valid(raise_exception=True)
+    return serializer.build_instances(serializer.validated_data)
+
+
+def _write(built):
+    """Insert a list of (row_number, app, guardians) with two bulk INSERTs."""
+    apps = [app for _, app, _ in built]
+    flag_duplicates(apps)
+    AdmissionApplication.objects.bulk_create(apps)
+    guardians = []
+    for _, app, app_guardians in built:
+        for guardian in app_guardians:
+            guardian.application = app
+            guardians.append(guardian)
+    Guardian.objects.bulk_create(guardians)
+    refresh_search_vectors([app.pk for app in apps])
+    applications_bulk_created.send(sender=AdmissionApplication, applications=apps)
+
+
+def _flush(built, report):
+    if not built:
+        return
+    try:
+        with transaction.atomic():
+            _write(built)
+        report["created"] += len(built)
+        return
+    except DatabaseError:
+        logger.warning("Bulk admission chunk failed; retrying row by row", exc_info=True)
+
+    # Isolate the bad row(s) so one failure doesn't sink the whole chunk
+    for row_number, app, guardians in built:
+        for obj in (app, *guardians):
+            obj.pk = None
+            obj._state.adding = True
+        try:
+            with transaction.atomic():
+                _write([(row_number, app, guardians)])
+            report["created"] += 1
+        except DatabaseError as exc:
+            report["errors"].append({"row": row_number, "errors": {"database": str(exc)}})
+
+
+def import_admissions_csv(lines, *, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Import applications from an iterable of CSV text lines (an open text
+    file, or codecs.iterdecode(upload, "utf-8-sig") for an UploadedFile).
+
+    Returns {"created": int, "errors": [{"row": n, "errors": {...}}, ...]};
+    row numbers are 1-based data rows (the header is not counted).
+    """
+    batches = Batch.objects.select_related("course").in_bulk()
+    report = {"created": 0, "errors": []}
+    built = []
+
+    for row_number, row in enumerate(csv.DictReader(lines), start=1):
+        try:
+            app, guardians = _build(row, batches)
+        except serializers.ValidationError as exc:
+            report["errors"].append({"row": row_number, "errors": exc.detail})
+            continue
+        built.append((row_number, app, guardians))
+        if len(built) >= chunk_size:
+            _flush(built, report)
+            built = []
+
+    _flush(built, report)
+    return report
@@ -0,0 +1,241 @@
+# Backend/admissions/intake.py
+
+"""
+Queued intake mode for AdmissionApply (ADMISSIONS_QUEUED_INTAKE).
+
+When a batch opens, the request thread only runs the payload's presence
+checks and the photo size / type checks, stores the raw payload as an
+AdmissionIntakeTicket and answers 202. A Celery worker then does the normal
+create (photo decode and save, duplicate check, inserts) at the rate set by
+ADMISSION_INTAKE_RATE_LIMIT.
+
+A finished ticket carries exactly what the synchronous endpoint would have
+answered: the 201 body when DONE, the 400 errors when FAILED.
+
+Tickets nothing is working on (task message lost, broker down at commit,
+worker killed mid-ticket) are picked up again by requeue_stale_tickets(),
+run from CELERY_BEAT_SCHEDULE.
+"""
+
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import DatabaseError, IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import idempotency
+from .models import AdmissionIntakeTicket, IntakeStatus
+from .photos import PhotoTooLarge, accept_upload, check_data_url_size
+from .serializers import AdmissionApplicationSerializer, PublicAdmissionApplicationSerializer
+
+# Processing attempts before a ticket that keeps hitting database errors fails
+MAX_ATTEMPTS = 5
+
+PENDING = (IntakeStatus.QUEUED, IntakeStatus.PROCESSING)
+
+SAVE_FAILED = {"detail": "We could not save your application. Please try again."}
+
+REQUEUE_LIMIT = 500
+
+
+def precheck(data, photo=None):
+    """
+    Checks that need neither the database nor decoding the photo.
+    Returns the 400 error body, or None if the payload can be queued.
+    """
+    serializer = PublicAdmissionApplicationSerializer(data=data)
+    if not serializer.is_valid():
+        return serializer.errors
+    if photo is not None:
+        try:
+            accept_upload(photo)
+        except ValueError as exc:  # includes PhotoTooLarge
+            return {"photo": str(exc)}
+        return None
+    raw = (serializer.validated_data.get("attachments") or {}).get("photoPreview")
+    if raw:
+        try:
+            check_data_url_size(raw)
+        except PhotoTooLarge as exc:
+            return {"attachments": {"photoPreview": str(exc)}}
+    return None
+
+
+def enqueue(data, photo=None, *, key="", fingerprint=""):
+    """
+    Store a checked payload and queue it once the transaction commits.
+    A repeated Idempotency-Key returns the existing ticket; raises
+    idempotency.KeyReused if that ticket was for a different payload.
+    """
+    if key:
+        existing = AdmissionIntakeTicket.objects.filter(idempotency_key=key).first()
+        if existing is not None:
+            return _same_payload(existing, fingerprint)
+
+    ticket = AdmissionIntakeTicket(
+        payload=data,
+        photo=photo,
+        photo_content_type=getattr(photo, "content_type", "") or "",
+        idempotency_key=key,
+        request_fingerprint=fingerprint,
+    )
+    try:
+        with transaction.atomic():
+            ticket.save()
+    except IntegrityError:
+        # A concurrent retry with the same key got in first
+        if ticket.photo:
+            ticket.photo.delete(save=False)
+        return _same_payload(AdmissionIntakeTicket.objects.get(idempotency_key=key), fingerprint)
+
+    from .tasks import process_admission_ticket
+
+    ticket_id = ticket.pk
+    transaction.on_commit(lambda: process_admission_ticket.delay(ticket_id))
+    return ticket
+
+
+def _same_payload(ticket, fingerprint):
+    if ticket.request_fingerprint != fingerprint:
+        raise idempotency.KeyReused
+    return ticket
+
+
+def _stored_photo(ticket):
+    if not ticket.photo:
+        return None
+    ticket.photo.open("rb")
+    return UploadedFile(
+        ticket.photo,
+        name=os.path.basename(ticket.photo.name),
+        content_type=ticket.photo_content_type,
+        size=ticket.photo.size,
+    )
+
+
+def _create(ticket):
+    """Run the synchronous create for a ticket. Returns the 201 body."""
+    photo = _stored_photo(ticket)
+    try:
+        serializer = PublicAdmissionApplicationSerializer(
+            data=ticket.payload, context={"photo": photo}
+        )
+        serializer.is_valid(raise_exception=True)
+
+        def create():
+            app = serializer.save()
+            return app, AdmissionApplicationSerializer(app).data
+
+        if not ticket.idempotency_key:
+            return create()[1]
+        body, _ = idempotency.run_once(ticket.idempotency_key, ticket.request_fingerprint, create)
+        return body
+    finally:
+        if photo is not None:
+            ticket.photo.close()
+
+
+def _finish(ticket, status, *, body=None, errors=None):
+    ticket.status = status
+    ticket.response_body = body
+    ticket.errors = errors
+    ticket.application_id = body["id"] if body else None
+    if ticket.photo:
+        # The application has its own copy (or none, if it failed)
+        ticket.photo.delete(save=False)
+    ticket.save(
+        update_fields=["status", "response_body", "errors", "application", "photo", "updated_at"]
+    )
+
+
+def process_ticket(ticket_id):
+    """
+    Turn one queued ticket into an application. Returns the ticket, or None
+    if it is gone, finished or being processed by another worker.
+    Database errors put the ticket back in the queue and are re-raised so
+    the task retries, until MAX_ATTEMPTS.
+    """
+    with transaction.atomic():
+        ticket = (
+            AdmissionIntakeTicket.objects.select_for_update(skip_locked=True)
+            .filter(pk=ticket_id, status=IntakeStatus.QUEUED)
+            .first()
+        )
+        if ticket is None:
+            return None
+        ticket.status = IntakeStatus.PROCESSING
+        ticket.attempts += 1
+        ticket.save(update_fields=["status", "attempts", "updated_at"])
+
+    try:
+        body = _create(ticket)
+    except serializers.ValidationError as exc:
+        _finish(ticket, IntakeStatus.FAILED, errors=exc.detail)
+    except idempotency.KeyReused:
+        _finish(
+            ticket,
+            IntakeStatus.FAILED,
+            errors={"detail": f"{idempotency.HEADER} was already used for a different application."},
+        )
+    except DatabaseError:
+        if ticket.attempts >= MAX_ATTEMPTS:
+            _finish(ticket, IntakeStatus.FAILED, errors=SAVE_FAILED)
+            return ticket
+        ticket.status = IntakeStatus.QUEUED
+        ticket.save(update_fields=["status", "updated_at"])
+        raise
+    else:
+        _finish(ticket, IntakeStatus.DONE, body=body)
+    return ticket
+
+
+def requeue_stale_tickets(*, limit=REQUEUE_LIMIT):
+    """
+    Send pending tickets untouched for ADMISSION_INTAKE_STALE_MINUTES back to
+    the workers: QUEUED ones whose message never arrived, and PROCESSING ones
+    whose worker died (those go back to QUEUED). A ticket that has used up
+    MAX_ATTEMPTS fails instead. Returns the number of tickets re-sent.
+    """
+    from .tasks import process_admission_ticket
+
+    now = timezone.now()
+    cutoff = now - timedelta(minutes=settings.ADMISSION_INTAKE_STALE_MINUTES)
+    with transaction.atomic():
+        stale = list(
+            AdmissionIntakeTicket.objects.select_for_update(skip_locked=True)
+            .filter(status__in=PENDING, updated_at__lt=cutoff)
+            .order_by("updated_at")[:limit]
+        )
+        requeue = []
+        for ticket in stale:
+            if ticket.attempts >= MAX_ATTEMPTS:
+                _finish(ticket, IntakeStatus.FAILED, errors=SAVE_FAILED)
+            else:
+                requeue.append(ticket.pk)
+        AdmissionIntakeTicket.objects.filter(pk__in=requeue).update(
+            status=IntakeStatus.QUEUED, updated_at=now
+        )
+        transaction.on_commit(
+            lambda: [process_admission_ticket.delay(pk) for pk in requeue]
+        )
+    return len(requeue)
+
+
+def prune_tickets():
+    """Delete finished tickets older than ADMISSION_INTAKE_TICKET_TTL_HOURS; returns how many."""
+    cutoff = timezone.now() - timedelta(hours=settings.ADMISSION_INTAKE_TICKET_TTL_HOURS)
+    finished = AdmissionIntakeTicket.objects.filter(created_at__lt=cutoff).exclude(status__in=PENDING)
+    deleted, _ = finished.delete()
+    return deleted
+
+
+def ticket_status(ticket):
+    body = {"ticket": str(ticket.pk), "status": ticket.status}
+    if ticket.status == IntakeStatus.DONE:
+        body["application"] = ticket.response_body
+    elif ticket.status == IntakeStatus.FAILED:
+        body["errors"] = ticket.errors
+    return body
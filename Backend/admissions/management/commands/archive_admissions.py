@@ -0,0 +1,40 @@
+# Backend/admissions/management/commands/archive_admissions.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from admissions.archive import DEFAULT_CHUNK_SIZE, move_season, sync_archive_tables
+
+
+class Command(BaseCommand):
+    help = (
+        "Move past admission seasons (applications, guardians, seat holds, payments) "
+        "into the archive schema, or back with --restore."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("years", nargs="+", type=int, help="Season year(s), e.g. 2024")
+        parser.add_argument(
+            "--restore",
+            action="store_true",
+            help="Move the season(s) from the archive back into the live tables",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Applications per transaction",
+        )
+
+    def handle(self, *args, **options):
+        current = timezone.localdate().year
+        restore = options["restore"]
+        if not restore and max(options["years"]) >= current:
+            raise CommandError(f"Only seasons before {current} can be archived.")
+
+        sync_archive_tables()
+        for year in sorted(options["years"]):
+            moved = move_season(year, to_archive=not restore, chunk_size=options["chunk_size"])
+            summary = ", ".join(f"{count} {label}" for label, count in moved.items()) or "nothing"
+            verb = "Restored" if restore else "Archived"
+            self.stdout.write(self.style.SUCCESS(f"{verb} season {year}: {summary}."))
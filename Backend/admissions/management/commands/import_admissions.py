@@ -0,0 +1,33 @@
+# Backend/admissions/management/commands/import_admissions.py
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from admissions.imports import DEFAULT_CHUNK_SIZE, import_admissions_csv
+
+
+class Command(BaseCommand):
+    help = "Bulk-import admission applications from a CSV file (see admissions/imports.py for columns)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the CSV file")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help="Rows per bulk insert / transaction",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["path"], newline="", encoding="utf-8-sig") as fh:
+            report = import_admissions_csv(fh, chunk_size=options["chunk_size"])
+
+        for error in report["errors"]:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {report['created']} application(s), "
+                f"{len(report['errors'])} row(s) rejected."
+            )
+        )
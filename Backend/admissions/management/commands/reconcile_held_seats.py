@@ -0,0 +1,15 @@
+# Backend/admissions/management/commands/reconcile_held_seats.py
+
+from django.core.management.base import BaseCommand
+
+from admissions.models import SeatHold
+
+
+class Command(BaseCommand):
+    help = "Recount Batch.held_seats from the seat holds that are still HELD."
+
+    def handle(self, *args, **options):
+        drifted = SeatHold.reconcile_held_seats()
+        for batch_id, (stored, actual) in sorted(drifted.items()):
+            self.stdout.write(f"batch {batch_id}: {stored} -> {actual}")
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {len(drifted)} batch(es)."))
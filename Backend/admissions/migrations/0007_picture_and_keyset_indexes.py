@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0006_remove_admissionapplication_school_and_more'),
+        ('courses_app', '0003_remove_batch_filled_seats_course_description_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='admissionapplication',
+            old_name='picture_path',
+            new_name='picture',
+        ),
+        migrations.AlterField(
+            model_name='admissionapplication',
+            name='picture',
+            field=models.ImageField(blank=True, null=True, upload_to='admissions/'),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=models.Index(fields=['-created_at', '-id'], name='adm_app_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='adm_app_user_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0007_picture_and_keyset_indexes'),
+        ('courses_app', '0003_remove_batch_filled_seats_course_description_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=models.Index(fields=['status', '-created_at'], name='adm_app_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=models.Index(fields=['batch', 'status', '-created_at'], name='adm_app_batch_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=models.Index(fields=['current_class', 'status', '-created_at'], name='adm_app_class_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=models.Index(fields=['hear_about_us', '-created_at'], name='adm_app_hear_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=models.Index(condition=models.Q(('is_reviewed', False)), fields=['-created_at'], name='adm_app_unreviewed_idx'),
+        ),
+    ]
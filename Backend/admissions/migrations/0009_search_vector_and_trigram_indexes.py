@@ -0,0 +1,84 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, Concat
+
+
+def backfill_search_vector(apps, schema_editor):
+    # Frozen copy of admissions.search.search_vector_expression
+    AdmissionApplication = apps.get_model("admissions", "AdmissionApplication")
+    Guardian = apps.get_model("admissions", "Guardian")
+    guardian_text = Subquery(
+        Guardian.objects.filter(application=OuterRef("pk"))
+        .values("application")
+        .annotate(
+            text=StringAgg(
+                Concat("name", Value(" "), Coalesce("contact_number", Value("")), output_field=TextField()),
+                delimiter=" ",
+            )
+        )
+        .values("text")[:1],
+        output_field=TextField(),
+    )
+    AdmissionApplication.objects.update(
+        search_vector=(
+            SearchVector("student_name", "student_nick_name", weight="A", config="simple")
+            + SearchVector("student_mobile", "student_email", weight="B", config="simple")
+            + SearchVector(guardian_text, weight="C", config="simple")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0008_dashboard_filter_indexes'),
+        ('courses_app', '0003_remove_batch_filled_seats_course_description_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        migrations.AddField(
+            model_name='admissionapplication',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='adm_app_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('student_name'), name='gin_trgm_ops'), name='adm_app_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('student_nick_name'), name='gin_trgm_ops'), name='adm_app_nick_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('student_mobile'), name='gin_trgm_ops'), name='adm_app_mobile_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('student_email'), name='gin_trgm_ops'), name='adm_app_email_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='guardian',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='guardian_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='guardian',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('contact_number'), name='gin_trgm_ops'), name='guardian_contact_trgm_idx'),
+        ),
+        migrations.RunPython(backfill_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0009_search_vector_and_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='admissionapplication',
+            name='picture_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='admissions/thumbs/'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0010_admissionapplication_picture_thumbnail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionIdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('request_fingerprint', models.CharField(max_length=64)),
+                ('response_body', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_keys', to='admissions.admissionapplication')),
+            ],
+        ),
+    ]
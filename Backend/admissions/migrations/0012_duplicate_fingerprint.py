@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:38
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_fingerprints(apps, schema_editor):
+    # Frozen copy of admissions.duplicates.fingerprint; the earliest live
+    # application of each fingerprint stays unflagged.
+    AdmissionApplication = apps.get_model("admissions", "AdmissionApplication")
+
+    def fingerprint(app):
+        if not app.batch_id or not app.date_of_birth:
+            return ""
+        digits = re.sub(r"\D+", "", app.student_mobile or "")
+        if digits.startswith("880"):
+            digits = digits[3:]
+        if len(digits) == 10 and digits.startswith("1"):
+            digits = "0" + digits
+        mobile = digits[-11:]
+        name = re.sub(r"[\W_]+", "", (app.student_name or "").casefold())
+        who = f"m:{mobile}" if mobile else f"n:{name}"
+        if who in ("m:", "n:"):
+            return ""
+        return f"{app.batch_id}|{app.date_of_birth.isoformat()}|{who}"[:160]
+
+    seen, pending = set(), []
+    qs = AdmissionApplication.objects.only(
+        "id", "batch_id", "date_of_birth", "student_mobile", "student_name", "status"
+    ).order_by("id")
+    for app in qs.iterator(chunk_size=2000):
+        app.duplicate_fingerprint = fingerprint(app)
+        if app.duplicate_fingerprint and app.status != "CANCELLED":
+            app.possible_duplicate = app.duplicate_fingerprint in seen
+            seen.add(app.duplicate_fingerprint)
+        pending.append(app)
+        if len(pending) >= 2000:
+            AdmissionApplication.objects.bulk_update(pending, ["duplicate_fingerprint", "possible_duplicate"])
+            pending = []
+    if pending:
+        AdmissionApplication.objects.bulk_update(pending, ["duplicate_fingerprint", "possible_duplicate"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0011_admissionidempotencykey'),
+        ('courses_app', '0003_remove_batch_filled_seats_course_description_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='admissionapplication',
+            name='duplicate_fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, max_length=160),
+        ),
+        migrations.AddField(
+            model_name='admissionapplication',
+            name='possible_duplicate',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='admissionapplication',
+            index=models.Index(condition=models.Q(('duplicate_fingerprint', ''), _negated=True), fields=['duplicate_fingerprint'], name='adm_app_dup_fingerprint_idx'),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
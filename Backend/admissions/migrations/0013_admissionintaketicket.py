@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:45
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admissions', '0012_duplicate_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionIntakeTicket',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('PROCESSING', 'Processing'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='QUEUED', max_length=12)),
+                ('payload', models.JSONField()),
+                ('photo', models.FileField(blank=True, null=True, upload_to='admissions/intake/')),
+                ('photo_content_type', models.CharField(blank=True, max_length=100)),
+                ('idempotency_key', models.CharField(blank=True, default='', max_length=255)),
+                ('request_fingerprint', models.CharField(blank=True, max_length=64)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('response_body', models.JSONField(blank=True, null=True)),
+                ('errors', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='intake_tickets', to='admissions.admissionapplication')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('idempotency_key', ''), _negated=True), fields=('idempotency_key',), name='adm_intake_idempotency_key_uniq')],
+            },
+        ),
+    ]
@@ -1,10 +1,16 @@
-from django.db import models
+from collections import Counter
+
+from django.db import models, transaction
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce, Upper
 import uuid
 
 from courses_app.models import Batch
+from .signals import seat_holds_expired
 
 
 SEX_CHOICES = (
@@ -69,6 +75,10 @@ class AdmissionApplication(models.Model):
     student_email = models.EmailField(blank=True, null=True)
     home_location = models.TextField(blank=True, null=True)  # address from frontend
     picture = models.ImageField(upload_to="admissions/", blank=True, null=True)
+    # Small re-encoded copy built in the background (admissions/photos.py)
+    picture_thumbnail = models.ImageField(
+        upload_to="admissions/thumbs/", blank=True, null=True, editable=False
+    )
 
     # --- Extra meta from admission form ---
     hear_about_us = models.CharField(
@@ -97,9 +107,77 @@ class AdmissionApplication(models.Model):
         related_name="admissions",
     )
 
+    # Maintained by admissions.search (see receivers.py); do not set by hand
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
+    # Batch + date of birth + normalized mobile (or name); see admissions.duplicates
+    duplicate_fingerprint = models.CharField(max_length=160, blank=True, default="", editable=False)
+    # Set on create when a live application with the same fingerprint exists
+    possible_duplicate = models.BooleanField(default=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination for the staff list and the per-student list
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="adm_app_created_id_idx",
+            ),
+            models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="adm_app_user_created_id_idx",
+            ),
+            # Dashboard filters (see admissions/filters.py), newest first
+            models.Index(
+                fields=["status", "-created_at"],
+                name="adm_app_status_created_idx",
+            ),
+            models.Index(
+                fields=["batch", "status", "-created_at"],
+                name="adm_app_batch_status_idx",
+            ),
+            models.Index(
+                fields=["current_class", "status", "-created_at"],
+                name="adm_app_class_status_idx",
+            ),
+            models.Index(
+                fields=["hear_about_us", "-created_at"],
+                name="adm_app_hear_created_idx",
+            ),
+            # Review queue: only the (small) unreviewed slice is indexed
+            models.Index(
+                fields=["-created_at"],
+                name="adm_app_unreviewed_idx",
+                condition=Q(is_reviewed=False),
+            ),
+            # Duplicate lookup on apply and the duplicate-clusters report
+            models.Index(
+                fields=["duplicate_fingerprint"],
+                name="adm_app_dup_fingerprint_idx",
+                condition=~Q(duplicate_fingerprint=""),
+            ),
+            # Search (admissions/search.py): full-text + trigram for icontains
+            GinIndex(fields=["search_vector"], name="adm_app_search_vector_idx"),
+            GinIndex(
+                OpClass(Upper("student_name"), name="gin_trgm_ops"),
+                name="adm_app_name_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("student_nick_name"), name="gin_trgm_ops"),
+                name="adm_app_nick_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("student_mobile"), name="gin_trgm_ops"),
+                name="adm_app_mobile_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("student_email"), name="gin_trgm_ops"),
+                name="adm_app_email_trgm_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.student_name} → {self.batch}"
 
@@ -133,6 +211,18 @@ class Guardian(models.Model):
     email_address = models.EmailField(blank=True, null=True)
     is_primary_contact = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="guardian_name_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("contact_number"), name="gin_trgm_ops"),
+                name="guardian_contact_trgm_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.application_id} - {self.get_role_display()} - {self.name}"
 
@@ -188,13 +278,109 @@ class SeatHold(models.Model):
     def __str__(self) -> str:
         return f"{self.application_id} - {self.batch_id} - {self.status}"
 
+    # Every HELD transition goes through place / release / expire_overdue_now
+    # so Batch.held_seats stays in step; call them inside a transaction.
+
+    @classmethod
+    def place(cls, application, batch, expires_at, *, count_after_commit=False):
+        """
+        Create a HELD hold and count it in Batch.held_seats. With
+        `count_after_commit` the count is applied once the caller commits, so
+        its transaction never writes (or waits on) the Batch row; for the
+        Redis reservation path, where Redis has already checked capacity.
+        """
+        hold = cls.objects.create(
+            application=application,
+            batch=batch,
+            expires_at=expires_at,
+            status=SeatHoldStatus.HELD,
+        )
+        if count_after_commit:
+            transaction.on_commit(lambda: Batch.adjust_held_seats({batch.pk: 1}), robust=True)
+        else:
+            Batch.adjust_held_seats({batch.pk: 1})
+        return hold
+
+    def release(self, status):
+        """Move a HELD hold to CONFIRMED or CANCELLED."""
+        if self.status != SeatHoldStatus.HELD:
+            return
+        from .reservations import release_on_commit
+
+        self.status = status
+        self.save(update_fields=["status"])
+        Batch.adjust_held_seats({self.batch_id: -1})
+        release_on_commit(
+            self.batch_id, self.application_id, confirmed=status == SeatHoldStatus.CONFIRMED
+        )
+
     @staticmethod
-    def expire_overdue_now():
+    def expire_overdue_now(*, application_id=None, batch_id=None, limit=None):
+        """
+        Mark overdue HELD holds EXPIRED, take them off Batch.held_seats and
+        return how many were expired.
+
+        Capacity checks read held_seats, which counts lapsed holds until they
+        are expired here. The periodic sweep (admissions.tasks.expire_seat_holds)
+        calls it in chunks of `limit`. The payment paths (AdmissionPaymentCreate,
+        on_payment_validated) call it for the application they serve and,
+        when its batch looks full, for that batch under the Batch row lock.
+        Public availability (Batch.objects.with_availability) counts live
+        holds itself and does not depend on it.
+        """
         now = timezone.now()
-        SeatHold.objects.filter(
-            status=SeatHoldStatus.HELD,
-            expires_at__lte=now,
-        ).update(status=SeatHoldStatus.EXPIRED)
+        overdue = SeatHold.objects.filter(status=SeatHoldStatus.HELD, expires_at__lte=now)
+        if application_id is not None:
+            overdue = overdue.filter(application_id=application_id)
+        if batch_id is not None:
+            overdue = overdue.filter(batch_id=batch_id)
+        with transaction.atomic():
+            # Lock the rows we expire so concurrent sweeps can't both report them
+            overdue = list(
+                overdue.select_for_update(skip_locked=True, of=("self",))
+                .order_by("expires_at")
+                .values(
+                    "id",
+                    "batch_id",
+                    "application_id",
+                    application_created_at=F("application__created_at"),
+                )[:limit]
+            )
+            if not overdue:
+                return 0
+            SeatHold.objects.filter(pk__in=[h["id"] for h in overdue]).update(
+                status=SeatHoldStatus.EXPIRED
+            )
+            released = Counter(h["batch_id"] for h in overdue)
+            Batch.adjust_held_seats({pk: -n for pk, n in released.items()})
+            seat_holds_expired.send(sender=SeatHold, holds=overdue)
+        return len(overdue)
+
+    @staticmethod
+    def reconcile_held_seats():
+        """
+        Recount Batch.held_seats from the HELD holds.
+        Returns {batch_id: (stored, actual)} for the batches that had drifted.
+        """
+        held = (
+            SeatHold.objects.filter(batch=OuterRef("pk"), status=SeatHoldStatus.HELD)
+            .order_by()
+            .values("batch")
+            .annotate(n=Count("id"))
+            .values("n")
+        )
+        actual = Coalesce(Subquery(held), 0)
+        with transaction.atomic():
+            batches = Batch.objects.select_for_update().order_by("pk")
+            drifted = {
+                pk: (stored, count)
+                for pk, stored, count in batches.annotate(actual=actual)
+                .exclude(held_seats=F("actual"))
+                .values_list("pk", "held_seats", "actual")
+            }
+            if drifted:
+                Batch.objects.filter(pk__in=drifted).update(held_seats=actual)
+        return drifted
 
     @staticmethod
     def active_count_for_batch(batch_id: int) -> int:
@@ -204,3 +390,84 @@ class SeatHold(models.Model):
             status=SeatHoldStatus.HELD,
             expires_at__gt=now,
         ).count()
+
+
+class AdmissionIdempotencyKey(models.Model):
+    """
+    Client-supplied Idempotency-Key for AdmissionApply, with the response
+    that was sent for it. Retries within ADMISSION_IDEMPOTENCY_TTL_HOURS get
+    that response back instead of creating another application.
+    """
+
+    key = models.CharField(max_length=255, unique=True)
+    # sha256 of the submitted payload; the same key with a different body is rejected
+    request_fingerprint = models.CharField(max_length=64)
+    application = models.ForeignKey(
+        AdmissionApplication,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+    )
+    response_body = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self) -> str:
+        return f"{self.key} -> {self.application_id}"
+
+
+class IntakeStatus(models.TextChoices):
+    QUEUED = "QUEUED", "Queued"
+    PROCESSING = "PROCESSING", "Processing"
+    DONE = "DONE", "Done"
+    FAILED = "FAILED", "Failed"
+
+
+class AdmissionIntakeTicket(models.Model):
+    """
+    A public application accepted in queued intake mode (see admissions/intake.py).
+
+    The raw form payload (and multipart photo) is kept here until a worker
+    turns it into an AdmissionApplication; the ticket id is what the
+    applicant polls. Finished tickets are pruned after
+    ADMISSION_INTAKE_TICKET_TTL_HOURS.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(
+        max_length=12,
+        choices=IntakeStatus.choices,
+        default=IntakeStatus.QUEUED,
+    )
+    payload = models.JSONField()
+    photo = models.FileField(upload_to="admissions/intake/", blank=True, null=True)
+    photo_content_type = models.CharField(max_length=100, blank=True)
+
+    # Idempotency-Key of the submission, if any; a retry gets the same ticket
+    idempotency_key = models.CharField(max_length=255, blank=True, default="")
+    request_fingerprint = models.CharField(max_length=64, blank=True)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    application = models.ForeignKey(
+        AdmissionApplication,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="intake_tickets",
+    )
+    # The 201 body AdmissionApply would have returned, or the 400 errors
+    response_body = models.JSONField(null=True, blank=True)
+    errors = models.JSONField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["idempotency_key"],
+                condition=~Q(idempotency_key=""),
+                name="adm_intake_idempotency_key_uniq",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.pk} [{self.status}]"
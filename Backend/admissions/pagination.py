@@ -0,0 +1,115 @@
+# Backend/admissions/pagination.py
+
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class AdmissionCursorPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    The cursor is an opaque token encoding the (created_at, id) of the last
+    row on the previous page, so each page is a bounded index range scan
+    instead of an OFFSET over the whole table.
+
+    Query params:
+      - cursor     opaque token from the previous page's "next"
+      - page_size  rows per page (capped at ADMISSIONS_MAX_PAGE_SIZE)
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor"
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        params = request.query_params
+        return cls.cursor_query_param in params or cls.page_size_query_param in params
+
+    def get_page_size(self, request) -> int:
+        default = int(getattr(settings, "ADMISSIONS_PAGE_SIZE", 50))
+        maximum = int(getattr(settings, "ADMISSIONS_MAX_PAGE_SIZE", 200))
+        raw = request.query_params.get(self.page_size_query_param)
+        try:
+            size = int(raw) if raw else default
+        except (TypeError, ValueError):
+            size = default
+        return max(1, min(size, maximum))
+
+    def encode_cursor(self, obj) -> str:
+        payload = json.dumps(
+            {"c": obj.created_at.isoformat(), "i": obj.pk},
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode("ascii")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            created_at = parse_datetime(payload["c"])
+            pk = int(payload["i"])
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            created_at = None
+        if created_at is None:
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+        return created_at, pk
+
+    def page_queryset(self, queryset, request):
+        """
+        The unevaluated query for one page, plus one look-ahead row that
+        tells whether there is a next page.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            created_at, pk = cursor
+            # (created_at, id) < (c, i), written so the leading created_at
+            # bound is usable as an index range condition.
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(id__lt=pk),
+                created_at__lte=created_at,
+            )
+        return queryset[: self.page_size + 1]
+
+    def paginate_rows(self, rows):
+        """Evaluate a page_queryset() result."""
+        rows = list(rows)
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_rows(self.page_queryset(queryset, request))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "page_size": self.page_size,
+                "results": data,
+            }
+        )
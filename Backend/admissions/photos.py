@@ -0,0 +1,168 @@
+# Backend/admissions/photos.py
+
+"""
+Admission photo handling.
+
+The request thread only decodes (with a hard size cap) and stores the
+original upload. Resizing / re-encoding into a small thumbnail happens in a
+Celery task scheduled after the transaction commits.
+"""
+
+import base64
+import binascii
+import io
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Pillow format -> (extension, content type) of the photos we store
+_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+    "WEBP": ("webp", "image/webp"),
+    "GIF": ("gif", "image/gif"),
+}
+
+
+class PhotoTooLarge(ValueError):
+    pass
+
+
+def max_photo_bytes() -> int:
+    return int(getattr(settings, "ADMISSION_PHOTO_MAX_BYTES", 5 * 1024 * 1024))
+
+
+def _split_data_url(raw):
+    """Return the base64 data of a data URL or bare base64 string."""
+    data_str = str(raw).strip()
+    if ";base64," in data_str:
+        data_str = data_str.split(";base64,", 1)[1]
+    return data_str
+
+
+def check_data_url_size(raw, *, max_bytes=None):
+    """
+    Raise PhotoTooLarge if a data URL would decode to more than max_bytes.
+    Looks at the encoded length only; nothing is decoded.
+    """
+    max_bytes = max_photo_bytes() if max_bytes is None else max_bytes
+    data_str = _split_data_url(raw)
+    # 4 base64 chars → 3 bytes
+    if (len(data_str) * 3) // 4 > max_bytes + 3:
+        raise PhotoTooLarge(f"Photo exceeds {max_bytes // (1024 * 1024)} MB")
+
+
+def sniff_image(fileobj):
+    """
+    Parse and verify the image in `fileobj`. Returns (extension, content
+    type) of its actual format, whatever the client claimed it was.
+    Raises ValueError if it is not a supported, intact image.
+    """
+    try:
+        with Image.open(fileobj) as image:
+            fmt = image.format
+            image.verify()
+    except Exception as exc:  # verify() raises whatever the decoder trips on
+        raise ValueError("Photo must be a JPEG, PNG, WebP or GIF image") from exc
+    finally:
+        fileobj.seek(0)
+    if fmt not in _FORMATS:
+        raise ValueError("Photo must be a JPEG, PNG, WebP or GIF image")
+    return _FORMATS[fmt]
+
+
+def decode_data_url(raw, *, max_bytes=None) -> ContentFile:
+    """
+    Decode a data URL (or bare base64 string) into a ContentFile.
+
+    The encoded length is checked before decoding so oversized payloads are
+    rejected without allocating the decoded bytes.
+    Raises PhotoTooLarge, or ValueError for malformed input.
+    """
+    max_bytes = max_photo_bytes() if max_bytes is None else max_bytes
+    check_data_url_size(raw, max_bytes=max_bytes)
+    data_str = _split_data_url(raw)
+    try:
+        decoded = base64.b64decode(data_str)
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError("Invalid base64 photo") from exc
+    if len(decoded) > max_bytes:
+        raise PhotoTooLarge(f"Photo exceeds {max_bytes // (1024 * 1024)} MB")
+    ext, _ = sniff_image(io.BytesIO(decoded))
+    return ContentFile(decoded, name=f"admission_{uuid.uuid4().hex[:12]}.{ext}")
+
+
+def accept_upload(upload, *, max_bytes=None):
+    """
+    Validate a multipart photo upload and give it a server-side name.
+
+    Django has already spooled large uploads to a temp file, so the bytes
+    are copied to storage in chunks rather than loaded into memory.
+    Raises PhotoTooLarge, or ValueError for non-image uploads. The type and
+    extension come from the decoded image, not the client's content type.
+    """
+    max_bytes = max_photo_bytes() if max_bytes is None else max_bytes
+    if upload.size > max_bytes:
+        raise PhotoTooLarge(f"Photo exceeds {max_bytes // (1024 * 1024)} MB")
+    ext, upload.content_type = sniff_image(upload)
+    upload.name = f"admission_{uuid.uuid4().hex[:12]}.{ext}"
+    return upload
+
+
+def _encode_thumbnail(image):
+    """WebP when Pillow supports it, JPEG otherwise. Returns (bytes, ext)."""
+    buf = io.BytesIO()
+    try:
+        image.save(buf, format="WEBP", quality=80, method=4)
+        return buf.getvalue(), "webp"
+    except (KeyError, OSError):
+        buf = io.BytesIO()
+        image.convert("RGB").save(buf, format="JPEG", quality=82, optimize=True)
+        return buf.getvalue(), "jpg"
+
+
+def generate_thumbnail(application_id) -> bool:
+    """
+    Build and store picture_thumbnail for one application.
+    Idempotent; returns False if there is nothing (valid) to process.
+    """
+    from .models import AdmissionApplication
+
+    app = AdmissionApplication.objects.filter(pk=application_id).first()
+    if app is None or not app.picture:
+        return False
+
+    size = int(getattr(settings, "ADMISSION_THUMBNAIL_SIZE", 320))
+    try:
+        with app.picture.open("rb") as fh, Image.open(fh) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGB")
+            image.thumbnail((size, size))
+            data, ext = _encode_thumbnail(image)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        logger.warning("Could not build thumbnail for application %s", application_id, exc_info=True)
+        return False
+
+    old = app.picture_thumbnail.name if app.picture_thumbnail else None
+    app.picture_thumbnail.save(f"admission_{app.pk}_{size}.{ext}", ContentFile(data), save=False)
+    app.save(update_fields=["picture_thumbnail", "updated_at"])
+    if old and old != app.picture_thumbnail.name:
+        app.picture_thumbnail.storage.delete(old)
+    return True
+
+
+def schedule_thumbnail(application):
+    """Queue thumbnail generation once the current transaction commits."""
+    if not application.picture:
+        return
+    from .tasks import generate_admission_thumbnail
+
+    app_id = application.pk
+    transaction.on_commit(lambda: generate_admission_thumbnail.delay(app_id))
@@ -4,11 +4,21 @@ from decimal import Decimal
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
 from courses_app.models import Batch
-from admissions.models import AdmissionApplication, SeatHold, SeatHoldStatus
+from admissions.approvals import _split_name
+from admissions.models import (
+    AdmissionApplication,
+    AdmissionStatus,
+    Guardian,
+    SeatHold,
+    SeatHoldStatus,
+)
+from admissions.duplicates import fingerprint
+from admissions.search import GUARDIAN_SEARCH_FIELDS, SEARCH_FIELDS, refresh_search_vectors
 from payments.signals import payment_validated  # fired once when payment becomes VALIDATED
 
 FEE = Decimal(str(getattr(settings, "ADMISSION_FEE_BDT", "4625.00")))
@@ -22,10 +32,9 @@ def on_payment_validated(sender, payment, **kwargs):
     Idempotent finalization when a payment is VALIDATED:
 
     - Confirm active hold if present (and not expired) OR
-    - Best-effort allocate if capacity remains (after expiring old holds)
-    - Mark application as paid
-    - Increment batch.filled_seats once
-    - Create an INACTIVE user for this application if not already created
+    - Best-effort allocate if capacity remains (overdue holds don't count)
+    - Mark application as PAID (which is what confirmed_seats counts)
+    - Create an INACTIVE user for this application if not already linked
 
     This must be safe to run multiple times for the same payment.
     """
@@ -52,7 +61,7 @@ def on_payment_validated(sender, payment, **kwargs):
         batch = Batch.objects.select_for_update().get(pk=app.batch_id)
 
         # Already paid? (idempotent)
-        if app.is_paid:
+        if app.status == AdmissionStatus.PAID:
             return
 
         # Sanity checks – only finalize if amount/currency match the configured fee
@@ -72,39 +81,99 @@ def on_payment_validated(sender, payment, **kwargs):
                 and h.status == SeatHoldStatus.HELD
                 and h.expires_at > timezone.now()
             ):
-                h.status = SeatHoldStatus.CONFIRMED
-                h.save(update_fields=["status"])
+                h.release(SeatHoldStatus.CONFIRMED)
                 confirmed = True
 
-        if confirmed:
-            batch.filled_seats += 1
-            batch.save(update_fields=["filled_seats"])
-        else:
-            # No active hold; try allocate if capacity still available (after expiring stale holds)
-            SeatHold.expire_overdue_now()
-            active_holds = SeatHold.active_count_for_batch(batch.id)
-            if batch.filled_seats + active_holds < batch.total_seat:
-                batch.filled_seats += 1
-                batch.save(update_fields=["filled_seats"])
-            else:
+        if not confirmed:
+            # No active hold; try allocate if capacity still available.
+            # Same check as AdmissionPaymentCreate: lapsed holds still in
+            # held_seats are expired first so they don't count.
+            if SeatHold.expire_overdue_now(application_id=app.pk):
+                batch.refresh_from_db(fields=["held_seats"])
+            taken = batch.confirmed_seats
+            if taken + batch.held_seats >= batch.total_seat and SeatHold.expire_overdue_now(
+                batch_id=batch.id
+            ):
+                batch.refresh_from_db(fields=["held_seats"])
+            if taken + batch.held_seats >= batch.total_seat:
                 # Capacity exhausted → in real life: auto-refund / waitlist / alert
                 return
 
         # Mark as paid
-        app.is_paid = True
-
-        # If no user created yet for this application, create one INACTIVE now
-        if app.created_user is None:
-            email = app.student_email or f"student_{app.id}@example.com"
-            password = User.objects.make_random_password()
-
-            user = User.objects.create_user(
-                email=email,
-                password=password,
-                f_name=app.student_first_name_en,
-                l_name=app.student_last_name_en,
-                phone=app.student_mobile,
+        app.status = AdmissionStatus.PAID
+
+        # If no user linked yet for this application, create one INACTIVE now
+        if app.user_id is None:
+            email = User.objects.normalize_email(
+                app.student_email or f"student_{app.id}@example.com"
             )
-            app.created_user = user
+            user = User.objects.filter(email=email).first()
+            if user is None:
+                f_name, l_name = _split_name(app.student_name)  # as approval does
+                user = User.objects.create_user(
+                    email=email,
+                    password=None,  # unusable until the student sets one
+                    f_name=f_name,
+                    l_name=l_name,
+                    phone=app.student_mobile,
+                    is_active=False,
+                )
+            app.user = user
+
+        app.save(update_fields=["status", "user", "updated_at"])
+
+
+# ---------- search_vector maintenance ----------
+# Refreshes run on commit, so an application saved together with its
+# guardians (including bulk_create'd ones) is indexed once, with guardians.
+
+
+def _touches(update_fields, fields) -> bool:
+    return update_fields is None or bool(set(update_fields) & set(fields))
+
+
+def _refresh_on_commit(application_id):
+    if application_id:
+        transaction.on_commit(lambda: refresh_search_vectors([application_id]))
+
+
+@receiver(post_save, sender=AdmissionApplication)
+def refresh_application_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    if created or _touches(update_fields, SEARCH_FIELDS):
+        _refresh_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=Guardian)
+def refresh_guardian_search_vector(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, GUARDIAN_SEARCH_FIELDS):
+        _refresh_on_commit(instance.application_id)
+
+
+@receiver(post_delete, sender=Guardian)
+def refresh_deleted_guardian_search_vector(sender, instance, **kwargs):
+    _refresh_on_commit(instance.application_id)
+
+
+# ---------- updated_at on guardian changes ----------
+# Guardians are part of the application's representation, so editing one
+# must change the application's ETag / Last-Modified.
+
+
+@receiver(post_save, sender=Guardian)
+@receiver(post_delete, sender=Guardian)
+def touch_application_on_guardian_change(sender, instance, raw=False, **kwargs):
+    if instance.application_id and not raw:
+        AdmissionApplication.objects.filter(pk=instance.application_id).update(
+            updated_at=timezone.now()
+        )
+
+
+# ---------- duplicate fingerprint ----------
+# New applications are fingerprinted (and flagged) by flag_duplicates in the
+# create / import paths; this keeps the fingerprint right on later edits.
+
 
-        app.save(update_fields=["is_paid", "created_user"])
+@receiver(pre_save, sender=AdmissionApplication)
+def keep_duplicate_fingerprint(sender, instance, update_fields=None, raw=False, **kwargs):
+    if update_fields is None and not raw:
+        instance.duplicate_fingerprint = fingerprint(instance)
@@ -0,0 +1,187 @@
+# Backend/admissions/reservations.py
+
+"""
+Optional Redis seat reservation engine (SEAT_RESERVATION_REDIS_URL).
+
+Without it, AdmissionPaymentCreate checks capacity under a row lock on the
+Batch. With it, check-and-reserve is a single Lua script call in Redis: requests
+for a full batch are turned away without touching Postgres, and only the
+winners go on to write the durable SeatHold. They don't lock or write the
+Batch row in that transaction: Batch.held_seats is bumped after commit, so
+concurrent winners only contend in Redis. Before the write, a plain read of
+Postgres availability turns away a reservation that a drifted Redis (flush,
+eviction, failover, holds placed while it was down) let through, and the
+reservation is released.
+
+Per batch, Redis keeps (one hash slot per batch):
+
+    smw:seats:{<batch id>}:capacity   seats not taken by PAID applications
+    smw:seats:{<batch id>}:holds      sorted set, application id -> expiry (ms)
+
+A hold leaves the set once its score is past, so each reservation lives
+exactly until its SeatHold.expires_at. Postgres stays the source of truth:
+reconcile() runs periodically (and when a batch is first seen) to reset the
+capacity and re-sync the holds. If Redis is unreachable, callers fall back
+to the row-lock path.
+"""
+
+import logging
+from functools import lru_cache
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from courses_app.models import Batch
+from .models import AdmissionApplication, AdmissionStatus, SeatHold, SeatHoldStatus
+
+logger = logging.getLogger(__name__)
+
+# reserve() results
+UNPRIMED = -1
+FULL = 0
+RESERVED = 1
+ALREADY_HELD = 2
+
+# A reservation may take this long to show up as a SeatHold in Postgres
+# before reconcile() treats it as abandoned.
+DURABLE_WRITE_GRACE_SECONDS = 30
+
+_RESERVE = """
+local cap = redis.call('GET', KEYS[2])
+if not cap then return -1 end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if redis.call('ZSCORE', KEYS[1], ARGV[3]) then return 2 end
+if redis.call('ZCARD', KEYS[1]) >= tonumber(cap) then return 0 end
+redis.call('ZADD', KEYS[1], ARGV[2], ARGV[3])
+return 1
+"""
+
+_RELEASE = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+if ARGV[2] == '1' and redis.call('EXISTS', KEYS[2]) == 1 then
+  redis.call('DECR', KEYS[2])
+end
+return 1
+"""
+
+_RECONCILE = """
+redis.call('SET', KEYS[2], ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+local durable = {}
+for i = 4, #ARGV, 2 do
+  durable[ARGV[i]] = true
+  redis.call('ZADD', KEYS[1], ARGV[i + 1], ARGV[i])
+end
+local removed = 0
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[3])) do
+  if not durable[member] then
+    redis.call('ZREM', KEYS[1], member)
+    removed = removed + 1
+  end
+end
+return removed
+"""
+
+
+class Unavailable(Exception):
+    """Redis could not be reached; use the Postgres path instead."""
+
+
+def enabled() -> bool:
+    return bool(settings.SEAT_RESERVATION_REDIS_URL)
+
+
+@lru_cache(maxsize=1)
+def _scripts():
+    client = redis.Redis.from_url(
+        settings.SEAT_RESERVATION_REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+    )
+    return (
+        client,
+        client.register_script(_RESERVE),
+        client.register_script(_RELEASE),
+        client.register_script(_RECONCILE),
+    )
+
+
+def _keys(batch_id):
+    return [f"smw:seats:{{{batch_id}}}:holds", f"smw:seats:{{{batch_id}}}:capacity"]
+
+
+def _ms(moment):
+    return int(moment.timestamp() * 1000)
+
+
+def reserve(batch, application_id, expires_at):
+    """
+    Atomically reserve a seat in `batch` until `expires_at`.
+    Returns RESERVED, ALREADY_HELD or FULL; raises Unavailable.
+    """
+    _, script, _, _ = _scripts()
+    args = [_ms(timezone.now()), _ms(expires_at), application_id]
+    try:
+        result = script(keys=_keys(batch.pk), args=args)
+        if result == UNPRIMED:
+            reconcile([batch])
+            result = script(keys=_keys(batch.pk), args=args)
+    except redis.RedisError as exc:
+        raise Unavailable from exc
+    return int(result)
+
+
+def release(batch_id, application_id, *, confirmed=False):
+    """Drop a reservation; a confirmed seat also comes off the capacity."""
+    _, _, script, _ = _scripts()
+    try:
+        script(keys=_keys(batch_id), args=[application_id, "1" if confirmed else "0"])
+    except redis.RedisError:
+        # The next reconcile() repairs it from Postgres
+        logger.warning("Could not release seat reservation in Redis", exc_info=True)
+
+
+def release_on_commit(batch_id, application_id, *, confirmed=False):
+    if enabled():
+        transaction.on_commit(lambda: release(batch_id, application_id, confirmed=confirmed))
+
+
+def reconcile(batches=None):
+    """
+    Reset Redis from Postgres for the given batches (default: active ones):
+    capacity from PAID applications, live HELD holds re-added, and
+    reservations that never became a SeatHold dropped. Returns how many
+    such reservations were dropped.
+    """
+    batches = list(Batch.objects.filter(is_active=True) if batches is None else batches)
+    if not batches:
+        return 0
+    ids = [batch.pk for batch in batches]
+    now = timezone.now()
+
+    paid = dict(
+        AdmissionApplication.objects.filter(batch_id__in=ids, status=AdmissionStatus.PAID)
+        .order_by()
+        .values_list("batch")
+        .annotate(n=Count("id"))
+    )
+    held = {pk: [] for pk in ids}
+    for batch_id, application_id, expires_at in SeatHold.objects.filter(
+        batch_id__in=ids, status=SeatHoldStatus.HELD, expires_at__gt=now
+    ).values_list("batch_id", "application_id", "expires_at"):
+        held[batch_id] += [application_id, _ms(expires_at)]
+
+    hold_ms = settings.SEAT_HOLD_MINUTES * 60 * 1000
+    # Scores are expiries, so a reservation made before this cutoff has a score below it
+    stale_before = _ms(now) + hold_ms - DURABLE_WRITE_GRACE_SECONDS * 1000
+
+    client, _, _, script = _scripts()
+    with client.pipeline(transaction=False) as pipe:
+        for batch in batches:
+            script(
+                keys=_keys(batch.pk),
+                args=[batch.total_seat - paid.get(batch.pk, 0), _ms(now), stale_before, *held[batch.pk]],
+                client=pipe,
+            )
+        return sum(pipe.execute())
@@ -0,0 +1,116 @@
+# Backend/admissions/search.py
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db.models import BooleanField, F, Func, OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, Concat
+
+from .models import AdmissionApplication, Guardian
+
+# Names, phone numbers and emails: no stemming, no stop words.
+SEARCH_CONFIG = "simple"
+
+# Fields whose change requires the stored search_vector to be rebuilt.
+SEARCH_FIELDS = ("student_name", "student_nick_name", "student_mobile", "student_email")
+GUARDIAN_SEARCH_FIELDS = ("name", "contact_number")
+
+
+class _AnyOf(Func):
+    """
+    `lhs = ANY(ARRAY(subquery))`: Postgres runs the subquery once (an
+    InitPlan) and the comparison stays usable as an index condition, so it
+    can sit in a BitmapOr next to the other search conditions.
+    """
+
+    arg_joiner = " = ANY(ARRAY("
+    template = "%(expressions)s))"
+    output_field = BooleanField()
+
+
+def search_vector_expression():
+    """
+    Expression for AdmissionApplication.search_vector.
+
+    Student names rank highest, then contact details, then guardian names /
+    numbers (aggregated from the guardians table). Migration 0009 holds a
+    frozen copy for the backfill; keep them in step if this changes.
+    """
+    guardian_text = Subquery(
+        Guardian.objects.filter(application=OuterRef("pk"))
+        .values("application")
+        .annotate(
+            text=StringAgg(
+                Concat(
+                    "name",
+                    Value(" "),
+                    Coalesce("contact_number", Value("")),
+                    output_field=TextField(),
+                ),
+                delimiter=" ",
+            )
+        )
+        .values("text")[:1],
+        output_field=TextField(),
+    )
+    return (
+        SearchVector("student_name", "student_nick_name", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("student_mobile", "student_email", weight="B", config=SEARCH_CONFIG)
+        + SearchVector(guardian_text, weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def refresh_search_vectors(application_ids):
+    """
+    Rebuild search_vector for the given applications in a single UPDATE.
+    Call after bulk writes that bypass model signals.
+    """
+    ids = [pk for pk in application_ids if pk]
+    if not ids:
+        return 0
+    return AdmissionApplication.objects.filter(pk__in=ids).update(
+        search_vector=search_vector_expression()
+    )
+
+
+def search_admissions(qs, term):
+    """
+    Filter and rank `qs` by a free-text term.
+
+    Whole words hit the GIN-indexed search_vector; partial names, phone
+    numbers and emails (student or guardian) hit the trigram indexes through
+    icontains. Results are ordered by full-text rank, then name similarity.
+    """
+    term = term.strip()
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+
+    # Not a correlated EXISTS, which would force a sequential scan of
+    # applications; see _AnyOf.
+    guardian_matches = _AnyOf(
+        "pk",
+        Subquery(
+            Guardian.objects.filter(
+                Q(name__icontains=term) | Q(contact_number__icontains=term)
+            ).values("application_id")
+        ),
+    )
+
+    return (
+        qs.annotate(
+            search_rank=SearchRank(F("search_vector"), query),
+            name_similarity=TrigramSimilarity("student_name", term),
+        )
+        .filter(
+            Q(search_vector=query)
+            | Q(student_name__icontains=term)
+            | Q(student_nick_name__icontains=term)
+            | Q(student_mobile__icontains=term)
+            | Q(student_email__icontains=term)
+            | Q(guardian_matches)
+        )
+        .order_by("-search_rank", "-name_similarity", "-id")
+    )
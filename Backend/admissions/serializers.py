@@ -2,8 +2,11 @@
 
 from rest_framework import serializers
 from drf_extra_fields.fields import Base64ImageField
+from .duplicates import flag_duplicates
 from .models import AdmissionApplication, Guardian
+from .photos import PhotoTooLarge, accept_upload, decode_data_url, schedule_thumbnail
 from courses_app.models import Batch
+from django.db import transaction
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime, parse_date
 
@@ -29,9 +32,20 @@ class AdmissionApplicationSerializer(serializers.ModelSerializer):
     plus the related Guardian rows. This is used for listing, detail, review, etc.
     """
     picture = serializers.ImageField(read_only=True)
+    picture_thumbnail = serializers.ImageField(read_only=True)
     guardians = GuardianSerializer(many=True, read_only=True)
     batch_detail = serializers.SerializerMethodField()
 
+    def __init__(self, *args, fields=None, **kwargs):
+        # `fields`: optional subset of Meta.fields to render (sparse fieldsets)
+        super().__init__(*args, **kwargs)
+        # batch id -> batch_detail; with many=True one child serializer
+        # renders every row, so a list builds each batch's detail once
+        self._batch_detail_cache = {}
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = AdmissionApplication
         fields = [
@@ -54,10 +68,12 @@ class AdmissionApplicationSerializer(serializers.ModelSerializer):
             "student_email",
             "home_location",
             "picture",
+            "picture_thumbnail",
             "hear_about_us",
             "prev_student",
             "status",
             "is_reviewed",
+            "possible_duplicate",
             "user",
             "created_at",
             "updated_at",
@@ -65,6 +81,7 @@ class AdmissionApplicationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = [
             "is_reviewed",
+            "possible_duplicate",
             "created_at",
             "updated_at",
             "status",
@@ -75,6 +92,12 @@ class AdmissionApplicationSerializer(serializers.ModelSerializer):
         batch = getattr(obj, "batch", None)
         if batch is None:
             return None
+        if batch.pk not in self._batch_detail_cache:
+            self._batch_detail_cache[batch.pk] = self._render_batch_detail(batch)
+        return self._batch_detail_cache[batch.pk]
+
+    @staticmethod
+    def _render_batch_detail(batch):
         course = getattr(batch, "course", None)
         label_parts = []
         if course and course.grade_level:
@@ -186,6 +209,36 @@ class PublicAdmissionApplicationSerializer(serializers.Serializer):
         return data
 
     def create(self, validated_data):
+        app, guardians = self.build_instances(validated_data)
+        # One transaction: no half-written application if anything fails,
+        # and all guardians go in with a single INSERT.
+        with transaction.atomic():
+            flag_duplicates([app])
+            app.save()
+            for guardian in guardians:
+                guardian.application = app
+            Guardian.objects.bulk_create(guardians)
+        schedule_thumbnail(app)
+        return app
+
+    def _get_batch(self, batch_id):
+        # Bulk callers pass {id: Batch} in context to avoid one lookup per row
+        batches = self.context.get("batches")
+        try:
+            if batches is not None:
+                return batches[int(batch_id)]
+            return Batch.objects.select_related("course").get(pk=batch_id)
+        except (Batch.DoesNotExist, KeyError, TypeError, ValueError):
+            raise serializers.ValidationError(
+                {"academicPreferences": {"batchId": "Invalid batch id"}}
+            )
+
+    def build_instances(self, validated_data):
+        """
+        Map the validated payload to an unsaved AdmissionApplication and its
+        unsaved Guardian rows (application not yet set).
+        Raises ValidationError for values only checkable at this stage.
+        """
         pi = validated_data.get("personalInformation") or {}
         pg = validated_data.get("parentsAndGuardian") or {}
         edu = validated_data.get("education") or {}
@@ -256,13 +309,7 @@ class PublicAdmissionApplicationSerializer(serializers.Serializer):
                 home_location = home_district
 
         # --- Batch ---
-        batch_id = acad.get("batchId") or acad.get("batch_id")
-        try:
-            batch = Batch.objects.get(pk=batch_id)
-        except Batch.DoesNotExist:
-            raise serializers.ValidationError(
-                {"academicPreferences": {"batchId": "Invalid batch id"}}
-            )
+        batch = self._get_batch(acad.get("batchId") or acad.get("batch_id"))
 
         # --- Hear about us / previous student ---
         raw_hear = normalize(acad.get("hearAboutUs"))
@@ -285,32 +332,27 @@ class PublicAdmissionApplicationSerializer(serializers.Serializer):
         phone = normalize(pi.get("phone"))
         email = normalize(pi.get("email"))
         picture_file = None
+        picture_upload = self.context.get("photo")
         picture_raw = attachments.get("photoPreview")
-        if picture_raw:
+        if picture_upload is not None:
+            # Multipart path: binary file uploaded next to the JSON payload
+            try:
+                picture_file = accept_upload(picture_upload)
+            except ValueError as exc:  # includes PhotoTooLarge
+                raise serializers.ValidationError({"photo": str(exc)})
+        elif picture_raw:
             # Expect a data URL or raw base64 string from the frontend.
-            import base64
-            import uuid
-            from django.core.files.base import ContentFile
-
-            data_str = str(picture_raw).strip()
             try:
-                if ";base64," in data_str:
-                    header, b64data = data_str.split(";base64,", 1)
-                    if "image/" in header:
-                        ext = header.split("image/")[-1]
-                    else:
-                        ext = "jpg"
-                else:
-                    b64data = data_str
-                    ext = "jpg"
-                decoded = base64.b64decode(b64data)
-                filename = f"admission_{uuid.uuid4().hex[:12]}.{ext}"
-                picture_file = ContentFile(decoded, name=filename)
-            except Exception:
+                picture_file = decode_data_url(picture_raw)
+            except PhotoTooLarge as exc:
+                raise serializers.ValidationError(
+                    {"attachments": {"photoPreview": str(exc)}}
+                )
+            except ValueError:
                 picture_file = None
 
-        # --- Create the AdmissionApplication with the new schema ---
-        app = AdmissionApplication.objects.create(
+        # --- Build the AdmissionApplication with the new schema ---
+        app = AdmissionApplication(
             student_name=(full_name or "")[:120],
             student_nick_name=nickname,
             home_district=home_district,
@@ -337,25 +379,28 @@ class PublicAdmissionApplicationSerializer(serializers.Serializer):
         mother = pg.get("mother") or {}
         guardian_meta = pg.get("guardian") or {}
         primary_relation = str(guardian_meta.get("relation") or "").lower()
+        guardians = []
 
         if father.get("name"):
-            Guardian.objects.create(
-                application=app,
-                role="father",
-                name=father.get("name"),
-                occupation=father.get("occupation") or "",
-                contact_number=father.get("phone") or "",
-                is_primary_contact=primary_relation == "father",
+            guardians.append(
+                Guardian(
+                    role="father",
+                    name=father.get("name"),
+                    occupation=father.get("occupation") or "",
+                    contact_number=father.get("phone") or "",
+                    is_primary_contact=primary_relation == "father",
+                )
             )
 
         if mother.get("name"):
-            Guardian.objects.create(
-                application=app,
-                role="mother",
-                name=mother.get("name"),
-                occupation=mother.get("occupation") or "",
-                contact_number=mother.get("phone") or "",
-                is_primary_contact=primary_relation == "mother",
+            guardians.append(
+                Guardian(
+                    role="mother",
+                    name=mother.get("name"),
+                    occupation=mother.get("occupation") or "",
+                    contact_number=mother.get("phone") or "",
+                    is_primary_contact=primary_relation == "mother",
+                )
             )
 
         # Optionally handle an extra "other" guardian coming from the
@@ -379,14 +424,15 @@ class PublicAdmissionApplicationSerializer(serializers.Serializer):
                 email_address = normalize((g or {}).get("email_address"))
                 is_primary = bool((g or {}).get("is_primary_contact"))
 
-                Guardian.objects.create(
-                    application=app,
-                    role="other",
-                    name=name,
-                    occupation=occupation,
-                    contact_number=contact_number,
-                    email_address=email_address,
-                    is_primary_contact=is_primary,
+                guardians.append(
+                    Guardian(
+                        role="other",
+                        name=name,
+                        occupation=occupation,
+                        contact_number=contact_number,
+                        email_address=email_address,
+                        is_primary_contact=is_primary,
+                    )
                 )
 
-        return app
+        return app, guardians
@@ -0,0 +1,13 @@
+# Backend/admissions/signals.py
+
+from django.dispatch import Signal
+
+# Bulk writes that bypass model signals. Receivers run inside the writer's
+# transaction.
+
+# Sender: AdmissionApplication; args: applications=<list of saved instances>
+applications_bulk_created = Signal()
+
+# Sender: SeatHold; args: holds=<list of dicts with id, batch_id, application_id,
+# application_created_at>, for holds just moved HELD → EXPIRED
+seat_holds_expired = Signal()
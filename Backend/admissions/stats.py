@@ -0,0 +1,80 @@
+# Backend/admissions/stats.py
+
+"""
+Dashboard counts for admission applications.
+
+Everything comes from one GROUP BY over (status, batch, current_class,
+hear_about_us, day) which is then folded in Python. Days older than the
+requested window collapse into a single NULL bucket, so the number of
+grouped rows stays small however old the table gets.
+"""
+
+import datetime
+from collections import Counter
+
+from django.db.models import Case, Count, DateField, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AdmissionStatus
+
+DEFAULT_DAYS = 30
+MAX_DAYS = 366
+
+
+def _ranked(counter):
+    return [
+        {"value": value, "count": count}
+        for value, count in sorted(counter.items(), key=lambda kv: (-kv[1], str(kv[0])))
+    ]
+
+
+def admission_stats(qs, *, days=DEFAULT_DAYS):
+    """
+    Return {"total", "by_status", "by_batch", "by_class", "by_hear_about_us",
+    "by_day"} for `qs`. by_day covers the last `days` days (today included),
+    zero-filled, in the current time zone.
+    """
+    today = timezone.localdate()
+    first_day = today - datetime.timedelta(days=days - 1)
+    since = timezone.make_aware(datetime.datetime.combine(first_day, datetime.time.min))
+
+    rows = (
+        qs.order_by()
+        .annotate(
+            day=Case(
+                When(
+                    created_at__gte=since,
+                    then=TruncDate("created_at", tzinfo=timezone.get_current_timezone()),
+                ),
+                output_field=DateField(),
+            )
+        )
+        .values("status", "batch", "current_class", "hear_about_us", "day")
+        .annotate(n=Count("id"))
+    )
+
+    total = 0
+    by_status = Counter({s: 0 for s in AdmissionStatus.values})
+    by_batch, by_class, by_hear, by_day = Counter(), Counter(), Counter(), Counter()
+    for row in rows:
+        n = row["n"]
+        total += n
+        by_status[row["status"]] += n
+        by_batch[row["batch"]] += n
+        by_class[row["current_class"]] += n
+        by_hear[row["hear_about_us"] or ""] += n
+        if row["day"] is not None:
+            by_day[row["day"]] += n
+
+    return {
+        "total": total,
+        "by_status": dict(by_status),
+        "by_batch": _ranked(by_batch),
+        "by_class": _ranked(by_class),
+        "by_hear_about_us": _ranked(by_hear),
+        "by_day": [
+            {"date": day.isoformat(), "count": by_day[day]}
+            for day in (first_day + datetime.timedelta(days=i) for i in range(days))
+        ],
+    }
@@ -0,0 +1,74 @@
+# Backend/admissions/tasks.py
+
+from celery import shared_task
+from django.conf import settings
+from django.db import DatabaseError
+
+from . import idempotency, reservations
+from .intake import MAX_ATTEMPTS, process_ticket, prune_tickets, requeue_stale_tickets
+from .models import SeatHold
+from .photos import generate_thumbnail
+
+
+@shared_task(ignore_result=True)
+def generate_admission_thumbnail(application_id):
+    generate_thumbnail(application_id)
+
+
+@shared_task(
+    ignore_result=True,
+    rate_limit=settings.ADMISSION_INTAKE_RATE_LIMIT,
+    autoretry_for=(DatabaseError,),
+    retry_backoff=True,
+    max_retries=MAX_ATTEMPTS - 1,
+)
+def process_admission_ticket(ticket_id):
+    process_ticket(ticket_id)
+
+
+@shared_task(ignore_result=True)
+def requeue_stale_intake_tickets():
+    """Periodic recovery of queued-intake tickets nothing is working on."""
+    return requeue_stale_tickets()
+
+
+@shared_task(ignore_result=True)
+def prune_intake_tickets():
+    """Periodic removal of finished tickets past ADMISSION_INTAKE_TICKET_TTL_HOURS."""
+    return prune_tickets()
+
+
+@shared_task(ignore_result=True)
+def prune_idempotency_keys():
+    """Periodic removal of expired Idempotency-Keys (CELERY_BEAT_SCHEDULE)."""
+    return idempotency.prune_keys()
+
+
+@shared_task(ignore_result=True)
+def expire_seat_holds():
+    """
+    Periodic sweep (CELERY_BEAT_SCHEDULE): expire overdue holds in chunks of
+    ADMISSIONS_HOLD_SWEEP_CHUNK, one short transaction each, at most
+    ADMISSIONS_HOLD_SWEEP_MAX_CHUNKS per run; the next run picks up the rest.
+    Returns the number of holds expired.
+    """
+    chunk = settings.ADMISSIONS_HOLD_SWEEP_CHUNK
+    total = 0
+    for _ in range(settings.ADMISSIONS_HOLD_SWEEP_MAX_CHUNKS):
+        expired = SeatHold.expire_overdue_now(limit=chunk)
+        total += expired
+        if expired < chunk:
+            break
+    return total
+
+
+@shared_task(ignore_result=True)
+def reconcile_seat_reservations():
+    """
+    Periodic re-sync of the Redis seat reservations from Postgres, if enabled.
+    Also recounts Batch.held_seats, which that path updates after commit.
+    """
+    if reservations.enabled():
+        SeatHold.reconcile_held_seats()
+        return reservations.reconcile()
+    return 0
@@ -1,4 +1,919 @@
 # Backend/admissions/tests.py
-from django.test import TestCase
+import base64
+import csv
+import datetime
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, connection
+from django.core.management import CommandError, call_command
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APITestCase
+
+try:  # runs the reservation Lua scripts in-process
+    import fakeredis
+    import lupa  # noqa: F401
+except ImportError:
+    fakeredis = None
+
+from courses_app.models import Batch, Course
+from payments.models import Payment
+from users.models import UserProfile
+from .models import AdmissionApplication, AdmissionIdempotencyKey, AdmissionIntakeTicket, Guardian, GuardianRole, IntakeStatus, SeatHold
+from .serializers import AdmissionApplicationSerializer
+from . import archive, intake, reservations
+from .checks import check_queued_intake
+from .tasks import expire_seat_holds, prune_idempotency_keys, prune_intake_tickets
+
+User = get_user_model()
+
+
+class AdmissionFixturesMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user(
+            email="staff@example.com", password="x", l_name="Staff", is_staff=True
+        )
+        cls.course = Course.objects.create(title="Mathematics", grade_level="Class 10")
+        cls.batches = [
+            Batch.objects.create(
+                course=cls.course,
+                batch_number=str(n),
+                days="Sun, Tue",
+                time_slot="10:00 AM",
+                class_name="Class 10",
+            )
+            for n in (1, 2)
+        ]
+
+    @classmethod
+    def make_application(cls, batch=None, **kwargs):
+        data = {
+            "student_name": "Student",
+            "date_of_birth": datetime.date(2010, 1, 1),
+            "sex": "M",
+            "current_class": "class-10",
+            "batch": batch or cls.batches[0],
+        }
+        data.update(kwargs)
+        app = AdmissionApplication.objects.create(**data)
+        Guardian.objects.bulk_create(
+            [
+                Guardian(application=app, role=GuardianRole.FATHER, name="Father"),
+                Guardian(application=app, role=GuardianRole.MOTHER, name="Mother"),
+            ]
+        )
+        return app
+
+
+def apply_payload(batch, **personal):
+    """Minimal public admission form payload accepted by AdmissionApply."""
+    info = {
+        "fullName": "Rahim Uddin",
+        "dateOfBirth": "2010-01-01",
+        "gender": "male",
+        "phone": "01711000111",
+    }
+    info.update(personal)
+    return {
+        "personalInformation": info,
+        "parentsAndGuardian": {
+            "father": {"name": "Father", "phone": "01700000001"},
+            "mother": {"name": "Mother", "phone": "01700000002"},
+            "guardian": {"relation": "father"},
+        },
+        "academicPreferences": {"classLevel": "class-10", "batchId": batch.pk},
+    }
+
+
+def png_data_url(size=(1200, 900)):
+    buf = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buf, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+class AdmissionQueryBudgetTests(AdmissionFixturesMixin, APITestCase):
+    """
+    Listing / detail must cost a constant number of queries: one for the
+    ETag validators, one for the applications (with batch + course joined)
+    and one for guardians.
+    """
+
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def _seed(self, count):
+        for i in range(count):
+            self.make_application(batch=self.batches[i % 2], student_name=f"S{i}")
+
+    def test_list_query_count_is_constant(self):
+        self._seed(3)
+        with self.assertNumQueries(3):
+            small = self.client.get("/api/admissions/")
+        self._seed(12)
+        with self.assertNumQueries(3):
+            large = self.client.get("/api/admissions/")
+        self.assertEqual(len(small.data), 3)
+        self.assertEqual(len(large.data), 15)
+        self.assertTrue(all(len(row["guardians"]) == 2 for row in large.data))
+
+    def test_paginated_list_query_count_is_constant(self):
+        self._seed(15)
+        with self.assertNumQueries(3):
+            resp = self.client.get("/api/admissions/", {"page_size": 10})
+        self.assertEqual(len(resp.data["results"]), 10)
+
+    def test_detail_query_count(self):
+        app = self.make_application()
+        with self.assertNumQueries(3):
+            resp = self.client.get(f"/api/admissions/{app.pk}/")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["batch_detail"]["id"], app.batch_id)
+
+    def test_batch_detail_rendered_once_per_batch(self):
+        for batch in (self.batches[0], self.batches[0], self.batches[1]):
+            self.make_application(batch=batch)
+        render = AdmissionApplicationSerializer._render_batch_detail
+        with mock.patch.object(
+            AdmissionApplicationSerializer, "_render_batch_detail", side_effect=render
+        ) as spy:
+            resp = self.client.get("/api/admissions/")
+        self.assertEqual(spy.call_count, 2)
+        self.assertEqual(resp.data[0]["batch_detail"]["id"], self.batches[1].pk)
+
+
+class AdmissionCursorPaginationTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def walk(self, page_size):
+        ids, url = [], f"/api/admissions/?page_size={page_size}"
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            ids += [row["id"] for row in resp.data["results"]]
+            url = resp.data["next"]
+        return ids
+
+    def test_cursor_round_trip_visits_every_row_once(self):
+        apps = [self.make_application(student_name=f"S{i}") for i in range(5)]
+        self.assertEqual(self.walk(2), [app.pk for app in reversed(apps)])
+
+    def test_rows_sharing_created_at_are_split_by_id(self):
+        apps = [self.make_application(student_name=f"S{i}") for i in range(5)]
+        AdmissionApplication.objects.update(created_at=apps[0].created_at)
+        self.assertEqual(self.walk(2), sorted((app.pk for app in apps), reverse=True))
+
+    def test_malformed_cursor_is_400(self):
+        for cursor in ("not-a-cursor", "eyJjIjoxfQ", "W10"):  # junk, {"c":1}, []
+            resp = self.client.get("/api/admissions/", {"cursor": cursor})
+            self.assertEqual(resp.status_code, 400, cursor)
+            self.assertIn("cursor", resp.data)
+
+
+class AdmissionListFilterTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_filters_combine(self):
+        keep = self.make_application(
+            batch=self.batches[1], status="PAID", hear_about_us="banner"
+        )
+        self.make_application(batch=self.batches[1], status="PENDING")
+        self.make_application(batch=self.batches[0], status="PAID")
+
+        resp = self.client.get(
+            "/api/admissions/",
+            {"status": "paid", "batch": self.batches[1].pk, "hear_about_us": "banner"},
+        )
+        self.assertEqual([row["id"] for row in resp.data], [keep.pk])
+
+    def test_created_before_plain_date_includes_that_day(self):
+        app = self.make_application()
+        day = app.created_at.date().isoformat()
+        resp = self.client.get("/api/admissions/", {"created_before": day})
+        self.assertEqual([row["id"] for row in resp.data], [app.pk])
+
+    def test_invalid_filter_is_400(self):
+        resp = self.client.get("/api/admissions/", {"is_reviewed": "maybe"})
+        self.assertEqual(resp.status_code, 400)
+
+
+class AdmissionSearchTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_search_matches_student_and_guardian_fields(self):
+        rahim = self.make_application(student_name="Rahim Uddin", student_mobile="01711000111")
+        karim = self.make_application(student_name="Karim Hasan")
+        Guardian.objects.create(
+            application=karim, role=GuardianRole.OTHER, name="Uncle", contact_number="01899555444"
+        )
+
+        def ids(term):
+            return [row["id"] for row in self.client.get("/api/admissions/", {"q": term}).data]
+
+        self.assertEqual(ids("rahim"), [rahim.pk])
+        self.assertEqual(ids("ahi"), [rahim.pk])
+        self.assertEqual(ids("1711000"), [rahim.pk])
+        self.assertEqual(ids("99555"), [karim.pk])
+        self.assertEqual(ids("nobody"), [])
+
+    def test_search_vector_is_maintained(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            app = self.make_application(student_name="Nusrat Jahan")
+            Guardian.objects.create(application=app, role=GuardianRole.OTHER, name="Selina")
+        matches = AdmissionApplication.objects.filter(search_vector="selina")
+        self.assertEqual(list(matches), [app])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            app.student_name = "Nusrat Akter"
+            app.save()
+        self.assertTrue(AdmissionApplication.objects.filter(search_vector="akter").exists())
+
+
+class AdmissionExportTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_csv_export_flattens_guardians(self):
+        app = self.make_application(student_name="Rahim", status="PAID")
+        self.make_application(status="PENDING")
+
+        resp = self.client.get("/api/admissions/export/", {"status": "PAID"})
+        self.assertEqual(resp.status_code, 200)
+        body = b"".join(resp.streaming_content).decode("utf-8-sig")
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], str(app.pk))
+        self.assertEqual(rows[0]["father_name"], "Father")
+        self.assertEqual(rows[0]["mother_name"], "Mother")
+
+    def test_formula_like_text_is_neutralised(self):
+        self.make_application(student_name='=HYPERLINK("http://x.test","y")', student_mobile="+8801711")
+        resp = self.client.get("/api/admissions/export/")
+        row = next(csv.DictReader(io.StringIO(b"".join(resp.streaming_content).decode("utf-8-sig"))))
+        self.assertEqual(row["student_name"], "'=HYPERLINK(\"http://x.test\",\"y\")")
+        self.assertEqual(row["student_mobile"], "'+8801711")
+
+    def test_xlsx_export_is_a_valid_workbook(self):
+        self.make_application(student_name="A & B <C>")
+        resp = self.client.get("/api/admissions/export/", {"type": "xlsx"})
+        self.assertEqual(resp.status_code, 200)
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(resp.streaming_content)))
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        self.assertIn("A &amp; B &lt;C&gt;", sheet)
+
+    def test_export_requires_staff(self):
+        student = User.objects.create_user(email="s@example.com", password="x", l_name="S")
+        self.client.force_authenticate(student)
+        self.assertEqual(self.client.get("/api/admissions/export/").status_code, 403)
+
+
+class AdmissionImportTests(AdmissionFixturesMixin, APITestCase):
+    HEADER = "full_name,date_of_birth,gender,phone,class_level,batch_id,father_name,mother_name\n"
+
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_import_reports_bad_rows_and_creates_the_rest(self):
+        batch = self.batches[0].pk
+        body = (
+            self.HEADER
+            + f"Rahim,2010-01-01,male,0171,class-10,{batch},F1,M1\n"
+            + f"NoDob,,male,0172,class-10,{batch},F2,M2\n"
+            + "BadBatch,2010-01-01,male,0173,class-10,999999,F3,M3\n"
+            + f"Karim,2011-02-03,female,0174,class-10,{batch},F4,M4\n"
+        )
+        upload = io.BytesIO(body.encode("utf-8"))
+        upload.name = "walkins.csv"
+
+        # batches, then per chunk: savepoint, duplicate check, applications,
+        # guardians, search vectors, release (the funnel rollup runs on commit)
+        with self.assertNumQueries(7):
+            resp = self.client.post("/api/admissions/import/", {"file": upload}, format="multipart")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["created"], 2)
+        self.assertEqual([e["row"] for e in resp.data["errors"]], [2, 3])
+        karim = AdmissionApplication.objects.get(student_name="Karim")
+        self.assertEqual(karim.sex, "F")
+        self.assertEqual(
+            sorted(karim.guardians.values_list("name", flat=True)), ["F4", "M4"]
+        )
+
+    def test_non_utf8_file_is_rejected_before_importing(self):
+        batch = self.batches[0].pk
+        body = self.HEADER + f"Rahim,2010-01-01,male,0171,class-10,{batch},F1,M1\n" + (
+            f"Zoë,2010-01-01,female,0172,class-10,{batch},F2,M2\n"
+        )
+        upload = io.BytesIO(body.encode("cp1252"))
+        upload.name = "excel.csv"
+        resp = self.client.post("/api/admissions/import/", {"file": upload}, format="multipart")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("UTF-8", resp.data["file"])
+        self.assertFalse(AdmissionApplication.objects.exists())
+
+
+class AdmissionPhotoTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        cache.clear()  # anonymous throttle counts from earlier tests
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media, CELERY_TASK_ALWAYS_EAGER=True)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_thumbnail_is_built_after_commit(self):
+        payload = apply_payload(self.batches[0])
+        payload["attachments"] = {"photoPreview": png_data_url()}
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post("/api/admissions/apply/", payload, format="json")
+        self.assertEqual(resp.status_code, 201)
+
+        app = AdmissionApplication.objects.get(pk=resp.data["id"])
+        self.assertTrue(app.picture)
+        self.assertTrue(app.picture_thumbnail)
+        with Image.open(app.picture_thumbnail.path) as thumb:
+            self.assertLessEqual(max(thumb.size), 320)
+
+    def test_multipart_photo_upload(self):
+        buf = io.BytesIO(base64.b64decode(png_data_url().split(",", 1)[1]))
+        buf.name = "photo.png"
+        payload = json.dumps(apply_payload(self.batches[0]))
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(
+                "/api/admissions/apply/",
+                {"payload": payload, "photo": buf},
+                format="multipart",
+            )
+        self.assertEqual(resp.status_code, 201)
+        app = AdmissionApplication.objects.get(pk=resp.data["id"])
+        self.assertTrue(app.picture.name.endswith(".png"))
+        self.assertTrue(app.picture_thumbnail)
+
+    def test_upload_type_comes_from_the_image_not_the_client(self):
+        payload = json.dumps(apply_payload(self.batches[0]))
+        fake = SimpleUploadedFile("photo.jpg", b"<?php echo 1; ?>", content_type="image/jpeg")
+        resp = self.client.post(
+            "/api/admissions/apply/", {"payload": payload, "photo": fake}, format="multipart"
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("photo", resp.data)
+
+        png = SimpleUploadedFile(
+            "photo.jpg", base64.b64decode(png_data_url().split(",", 1)[1]), content_type="image/jpeg"
+        )
+        resp = self.client.post(
+            "/api/admissions/apply/", {"payload": payload, "photo": png}, format="multipart"
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertTrue(AdmissionApplication.objects.get().picture.name.endswith(".png"))
+
+    @override_settings(ADMISSION_PHOTO_MAX_BYTES=1024)
+    def test_oversized_photo_is_rejected(self):
+        payload = apply_payload(self.batches[0])
+        payload["attachments"] = {"photoPreview": png_data_url()}
+        resp = self.client.post("/api/admissions/apply/", payload, format="json")
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("photoPreview", resp.data["attachments"])
+        self.assertFalse(AdmissionApplication.objects.exists())
+
+
+class AdmissionApplyTests(AdmissionFixturesMixin, APITestCase):
+    def test_apply_writes_application_and_guardians_atomically(self):
+        payload = apply_payload(self.batches[0])
+        payload["guardians"] = [{"role": "other", "name": "Uncle", "contact_number": "0199"}]
+        # batch, savepoint, duplicate check, application, guardians (one
+        # INSERT), release, then the response re-reads guardians; the funnel
+        # rollup runs on commit
+        with self.assertNumQueries(7):
+            resp = self.client.post("/api/admissions/apply/", payload, format="json")
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(len(resp.data["guardians"]), 3)
+
+    def test_failed_guardian_insert_leaves_no_application(self):
+        payload = apply_payload(self.batches[0])
+        with mock.patch.object(Guardian.objects, "bulk_create", side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.client.post("/api/admissions/apply/", payload, format="json")
+        self.assertFalse(AdmissionApplication.objects.exists())
+
+    def test_idempotency_key_replays_original_response(self):
+        payload = apply_payload(self.batches[0])
+        headers = {"Idempotency-Key": "form-123"}
+        first = self.client.post("/api/admissions/apply/", payload, format="json", headers=headers)
+        with self.assertNumQueries(1):
+            again = self.client.post("/api/admissions/apply/", payload, format="json", headers=headers)
+        self.assertEqual(again.status_code, 201)
+        self.assertEqual(again.data["id"], first.data["id"])
+        self.assertEqual(again["Idempotent-Replayed"], "true")
+        self.assertEqual(AdmissionApplication.objects.count(), 1)
+
+        other = apply_payload(self.batches[0], fullName="Someone Else")
+        resp = self.client.post("/api/admissions/apply/", other, format="json", headers=headers)
+        self.assertEqual(resp.status_code, 422)
+
+    def test_expired_keys_are_reused_one_at_a_time_and_pruned_in_bulk(self):
+        for key in ("form-1", "form-2"):
+            self.client.post(
+                "/api/admissions/apply/", apply_payload(self.batches[0]), format="json",
+                headers={"Idempotency-Key": key},
+            )
+        AdmissionIdempotencyKey.objects.update(created_at=timezone.now() - datetime.timedelta(days=2))
+
+        resp = self.client.post(
+            "/api/admissions/apply/", apply_payload(self.batches[0]), format="json",
+            headers={"Idempotency-Key": "form-1"},
+        )
+        self.assertEqual(resp.status_code, 201)
+        self.assertNotIn("Idempotent-Replayed", resp)
+        # The other expired key is left for the beat task
+        self.assertEqual(AdmissionIdempotencyKey.objects.count(), 2)
+        self.assertEqual(prune_idempotency_keys(), 1)
+        self.assertEqual(list(AdmissionIdempotencyKey.objects.values_list("key", flat=True)), ["form-1"])
+
+
+@override_settings(ADMISSIONS_QUEUED_INTAKE=True, CELERY_TASK_ALWAYS_EAGER=True)
+class AdmissionQueuedIntakeTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        cache.clear()  # anonymous throttle counts from earlier tests
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def test_apply_returns_ticket_and_worker_creates_application(self):
+        buf = io.BytesIO(base64.b64decode(png_data_url().split(",", 1)[1]))
+        buf.name = "photo.png"
+        payload = json.dumps(apply_payload(self.batches[0]))
+        # Ticket insert in a savepoint only: no batch lookup, no photo decode
+        with self.captureOnCommitCallbacks() as callbacks, self.assertNumQueries(3):
+            resp = self.client.post(
+                "/api/admissions/apply/", {"payload": payload, "photo": buf}, format="multipart"
+            )
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(resp.data["status"], IntakeStatus.QUEUED)
+        self.assertFalse(AdmissionApplication.objects.exists())
+
+        status_url = resp["Location"]
+        pending = self.client.get(status_url)
+        self.assertEqual(pending["Retry-After"], "2")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for callback in callbacks:
+                callback()
+        done = self.client.get(status_url)
+        self.assertEqual(done.data["status"], IntakeStatus.DONE)
+        app = AdmissionApplication.objects.get(pk=done.data["application"]["id"])
+        self.assertEqual(app.guardians.count(), 2)
+        self.assertTrue(app.picture_thumbnail)
+        self.assertFalse(AdmissionIntakeTicket.objects.get().photo)
+
+    def test_checks_run_before_and_after_queueing(self):
+        incomplete = apply_payload(self.batches[0], fullName="")
+        resp = self.client.post("/api/admissions/apply/", incomplete, format="json")
+        self.assertEqual(resp.status_code, 400)
+        self.assertFalse(AdmissionIntakeTicket.objects.exists())
+
+        bad_batch = apply_payload(self.batches[0])
+        bad_batch["academicPreferences"]["batchId"] = 999999
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post("/api/admissions/apply/", bad_batch, format="json")
+        failed = self.client.get(resp["Location"])
+        self.assertEqual(failed.data["status"], IntakeStatus.FAILED)
+        self.assertIn("batchId", failed.data["errors"]["academicPreferences"])
+
+    def test_idempotency_key_returns_same_ticket(self):
+        payload = apply_payload(self.batches[0])
+        headers = {"Idempotency-Key": "form-123"}
+        first = self.client.post("/api/admissions/apply/", payload, format="json", headers=headers)
+        again = self.client.post("/api/admissions/apply/", payload, format="json", headers=headers)
+        self.assertEqual(again.status_code, 202)
+        self.assertEqual(again.data["ticket"], first.data["ticket"])
+
+        other = apply_payload(self.batches[0], fullName="Someone Else")
+        resp = self.client.post("/api/admissions/apply/", other, format="json", headers=headers)
+        self.assertEqual(resp.status_code, 422)
+
+    def test_stale_tickets_are_requeued_until_attempts_run_out(self):
+        lost = AdmissionIntakeTicket.objects.create(payload=apply_payload(self.batches[0]))
+        crashed = AdmissionIntakeTicket.objects.create(
+            payload=apply_payload(self.batches[0], fullName="Karim Hasan"),
+            status=IntakeStatus.PROCESSING,
+            attempts=intake.MAX_ATTEMPTS,
+        )
+        fresh = AdmissionIntakeTicket.objects.create(payload=apply_payload(self.batches[0]))
+        AdmissionIntakeTicket.objects.exclude(pk=fresh.pk).update(
+            updated_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(intake.requeue_stale_tickets(), 1)
+        lost.refresh_from_db()
+        crashed.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(lost.status, IntakeStatus.DONE)
+        self.assertEqual(crashed.status, IntakeStatus.FAILED)
+        self.assertEqual(fresh.status, IntakeStatus.QUEUED)
+
+    def test_finished_tickets_are_pruned_by_the_beat_task(self):
+        done, queued = (
+            AdmissionIntakeTicket.objects.create(payload={}, status=status)
+            for status in (IntakeStatus.DONE, IntakeStatus.QUEUED)
+        )
+        AdmissionIntakeTicket.objects.update(created_at=timezone.now() - datetime.timedelta(days=7))
+        self.assertEqual(prune_intake_tickets(), 1)
+        self.assertEqual(list(AdmissionIntakeTicket.objects.values_list("pk", flat=True)), [queued.pk])
+
+    def test_eager_tasks_are_flagged(self):
+        self.assertEqual([w.id for w in check_queued_intake(None)], ["admissions.W001"])
+
+
+class SeatHoldSweepTests(AdmissionFixturesMixin, APITestCase):
+    def hold(self, minutes):
+        return SeatHold.place(
+            self.make_application(),
+            self.batches[0],
+            expires_at=timezone.now() + datetime.timedelta(minutes=minutes),
+        )
+
+    def held_seats(self):
+        return Batch.objects.values_list("held_seats", flat=True).get(pk=self.batches[0].pk)
+
+    @override_settings(ADMISSIONS_HOLD_SWEEP_CHUNK=2, ADMISSIONS_HOLD_SWEEP_MAX_CHUNKS=1)
+    def test_sweep_expires_in_bounded_chunks(self):
+        active = self.hold(10)
+        overdue = [self.hold(-3), self.hold(-2), self.hold(-1)]
+        # Overdue holds stop counting as soon as they lapse, swept or not
+        self.assertEqual(SeatHold.active_count_for_batch(self.batches[0].pk), 1)
+
+        self.assertEqual(self.held_seats(), 4)
+
+        self.assertEqual(expire_seat_holds(), 2)
+        self.assertEqual(expire_seat_holds(), 1)
+        self.assertEqual(expire_seat_holds(), 0)
+        self.assertEqual(self.held_seats(), 1)
+        self.assertEqual(
+            set(SeatHold.objects.filter(status="EXPIRED").values_list("pk", flat=True)),
+            {h.pk for h in overdue},
+        )
+        active.refresh_from_db()
+        self.assertEqual(active.status, "HELD")
+
+    def test_held_seat_counter_follows_releases_and_reconciles(self):
+        confirmed, cancelled, _ = self.hold(10), self.hold(10), self.hold(10)
+        confirmed.release("CONFIRMED")
+        cancelled.release("CANCELLED")
+        cancelled.release("CANCELLED")  # no-op once it is no longer HELD
+        self.assertEqual(self.held_seats(), 1)
+
+        Batch.objects.filter(pk=self.batches[0].pk).update(held_seats=7)
+        self.assertEqual(SeatHold.reconcile_held_seats(), {self.batches[0].pk: (7, 1)})
+        self.assertEqual(self.held_seats(), 1)
+        self.assertEqual(SeatHold.reconcile_held_seats(), {})
+
+    def test_expiry_can_target_one_application(self):
+        mine, other = self.hold(-1), self.hold(-1)
+        self.assertEqual(SeatHold.expire_overdue_now(application_id=mine.application_id), 1)
+        other.refresh_from_db()
+        self.assertEqual(other.status, "HELD")
+
+
+@override_settings(SEAT_RESERVATION_REDIS_URL="redis://seats.test:6379/0")
+class SeatReservationTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        cache.clear()  # anonymous throttle counts from earlier tests
+        self.client_, self.reserve, self.release, self.reconcile = (mock.MagicMock() for _ in range(4))
+        patcher = mock.patch.object(
+            reservations,
+            "_scripts",
+            return_value=(self.client_, self.reserve, self.release, self.reconcile),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reconcile_pushes_capacity_and_live_holds(self):
+        batch = self.batches[0]
+        self.make_application(status="PAID")
+        held = SeatHold.place(
+            self.make_application(), batch, expires_at=timezone.now() + datetime.timedelta(minutes=5)
+        )
+        self.client_.pipeline.return_value.__enter__.return_value.execute.return_value = [0]
+
+        reservations.reconcile([batch])
+        args = self.reconcile.call_args.kwargs["args"]
+        self.assertEqual(args[0], batch.total_seat - 1)
+        self.assertEqual(args[3], held.application_id)
+
+    def test_confirmed_hold_is_released_after_commit(self):
+        hold = SeatHold.place(
+            self.make_application(), self.batches[0], expires_at=timezone.now() + datetime.timedelta(minutes=5)
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            hold.release("CONFIRMED")
+        self.release.assert_called_once_with(
+            keys=reservations._keys(hold.batch_id), args=[hold.application_id, "1"]
+        )
+
+
+@skipUnless(fakeredis, "needs fakeredis with Lua support")
+@override_settings(SEAT_RESERVATION_REDIS_URL="redis://seats.test:6379/0")
+class SeatReservationScriptTests(AdmissionFixturesMixin, APITestCase):
+    """The real Lua scripts, against fakeredis."""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        reservations._scripts.cache_clear()
+        patcher = mock.patch.object(reservations.redis.Redis, "from_url", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(reservations._scripts.cache_clear)
+
+        self.batch = self.batches[0]
+        Batch.objects.filter(pk=self.batch.pk).update(total_seat=2)
+        self.batch.refresh_from_db()
+        self.make_application(status="PAID")
+        self.holds_key, self.capacity_key = reservations._keys(self.batch.pk)
+
+    def reserve(self, app):
+        return reservations.reserve(self.batch, app.pk, timezone.now() + datetime.timedelta(minutes=5))
+
+    def test_reserve_release_and_reconcile(self):
+        first, second, durable, abandoned = (self.make_application() for _ in range(4))
+
+        # Unprimed batches are reconciled from Postgres on first use
+        self.assertEqual(self.reserve(first), reservations.RESERVED)
+        self.assertEqual(self.redis.get(self.capacity_key), b"1")
+        self.assertEqual(self.reserve(first), reservations.ALREADY_HELD)
+        self.assertEqual(self.reserve(second), reservations.FULL)
+
+        reservations.release(self.batch.pk, first.pk)
+        self.assertEqual(self.reserve(second), reservations.RESERVED)
+        reservations.release(self.batch.pk, second.pk, confirmed=True)
+        self.assertEqual(self.redis.get(self.capacity_key), b"0")
+        self.assertEqual(self.redis.zcard(self.holds_key), 0)
+
+        # Reconcile resets capacity, adds holds Redis missed and drops
+        # reservations that never became a SeatHold
+        SeatHold.place(durable, self.batch, expires_at=timezone.now() + datetime.timedelta(minutes=5))
+        self.redis.zadd(self.holds_key, {abandoned.pk: reservations._ms(timezone.now()) + 1000})
+        self.assertEqual(reservations.reconcile([self.batch]), 1)
+        self.assertEqual(self.redis.get(self.capacity_key), b"1")
+        self.assertEqual(self.redis.zrange(self.holds_key, 0, -1), [str(durable.pk).encode()])
+
+class AdmissionStatsTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_stats_are_one_grouped_query(self):
+        self.make_application(status="PAID", hear_about_us="banner")
+        self.make_application(status="PENDING", hear_about_us="banner")
+        self.make_application(batch=self.batches[1], status="PENDING", current_class="class-9")
+
+        with self.assertNumQueries(1):
+            resp = self.client.get("/api/admissions/stats/", {"days": 7})
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.data
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(data["by_status"], {"PENDING": 2, "PAID": 1, "CANCELLED": 0})
+        self.assertEqual(data["by_batch"][0], {"value": self.batches[0].pk, "count": 2})
+        self.assertIn({"value": "banner", "count": 2}, data["by_hear_about_us"])
+        self.assertEqual(len(data["by_day"]), 7)
+        self.assertEqual(data["by_day"][-1]["count"], 3)
+
+    def test_stats_respect_filters(self):
+        self.make_application(status="PAID")
+        self.make_application(status="PENDING")
+        resp = self.client.get("/api/admissions/stats/", {"status": "PAID"})
+        self.assertEqual(resp.data["total"], 1)
+
+
+class AdmissionBulkApproveTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_bulk_approve_creates_users_profiles_and_contiguous_uids(self):
+        apps = [
+            self.make_application(student_name=f"Student {i}", student_email=f"s{i}@example.com")
+            for i in range(5)
+        ]
+        other = self.make_application(batch=self.batches[1], student_name="Other One")
+        ids = [a.pk for a in apps] + [other.pk, 999999]
+
+        # Per chunk: savepoint, lock, users (lookup, insert, activate), profiles,
+        # lock + max per UID prefix (x2), profile insert, app update, release
+        with self.assertNumQueries(13):
+            resp = self.client.post("/api/admissions/review/bulk/", {"ids": ids}, format="json")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["not_found"], [999999])
+        self.assertEqual(len(resp.data["approved"]), 6)
+
+        yy = str(timezone.localdate().year)[-2:]
+        uids = sorted(
+            UserProfile.objects.filter(current_batch=self.batches[0]).values_list("student_uid", flat=True)
+        )
+        self.assertEqual(uids, [f"{yy}-UNK-class-10-B1-{n:04d}" for n in range(1, 6)])
+        app = AdmissionApplication.objects.select_related("user__profile").get(pk=apps[0].pk)
+        self.assertTrue(app.is_reviewed)
+        self.assertEqual(app.user.email, "s0@example.com")
+        self.assertTrue(app.user.is_approved)
+        self.assertEqual(app.user.profile.current_batch_id, self.batches[0].pk)
+
+        # Re-approving keeps users and UIDs
+        self.client.post("/api/admissions/review/bulk/", {"ids": ids}, format="json")
+        self.assertEqual(User.objects.filter(is_staff=False).count(), 6)
+        self.assertEqual(UserProfile.objects.filter(student_uid__endswith="-0006").count(), 0)
+
+    def test_single_review_endpoint_approves(self):
+        app = self.make_application(student_name="Solo Student")
+        resp = self.client.patch(f"/api/admissions/{app.pk}/review/", {"is_approved": True}, format="json")
+        self.assertEqual(resp.status_code, 200)
+        app.refresh_from_db()
+        self.assertTrue(app.user.profile.student_uid.endswith("-0001"))
+
+
+class AdmissionSparseFieldsTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_fields_limit_keys_columns_and_queries(self):
+        self.make_application(student_name="Rahim")
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get("/api/admissions/", {"fields": "id,student_name,status"})
+        # validators + one narrow SELECT
+        self.assertEqual(len(ctx.captured_queries), 2)
+        sql = ctx.captured_queries[1]["sql"]
+        self.assertNotIn("home_location", sql)
+        self.assertNotIn("courses_app_batch", sql)
+        self.assertEqual(set(resp.data[0]), {"id", "student_name", "status"})
+
+    def test_expand_adds_relations(self):
+        app = self.make_application()
+        resp = self.client.get(
+            f"/api/admissions/{app.pk}/",
+            {"fields": "id,batch", "expand": "batch_detail,guardians"},
+        )
+        self.assertEqual(set(resp.data), {"id", "batch", "batch_detail", "guardians"})
+        self.assertEqual(resp.data["batch_detail"]["id"], app.batch_id)
+        self.assertEqual(len(resp.data["guardians"]), 2)
+
+    def test_unknown_field_is_400(self):
+        resp = self.client.get("/api/admissions/", {"fields": "id,password"})
+        self.assertEqual(resp.status_code, 400)
+
+
+class AdmissionConditionalGetTests(AdmissionFixturesMixin, APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(self.staff)
+
+    def test_detail_304_until_application_or_guardian_changes(self):
+        app = self.make_application()
+        url = f"/api/admissions/{app.pk}/"
+        first = self.client.get(url)
+        etag = first["ETag"]
+        self.assertIn("Last-Modified", first)
+
+        with self.assertNumQueries(1):
+            again = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+
+        guardian = app.guardians.first()
+        guardian.name = "Changed"
+        guardian.save()
+        changed = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_list_304_and_depends_on_query(self):
+        self.make_application()
+        first = self.client.get("/api/admissions/")
+        with self.assertNumQueries(1):
+            again = self.client.get("/api/admissions/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        other = self.client.get(
+            "/api/admissions/", {"fields": "id"}, HTTP_IF_NONE_MATCH=first["ETag"]
+        )
+        self.assertEqual(other.status_code, 200)
+
+        self.make_application()
+        stale = self.client.get("/api/admissions/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(stale.status_code, 200)
+
+    def test_page_validators_only_read_the_page(self):
+        for _ in range(3):
+            self.make_application()
+        first = self.client.get("/api/admissions/", {"page_size": 2})
+        with CaptureQueriesContext(connection) as queries:
+            again = self.client.get(
+                "/api/admissions/", {"page_size": 2}, HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        self.assertIn("LIMIT 3", queries[0]["sql"])
+
+    def test_course_edit_invalidates(self):
+        app = self.make_application()
+        detail = self.client.get(f"/api/admissions/{app.pk}/")
+        listing = self.client.get("/api/admissions/")
+
+        Course.objects.filter(pk=self.course.pk).update(
+            title="Higher Mathematics", updated_at=timezone.now() + datetime.timedelta(seconds=1)
+        )
+        for url, resp in ((f"/api/admissions/{app.pk}/", detail), ("/api/admissions/", listing)):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=resp["ETag"]).status_code, 200)
+
+
+class AdmissionDuplicateTests(AdmissionFixturesMixin, APITestCase):
+    def test_fingerprint_normalizes_mobile(self):
+        first = self.make_application(student_mobile="01711-000111")
+        second = self.make_application(student_name="Different", student_mobile="+880 1711 000111")
+        self.assertEqual(first.duplicate_fingerprint, second.duplicate_fingerprint)
+        self.assertTrue(first.duplicate_fingerprint.endswith("m:01711000111"))
+
+    def test_apply_flags_duplicates_and_staff_sees_clusters(self):
+        batch = self.batches[0]
+        first = self.client.post("/api/admissions/apply/", apply_payload(batch), format="json")
+        again = self.client.post(
+            "/api/admissions/apply/",
+            apply_payload(batch, fullName="Rahim Udin", phone="+8801711000111"),
+            format="json",
+        )
+        other_batch = self.client.post(
+            "/api/admissions/apply/", apply_payload(self.batches[1]), format="json"
+        )
+        self.assertFalse(first.data["possible_duplicate"])
+        self.assertTrue(again.data["possible_duplicate"])
+        self.assertFalse(other_batch.data["possible_duplicate"])
+
+        self.client.force_authenticate(self.staff)
+        with self.assertNumQueries(2):
+            resp = self.client.get("/api/admissions/duplicates/")
+        self.assertEqual(len(resp.data), 1)
+        self.assertEqual(
+            [row["id"] for row in resp.data[0]["applications"]],
+            [first.data["id"], again.data["id"]],
+        )
+
+
+class AdmissionArchiveTests(AdmissionFixturesMixin, TransactionTestCase):
+    databases = {"default", "archive"}
+
+    def setUp(self):
+        self.setUpTestData()
+        self.old = self.make_application(student_name="Old Student")
+        SeatHold.objects.create(
+            application=self.old, batch=self.old.batch, expires_at=timezone.now()
+        )
+        Payment.objects.create(tran_id="T-OLD", application=self.old, amount=100)
+        AdmissionApplication.objects.filter(pk=self.old.pk).update(
+            created_at=timezone.make_aware(datetime.datetime(2024, 6, 1))
+        )
+        self.current = self.make_application(student_name="Current Student")
+
+    def test_archive_and_restore_season(self):
+        call_command("archive_admissions", "2024", stdout=io.StringIO())
+
+        self.assertEqual(list(AdmissionApplication.objects.values_list("pk", flat=True)), [self.current.pk])
+        self.assertFalse(Payment.objects.exists())
+        archived = AdmissionApplication.objects.using("archive").select_related("batch").prefetch_related("guardians")
+        self.assertEqual([app.pk for app in archived], [self.old.pk])
+        self.assertEqual(archived[0].batch, self.old.batch)
+        self.assertEqual(len(archived[0].guardians.all()), 2)
+        self.assertEqual(Payment.objects.using("archive").get().tran_id, "T-OLD")
+
+        call_command("archive_admissions", "2024", "--restore", stdout=io.StringIO())
+        self.assertEqual(AdmissionApplication.objects.count(), 2)
+        self.assertEqual(self.old.seat_holds.count(), 1)
+        self.assertEqual(self.old.guardians.count(), 2)
+        self.assertFalse(AdmissionApplication.objects.using("archive").exists())
+
+    def test_funnel_rebuild_never_reads_live_rows_as_archived(self):
+        from financials.models import AdmissionFunnelDaily
+        from financials.utils import rebuild
+
+        self.addCleanup(archive.sync_archive_tables)
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE archive.admissions_admissionapplication")
+        rebuild()
+        self.assertEqual(
+            sum(AdmissionFunnelDaily.objects.values_list("applications", flat=True)), 2
+        )
+
+    def test_current_season_is_refused(self):
+        with self.assertRaises(CommandError):
+            call_command("archive_admissions", str(timezone.localdate().year))
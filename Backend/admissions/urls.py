@@ -1,11 +1,32 @@
 # Backend/admissions/urls.py
 from django.urls import path
-from .views import AdmissionApply, AdmissionList, AdmissionDetail, AdmissionReviewApprove
+from .views import (
+    AdmissionApply,
+    AdmissionIntakeStatus,
+    AdmissionList,
+    AdmissionStats,
+    AdmissionDuplicates,
+    AdmissionExport,
+    AdmissionImport,
+    AdmissionDetail,
+    AdmissionReviewApprove,
+    AdmissionBulkApprove,
+)
 
 urlpatterns = [
 
     path("admissions/apply/", AdmissionApply.as_view()),
+    path(
+        "admissions/intake/<uuid:ticket_id>/",
+        AdmissionIntakeStatus.as_view(),
+        name="admission-intake-status",
+    ),
     path("admissions/", AdmissionList.as_view()),
+    path("admissions/stats/", AdmissionStats.as_view()),
+    path("admissions/duplicates/", AdmissionDuplicates.as_view()),
+    path("admissions/export/", AdmissionExport.as_view()),
+    path("admissions/import/", AdmissionImport.as_view()),
     path("admissions/<int:pk>/", AdmissionDetail.as_view()),
     path("admissions/<int:pk>/review/", AdmissionReviewApprove.as_view()),
+    path("admissions/review/bulk/", AdmissionBulkApprove.as_view()),
 ]
@@ -1,22 +1,59 @@
 # Backend/admissions/views.py
 
+import codecs
+import json
+
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.db import transaction
-from .models import AdmissionApplication
+from django.db import router, transaction
+from .exports import iter_export_rows, stream_csv, stream_xlsx
+from . import conditional, idempotency, intake, stats
+from .approvals import approve_applications
+from .duplicates import duplicate_clusters
+from .fieldsets import narrow_queryset, parse_fieldset
+from .filters import filter_admissions
+from .imports import DEFAULT_CHUNK_SIZE, import_admissions_csv
+from .models import AdmissionApplication, AdmissionIntakeTicket
+from .pagination import AdmissionCursorPagination
+from .search import search_admissions
 from .serializers import (
     AdmissionApplicationSerializer,
     PublicAdmissionApplicationSerializer,
 )
-from users.models import UserProfile
-from users.services import generate_student_uid
+from authentication.permissions import IsStaffOrSuperUser
 
 User = get_user_model()
 
 
+def _admission_queryset():
+    """
+    Base queryset for anything rendered with AdmissionApplicationSerializer.
+
+    batch/course are joined and guardians are prefetched, so a page costs a
+    fixed number of queries no matter how many rows it holds. The search
+    vector is only used inside SQL, so it is never loaded.
+    """
+    return (
+        AdmissionApplication.objects.select_related("batch__course")
+        .prefetch_related("guardians")
+        .defer("search_vector")
+    )
+
+
+def _requested_fields(request):
+    return parse_fieldset(
+        request.query_params, AdmissionApplicationSerializer.Meta.fields
+    )
+
+
 class AdmissionApply(APIView):
     """
     Public endpoint used by the admission form.
@@ -25,64 +62,357 @@ class AdmissionApply(APIView):
     and internally creates:
       - AdmissionApplication
       - Guardian (FATHER & MOTHER)
+
+    Also accepts multipart/form-data with the same JSON in a "payload" field
+    and the photo as a binary "photo" file, instead of a base64 data URL.
+
+    An optional Idempotency-Key header makes retries safe: repeating a key
+    returns the original 201 response without creating another application.
+
+    With ADMISSIONS_QUEUED_INTAKE on, only cheap checks run here and the
+    answer is 202 with a ticket to poll at AdmissionIntakeStatus; the
+    application is created by a worker (see admissions.intake).
     """
 
     permission_classes = [permissions.AllowAny]
+    parser_classes = [JSONParser, MultiPartParser]
 
     def post(self, request):
-        serializer = PublicAdmissionApplicationSerializer(data=request.data)
-        if serializer.is_valid():
-            app = serializer.save()
-            # Respond with the flat serializer so the frontend gets the application id etc.
+        data, photo = request.data, None
+        if request.content_type.startswith("multipart/"):
+            try:
+                data = json.loads(request.data.get("payload") or "")
+            except ValueError:
+                return Response(
+                    {"payload": "Expected the application JSON in this field."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            photo = request.FILES.get("photo")
+
+        key = (request.headers.get(idempotency.HEADER) or "").strip()
+        if len(key) > idempotency.MAX_KEY_LENGTH:
             return Response(
-                AdmissionApplicationSerializer(app).data,
-                status=status.HTTP_201_CREATED,
+                {
+                    "detail": f"{idempotency.HEADER} must be at most "
+                    f"{idempotency.MAX_KEY_LENGTH} characters."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
             )
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        fingerprint = idempotency.request_fingerprint(data, photo) if key else ""
+        if key:
+            try:
+                body = idempotency.replay(key, fingerprint)
+            except idempotency.KeyReused:
+                return self._key_reused()
+            if body is not None:
+                return self._created(body, replayed=True)
+
+        if settings.ADMISSIONS_QUEUED_INTAKE:
+            return self._enqueue(data, photo, key, fingerprint)
+
+        serializer = PublicAdmissionApplicationSerializer(
+            data=data, context={"photo": photo}
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        def create():
+            app = serializer.save()
+            # Respond with the flat serializer so the frontend gets the application id etc.
+            return app, AdmissionApplicationSerializer(app).data
+
+        if not key:
+            return self._created(create()[1])
+        try:
+            body, replayed = idempotency.run_once(key, fingerprint, create)
+        except idempotency.KeyReused:
+            return self._key_reused()
+        return self._created(body, replayed=replayed)
+
+    def _enqueue(self, data, photo, key, fingerprint):
+        errors = intake.precheck(data, photo)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ticket = intake.enqueue(data, photo, key=key, fingerprint=fingerprint)
+        except idempotency.KeyReused:
+            return self._key_reused()
+        return Response(
+            intake.ticket_status(ticket),
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": reverse("admission-intake-status", args=[ticket.pk])},
+        )
+
+    @staticmethod
+    def _created(body, replayed=False):
+        headers = {"Idempotent-Replayed": "true"} if replayed else None
+        return Response(body, status=status.HTTP_201_CREATED, headers=headers)
+
+    @staticmethod
+    def _key_reused():
+        return Response(
+            {"detail": f"{idempotency.HEADER} was already used for a different application."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+
+class AdmissionIntakeStatus(APIView):
+    """
+    Poll a ticket from queued intake. The ticket id is random and only known
+    to the applicant, like the 201 body it stands in for.
+
+    DONE tickets carry the application as AdmissionApply would have returned
+    it; FAILED ones the validation errors. Pending answers suggest a
+    Retry-After.
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, ticket_id):
+        ticket = get_object_or_404(
+            AdmissionIntakeTicket.objects.defer("payload"), pk=ticket_id
+        )
+        headers = {"Retry-After": "2"} if ticket.status in intake.PENDING else None
+        return Response(intake.ticket_status(ticket), headers=headers)
 
 
 class AdmissionList(APIView):
+    """
+    Staff see every application, students only their own.
+
+    Query params from filter_admissions (status, batch, current_class,
+    is_reviewed, hear_about_us, created_after, created_before) narrow the
+    result in SQL.
+
+    `q` switches to search mode: matches on student / guardian names, phone
+    numbers and email, ranked best-first and capped at `page_size`
+    (default ADMISSIONS_SEARCH_LIMIT). Search results are a plain list.
+
+    Without paging params the full list is returned as before. Passing
+    `page_size` and/or `cursor` switches to keyset pagination ordered by
+    (-created_at, -id); see AdmissionCursorPagination.
+
+    `fields` / `expand` return a sparse representation and load only the
+    matching columns; see admissions.fieldsets.
+
+    Responses carry ETag / Last-Modified; a matching If-None-Match or
+    If-Modified-Since gets 304 without serializing (admissions.conditional).
+    """
+
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = AdmissionCursorPagination
+    read_from_replica = True
 
     def get(self, request):
         u = request.user
+        fields = _requested_fields(request)
+        qs = narrow_queryset(_admission_queryset(), fields)
         if u.is_superuser or u.is_staff:
-            qs = AdmissionApplication.objects.select_related(
-                "batch__course"
-            ).all().order_by("-id")
+            qs = qs.order_by("-id")
         else:
-            qs = AdmissionApplication.objects.select_related(
-                "batch__course"
-            ).filter(user=u)
+            qs = qs.filter(user=u)
+        qs = filter_admissions(qs, request.query_params)
+
+        # Validators cover exactly the rows this response returns
+        paginator = None
+        term = (request.query_params.get("q") or "").strip()
+        if term:
+            limit = settings.ADMISSIONS_SEARCH_LIMIT
+            if "page_size" in request.query_params:
+                limit = self.pagination_class().get_page_size(request)
+            rows = search_admissions(qs, term)[:limit]
+        elif self.pagination_class.is_requested(request):
+            paginator = self.pagination_class()
+            rows = paginator.page_queryset(qs, request)
+        else:
+            rows = qs
+
+        etag, last_modified = conditional.list_validators(request, rows)
+        cached = conditional.not_modified(request, etag, last_modified)
+        if cached is not None:
+            return cached
+        return conditional.with_validators(
+            self._render(request, rows, fields, paginator), etag, last_modified
+        )
+
+    def _render(self, request, rows, fields, paginator):
+        if paginator is not None:
+            page = paginator.paginate_rows(rows)
+            serializer = AdmissionApplicationSerializer(
+                page, many=True, fields=fields, context={"request": request}
+            )
+            return paginator.get_paginated_response(serializer.data)
+
         serializer = AdmissionApplicationSerializer(
-            qs, many=True, context={"request": request}
+            rows, many=True, fields=fields, context={"request": request}
         )
         return Response(serializer.data)
 
 
+class AdmissionStats(APIView):
+    """
+    Counts by status, batch, current_class, hear_about_us and day, for the
+    dashboard badges and charts. Same visibility and filters as AdmissionList;
+    `days` sets the by_day window (default 30).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    read_from_replica = True
+
+    def get(self, request):
+        u = request.user
+        qs = AdmissionApplication.objects.all()
+        if not (u.is_superuser or u.is_staff):
+            qs = qs.filter(user=u)
+        qs = filter_admissions(qs, request.query_params)
+
+        try:
+            days = int(request.query_params.get("days", stats.DEFAULT_DAYS))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= stats.MAX_DAYS:
+            return Response(
+                {"days": f"Expected a whole number between 1 and {stats.MAX_DAYS}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(stats.admission_stats(qs, days=days))
+
+
+class AdmissionDuplicates(APIView):
+    """
+    Clusters of live applications that look like the same student applying
+    to the same batch more than once (see admissions.duplicates), largest
+    first. Accepts the AdmissionList filters; `page_size` caps the number
+    of clusters.
+    """
+
+    permission_classes = [IsStaffOrSuperUser]
+    read_from_replica = True
+
+    def get(self, request):
+        qs = filter_admissions(AdmissionApplication.objects.all(), request.query_params)
+        limit = AdmissionCursorPagination().get_page_size(request)
+        return Response(duplicate_clusters(qs, limit=limit))
+
+
+class AdmissionExport(APIView):
+    """
+    Staff-only streaming export of applications.
+
+      GET /admissions/export/?type=csv|xlsx   (csv by default)
+
+    Accepts the same filters as AdmissionList. Rows are streamed in chunks of
+    ADMISSIONS_EXPORT_CHUNK_SIZE with guardian columns flattened in.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsStaffOrSuperUser]
+    read_from_replica = True
+
+    content_types = {
+        "csv": "text/csv; charset=utf-8",
+        "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    }
+
+    def get(self, request):
+        kind = (request.query_params.get("type") or "csv").lower()
+        if kind not in self.content_types:
+            return Response(
+                {"detail": "type must be csv or xlsx"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        qs = filter_admissions(AdmissionApplication.objects.all(), request.query_params)
+        # The body is produced after the view returns; pin the database now
+        qs = qs.using(router.db_for_read(AdmissionApplication))
+        rows = iter_export_rows(qs, chunk_size=settings.ADMISSIONS_EXPORT_CHUNK_SIZE)
+        stream = stream_xlsx(rows) if kind == "xlsx" else stream_csv(rows)
+
+        filename = f"admissions-{timezone.localdate():%Y%m%d}.{kind}"
+        response = StreamingHttpResponse(stream, content_type=self.content_types[kind])
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+def _decodes(upload, encoding):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        for chunk in upload.chunks():
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        upload.seek(0)
+    return True
+
+
+class AdmissionImport(APIView):
+    """
+    Staff-only bulk import of walk-in / paper applications.
+
+      POST /admissions/import/   multipart, field "file" = CSV
+
+    Rows are validated like AdmissionApply and inserted in chunks; the
+    response lists how many were created and the errors for rejected rows.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, IsStaffOrSuperUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"file": "This field is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # Checked up front so a bad byte can't stop the import half-way
+        if not _decodes(upload, "utf-8-sig"):
+            return Response(
+                {"file": "The file must be UTF-8 encoded CSV (in Excel: Save As \"CSV UTF-8\")."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        report = import_admissions_csv(
+            codecs.iterdecode(upload, "utf-8-sig"), chunk_size=DEFAULT_CHUNK_SIZE
+        )
+        return Response(report, status=status.HTTP_200_OK)
+
+
 class AdmissionDetail(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    read_from_replica = True
 
     def get(self, request, pk):
-        app = get_object_or_404(
-            AdmissionApplication.objects.select_related("batch__course"),
+        fields = _requested_fields(request)
+        # Cheap validator lookup first: a 304 never loads the full row
+        row = get_object_or_404(
+            AdmissionApplication.objects.values("user_id", *conditional.DETAIL_VALIDATOR_FIELDS),
             pk=pk,
         )
         # restrict normal users to own record
         if not (
             request.user.is_superuser
             or request.user.is_staff
-            or app.created_user == request.user
+            or row["user_id"] == request.user.id
         ):
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-        serializer = AdmissionApplicationSerializer(app, context={"request": request})
-        return Response(serializer.data)
+
+        etag, last_modified = conditional.detail_validators(request, row)
+        cached = conditional.not_modified(request, etag, last_modified)
+        if cached is not None:
+            return cached
+
+        app = get_object_or_404(narrow_queryset(_admission_queryset(), fields), pk=pk)
+        serializer = AdmissionApplicationSerializer(
+            app, fields=fields, context={"request": request}
+        )
+        return conditional.with_validators(Response(serializer.data), etag, last_modified)
 
 
 class AdmissionReviewApprove(APIView):
     """
     Admin/staff can mark an application as reviewed/approved.
-    On approval:
+    On approval (see admissions.approvals):
       - Ensure a User exists (create if missing)
       - Activate + approve the User
       - Ensure UserProfile + student_uid are set
@@ -98,62 +428,47 @@ class AdmissionReviewApprove(APIView):
         app = get_object_or_404(AdmissionApplication, pk=pk)
         is_reviewed = request.data.get("is_reviewed")
         is_approved = request.data.get("is_approved")
-        changed = False
 
-        if is_reviewed is not None:
+        if is_approved:
+            approve_applications([app.pk])
+        elif is_reviewed is not None:
             app.is_reviewed = bool(is_reviewed)
-            changed = True
-        if is_approved is not None:
-            app.is_approved = bool(is_approved)
-            changed = True
-        if changed:
-            app.save()
-
-        # On approve, ensure user + profile + student_uid
-        if app.is_approved:
-            user = app.created_user
-
-            # If payment already created a user, reuse it; else create now
-            if user is None:
-                email = app.student_email or f"student_{app.id}@example.com"
-                password = User.objects.make_random_password()
-                user = User.objects.create_user(
-                    email=email,
-                    password=password,
-                    f_name=app.student_first_name_en,
-                    l_name=app.student_last_name_en,
-                )
-                app.created_user = user
-                app.save(update_fields=["created_user"])
-
-            # Activate + mark approved at this stage
-            update_fields = []
-            if not user.is_active:
-                user.is_active = True
-                update_fields.append("is_active")
-            if hasattr(user, "is_approved") and not user.is_approved:
-                user.is_approved = True
-                update_fields.append("is_approved")
-            if update_fields:
-                user.save(update_fields=update_fields)
-
-            # User profile and UID
-            from datetime import datetime  # noqa: F401 (kept for clarity)
-
-            year = app.created_at.year
-            school_code = app.school.code if app.school else "UNK"
-            class_name = app.current_class
-            batch_number = app.batch.batch_number
-            uid = generate_student_uid(year, school_code, class_name, batch_number)
-
-            prof, _ = UserProfile.objects.get_or_create(user=user)
-            prof.current_class = class_name
-            prof.group_name = app.batch.group_name or ""
-            prof.school = app.school
-            prof.current_batch = app.batch
-            prof.student_uid = uid
-            prof.save()
+            app.save(update_fields=["is_reviewed", "updated_at"])
 
+        app = _admission_queryset().get(pk=app.pk)
         return Response(
             AdmissionApplicationSerializer(app).data, status=status.HTTP_200_OK
         )
+
+
+class AdmissionBulkApprove(APIView):
+    """
+    Approve many applications at once: POST {"ids": [1, 2, ...]}.
+
+    Runs in chunked transactions with bulk user / profile writes and one
+    contiguous UID block per (year, school, class, batch). Returns
+    {"approved": [...], "not_found": [...]}.
+    """
+
+    permission_classes = [IsStaffOrSuperUser]
+
+    def post(self, request):
+        ids = request.data.get("ids")
+        if not isinstance(ids, list) or not ids:
+            return Response(
+                {"ids": "Expected a non-empty list of application ids."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            ids = [int(pk) for pk in ids]
+        except (TypeError, ValueError):
+            return Response(
+                {"ids": "Application ids must be integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(ids) > settings.ADMISSIONS_BULK_APPROVE_MAX:
+            return Response(
+                {"ids": f"At most {settings.ADMISSIONS_BULK_APPROVE_MAX} ids per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(approve_applications(ids), status=status.HTTP_200_OK)
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:49
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_held_seats(apps, schema_editor):
+    Batch = apps.get_model("courses_app", "Batch")
+    SeatHold = apps.get_model("admissions", "SeatHold")
+    held = (
+        SeatHold.objects.filter(status="HELD")
+        .order_by()
+        .values_list("batch")
+        .annotate(n=Count("id"))
+    )
+    for batch_id, count in held:
+        Batch.objects.filter(pk=batch_id).update(held_seats=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses_app', '0003_remove_batch_filled_seats_course_description_and_more'),
+        ('admissions', '0013_admissionintaketicket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='batch',
+            name='held_seats',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_held_seats, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 
 
 class Course(models.Model):
@@ -18,6 +21,35 @@ class Course(models.Model):
         return f"{self.grade_level} - {self.title}"
 
 
+class BatchQuerySet(models.QuerySet):
+    def with_availability(self):
+        """
+        Annotate each batch with its PAID admissions and live seat holds, so
+        confirmed_seats / active_holds / available_seats cost no extra queries.
+        """
+        from admissions.models import (
+            AdmissionApplication,
+            AdmissionStatus,
+            SeatHold,
+            SeatHoldStatus,
+        )
+
+        def count(qs):
+            per_batch = qs.filter(batch=OuterRef("pk")).order_by().values("batch")
+            return Coalesce(Subquery(per_batch.annotate(n=Count("pk")).values("n")), 0)
+
+        return self.annotate(
+            seats_confirmed=count(
+                AdmissionApplication.objects.filter(status=AdmissionStatus.PAID)
+            ),
+            seats_held=count(
+                SeatHold.objects.filter(
+                    status=SeatHoldStatus.HELD, expires_at__gt=timezone.now()
+                )
+            ),
+        )
+
+
 class Batch(models.Model):
     """
     Specific batch (time-schedule) under a Course.
@@ -41,6 +73,12 @@ class Batch(models.Model):
 
     # As per your current plan: 25 seats each batch.
     total_seat = models.PositiveIntegerField(default=25)
+    # Seat holds currently in HELD status, maintained in the same transaction
+    # as every hold change (see SeatHold), except holds placed through the
+    # Redis reservation engine, which are counted right after commit.
+    # `manage.py reconcile_held_seats` (and the reservation reconcile task)
+    # repairs drift. Includes lapsed holds until the sweeper expires them.
+    held_seats = models.PositiveIntegerField(default=0, editable=False)
 
     # For compatibility with your design / image
     class_name = models.CharField(max_length=50)              # e.g. "Class 10"
@@ -51,12 +89,29 @@ class Batch(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BatchQuerySet.as_manager()
+
     class Meta:
         unique_together = [("course", "batch_number")]
 
     def __str__(self) -> str:
         return f"{self.course.grade_level} {self.batch_number} ({self.days} {self.time_slot})"
 
+    @classmethod
+    def adjust_held_seats(cls, deltas):
+        """Apply {batch_id: delta} to held_seats in one UPDATE (never below 0)."""
+        deltas = {pk: delta for pk, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        change = Case(
+            *(When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()),
+            default=Value(0),
+        )
+        cls.objects.filter(pk__in=deltas).update(held_seats=Greatest(F("held_seats") + change, 0))
+        # Every hold change lands here, so this is where open forms hear of it
+        from .seat_stream import publish_on_commit
+        publish_on_commit(deltas)
+
     # --- Dynamic availability, derived from admissions + seat holds ---
 
     @property
@@ -64,6 +119,8 @@ class Batch(models.Model):
         """
         Number of fully paid/confirmed admissions for this batch.
         """
+        if "seats_confirmed" in self.__dict__:  # with_availability()
+            return self.seats_confirmed
         from admissions.models import AdmissionApplication, AdmissionStatus
         return AdmissionApplication.objects.filter(
             batch=self,
@@ -75,6 +132,8 @@ class Batch(models.Model):
         """
         Number of currently active (non-expired) held seats for this batch.
         """
+        if "seats_held" in self.__dict__:  # with_availability()
+            return self.seats_held
         from admissions.models import SeatHold
         return SeatHold.active_count_for_batch(self.id)
 
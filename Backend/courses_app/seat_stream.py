@@ -0,0 +1,152 @@
+# Backend/courses_app/seat_stream.py
+
+"""
+Live seat availability for the admission form's batch picker, served as
+Server-Sent Events on /api/public/batches/stream/ (SEAT_STREAM_REDIS_URL).
+
+Every seat-hold change (place, release, expiry sweep) goes through
+Batch.adjust_held_seats, which calls publish_on_commit(). After the
+transaction commits, the changed batches are read with one
+with_availability() query and PUBLISHed on a Redis channel. That way the
+event reaches every web process, whether the change came from a request
+or a Celery worker.
+
+Each web process keeps a single Redis subscription and fans messages out to
+its open streams. Open forms therefore cost no database queries and one
+Redis connection per process. Events carry each batch's current counts
+rather than deltas, so the next event corrects a client that missed one:
+
+    event: seats
+    data: {"batches": [{"id": 3, "confirmed": 12, "held": 4, "available_seats": 9}]}
+
+The stream needs the ASGI entry point (smw.asgi:application). When it is
+disabled or served over WSGI the endpoint answers 204, which tells
+EventSource not to reconnect.
+"""
+
+import asyncio
+import json
+import logging
+from functools import lru_cache
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "smw:seats:availability"
+
+# Events a stream may fall behind before it is dropped. EventSource then
+# reconnects, and the client only misses counts the next event corrects.
+CLIENT_BACKLOG = 100
+
+RECONNECT_SECONDS = 5
+
+
+def enabled() -> bool:
+    return bool(settings.SEAT_STREAM_REDIS_URL)
+
+
+@lru_cache(maxsize=1)
+def _client():
+    return redis.Redis.from_url(
+        settings.SEAT_STREAM_REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+    )
+
+
+def availability(batch_ids):
+    from .models import Batch
+
+    return [
+        {
+            "id": batch.pk,
+            "confirmed": batch.confirmed_seats,
+            "held": batch.active_holds,
+            "available_seats": batch.available_seats,
+        }
+        for batch in Batch.objects.with_availability().filter(pk__in=batch_ids).order_by("pk")
+    ]
+
+
+def publish(batch_ids):
+    batches = availability(batch_ids)
+    if not batches:
+        return
+    try:
+        _client().publish(CHANNEL, json.dumps({"batches": batches}))
+    except redis.RedisError:
+        # Open forms keep the old counts; the payment step still checks capacity
+        logger.warning("Could not publish seat availability", exc_info=True)
+
+
+def publish_on_commit(batch_ids):
+    if enabled():
+        batch_ids = list(batch_ids)
+        transaction.on_commit(lambda: publish(batch_ids), robust=True)
+
+
+class _Hub:
+    """This process's Redis subscription, shared by all of its open streams."""
+
+    def __init__(self):
+        self.queues = set()
+        self.task = None
+
+    def join(self):
+        queue = asyncio.Queue(CLIENT_BACKLOG)
+        self.queues.add(queue)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.listen())
+        return queue
+
+    def leave(self, queue):
+        self.queues.discard(queue)
+        if not self.queues and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def dispatch(self, data):
+        for queue in list(self.queues):
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                self.queues.discard(queue)
+
+    async def listen(self):
+        while True:
+            client = aioredis.Redis.from_url(settings.SEAT_STREAM_REDIS_URL)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.dispatch(message["data"].decode())
+            except redis.RedisError:
+                logger.warning("Seat stream subscription lost; reconnecting", exc_info=True)
+                await asyncio.sleep(RECONNECT_SECONDS)
+            finally:
+                await client.aclose()
+
+
+hub = _Hub()
+
+
+async def events():
+    """The text/event-stream body of one open form."""
+    queue = hub.join()
+    try:
+        yield f"retry: {RECONNECT_SECONDS * 1000}\n\n"
+        # A dropped (too slow) stream drains what it has, then ends
+        while queue in hub.queues or not queue.empty():
+            try:
+                data = await asyncio.wait_for(
+                    queue.get(), settings.SEAT_STREAM_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: seats\ndata: {data}\n\n"
+    finally:
+        hub.leave(queue)
@@ -10,7 +10,12 @@ class CourseSerializer(serializers.ModelSerializer):
 class BatchSerializer(serializers.ModelSerializer):
     course_title = serializers.CharField(source="course.title", read_only=True)
     grade_level = serializers.CharField(source="course.grade_level", read_only=True)
+    # One query for a whole list when the queryset uses Batch.objects.with_availability()
+    confirmed = serializers.IntegerField(source="confirmed_seats", read_only=True)
+    held = serializers.IntegerField(source="active_holds", read_only=True)
+    available_seats = serializers.IntegerField(read_only=True)
     class Meta:
         model = Batch
         fields = ["id","course","course_title","grade_level","batch_number","days","time_slot",
-                  "total_seat","class_name","group_name","is_active","created_at","updated_at"]
+                  "total_seat","confirmed","held","available_seats",
+                  "class_name","group_name","is_active","created_at","updated_at"]
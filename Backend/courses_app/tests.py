@@ -1,4 +1,100 @@
 # Backend/courses_app/tests.py
-from django.test import TestCase
+import asyncio
+import datetime
+import json
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from admissions.models import AdmissionApplication, SeatHold
+from . import seat_stream
+from .models import Batch, Course
+
+
+class BatchAvailabilityTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(title="Mathematics", grade_level="Class 10")
+        cls.batches = [
+            Batch.objects.create(
+                course=course, batch_number=str(n), days="Sun, Tue", time_slot="10:00 AM", class_name="Class 10"
+            )
+            for n in (1, 2)
+        ]
+
+    def make_application(self, batch=None, **kwargs):
+        return AdmissionApplication.objects.create(
+            student_name="Student",
+            date_of_birth=datetime.date(2010, 1, 1),
+            sex="M",
+            current_class="class-10",
+            batch=batch or self.batches[0],
+            **kwargs,
+        )
+
+    def setUp(self):
+        cache.clear()  # anonymous throttle counts from earlier tests
+
+    def test_public_batches_report_availability_in_one_query(self):
+        first, second = self.batches
+        self.make_application(first, status="PAID")
+        for minutes in (10, 10, -1):  # the lapsed hold no longer counts
+            SeatHold.place(
+                self.make_application(first),
+                first,
+                expires_at=timezone.now() + datetime.timedelta(minutes=minutes),
+            )
+
+        with self.assertNumQueries(1):
+            resp = self.client.get("/api/public/batches/")
+        self.assertEqual(resp.status_code, 200)
+        seats = {b["id"]: (b["confirmed"], b["held"], b["available_seats"]) for b in resp.data}
+        self.assertEqual(seats[first.pk], (1, 2, first.total_seat - 3))
+        self.assertEqual(seats[second.pk], (0, 0, second.total_seat))
+
+        # Unannotated batches still work, one COUNT at a time
+        self.assertEqual(Batch.objects.get(pk=first.pk).available_seats, first.total_seat - 3)
+
+    @override_settings(SEAT_STREAM_REDIS_URL="redis://seats.test:6379/1")
+    def test_hold_changes_are_published_after_commit(self):
+        batch = self.batches[0]
+        with mock.patch.object(seat_stream, "_client") as client:
+            with self.captureOnCommitCallbacks(execute=True):
+                hold = SeatHold.place(
+                    self.make_application(), batch, expires_at=timezone.now() + datetime.timedelta(minutes=5)
+                )
+                client.return_value.publish.assert_not_called()
+            with self.captureOnCommitCallbacks(execute=True):
+                hold.release("CANCELLED")
+
+        (_, first), (_, second) = (c.args for c in client.return_value.publish.call_args_list)
+        self.assertEqual(
+            json.loads(first),
+            {"batches": [{"id": batch.pk, "confirmed": 0, "held": 1, "available_seats": batch.total_seat - 1}]},
+        )
+        self.assertEqual(json.loads(second)["batches"][0]["available_seats"], batch.total_seat)
+
+    def test_stream_relays_published_counts(self):
+        async def read_two():
+            stream = seat_stream.events()
+            try:
+                retry = await anext(stream)
+                pending = asyncio.ensure_future(anext(stream))
+                await asyncio.sleep(0)  # let the stream join the hub
+                seat_stream.hub.dispatch('{"batches": []}')
+                return retry, await pending
+            finally:
+                await stream.aclose()
+
+        with mock.patch.object(seat_stream._Hub, "listen", mock.AsyncMock()):
+            retry, event = async_to_sync(read_two)()
+        self.assertTrue(retry.startswith("retry:"))
+        self.assertEqual(event, 'event: seats\ndata: {"batches": []}\n\n')
+        self.assertEqual(seat_stream.hub.queues, set())
+
+        # Not enabled (and never under WSGI): EventSource is told to stop
+        self.assertEqual(self.client.get("/api/public/batches/stream/").status_code, 204)
@@ -3,7 +3,7 @@ from django.urls import path
 from .views import (
     CourseListCreate, CourseDetail,
     BatchListCreate, BatchDetail,
-    PublicCourses, PublicBatches
+    PublicCourses, PublicBatches, PublicBatchStream
 )
 
 urlpatterns = [
@@ -13,4 +13,5 @@ urlpatterns = [
     path("batches/<int:pk>/", BatchDetail.as_view()),
     path("public/courses/", PublicCourses.as_view()),
     path("public/batches/", PublicBatches.as_view()),
+    path("public/batches/stream/", PublicBatchStream.as_view()),
 ]
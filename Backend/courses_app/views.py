@@ -2,7 +2,11 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.views import View
+from . import seat_stream
 from .models import Course, Batch
 from .serializers import CourseSerializer, BatchSerializer
 
@@ -16,6 +20,7 @@ class IsAdminOrStaffForWrite(permissions.BasePermission):
 # ------- Courses (CRUD via APIView) -------
 class CourseListCreate(APIView):
     permission_classes = [IsAdminOrStaffForWrite]
+    read_from_replica = True  # GET only; POST always hits the primary
     def get(self, request):
         q = Course.objects.all().order_by("grade_level","title")
         return Response(CourseSerializer(q, many=True).data)
@@ -41,8 +46,9 @@ class CourseDetail(APIView):
 # ------- Batches (CRUD via APIView) -------
 class BatchListCreate(APIView):
     permission_classes = [IsAdminOrStaffForWrite]
+    read_from_replica = True  # GET only; POST always hits the primary
     def get(self, request):
-        qs = Batch.objects.select_related("course").all()
+        qs = Batch.objects.select_related("course").with_availability()
         # filters for landing / admissions
         course = request.query_params.get("course")
         grade  = request.query_params.get("grade_level")
@@ -63,7 +69,7 @@ class BatchListCreate(APIView):
 class BatchDetail(APIView):
     permission_classes = [IsAdminOrStaffForWrite]
     def get(self, request, pk):
-        obj = get_object_or_404(Batch, pk=pk)
+        obj = get_object_or_404(Batch.objects.with_availability(), pk=pk)
         return Response(BatchSerializer(obj).data)
     def patch(self, request, pk):
         obj = get_object_or_404(Batch, pk=pk)
@@ -83,8 +89,19 @@ class PublicCourses(APIView):
 
 class PublicBatches(APIView):
     permission_classes = [permissions.AllowAny]
+    read_from_replica = True
     def get(self, request):
-        qs = Batch.objects.select_related("course").filter(is_active=True)
+        qs = Batch.objects.select_related("course").with_availability().filter(is_active=True)
         grade = request.query_params.get("grade_level")
         if grade: qs = qs.filter(course__grade_level__iexact=grade)
         return Response(BatchSerializer(qs.order_by("course__grade_level","batch_number"), many=True).data)
+
+class PublicBatchStream(View):
+    """Live seat counts for open admission forms (see seat_stream)."""
+    async def get(self, request):
+        if not seat_stream.enabled() or not isinstance(request, ASGIRequest):
+            return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+        response = StreamingHttpResponse(seat_stream.events(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # nginx: send each event as it comes
+        return response
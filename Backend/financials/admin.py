@@ -1,2 +1,19 @@
 # Backend/financials/admin.py
 from django.contrib import admin
+
+from .models import AdmissionFunnelDaily
+
+
+@admin.register(AdmissionFunnelDaily)
+class AdmissionFunnelDailyAdmin(admin.ModelAdmin):
+    list_display = (
+        "day",
+        "batch",
+        "applications",
+        "holds_placed",
+        "holds_expired",
+        "payments_validated",
+        "amount_validated",
+    )
+    list_filter = ("batch",)
+    date_hierarchy = "day"
@@ -5,3 +5,6 @@ from django.apps import AppConfig
 class FinancialsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'financials'
+
+    def ready(self):
+        import financials.receivers  # noqa: F401
@@ -0,0 +1,13 @@
+# Backend/financials/management/commands/rebuild_funnel_rollups.py
+
+from django.core.management.base import BaseCommand
+
+from financials.utils import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the admission funnel rollup table from applications, seat holds and payments."
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} funnel rollup row(s)."))
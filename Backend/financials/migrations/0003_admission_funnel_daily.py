@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-18 01:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses_app', '0003_remove_batch_filled_seats_course_description_and_more'),
+        ('financials', '0002_delete_payment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdmissionFunnelDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('holds_placed', models.PositiveIntegerField(default=0)),
+                ('holds_expired', models.PositiveIntegerField(default=0)),
+                ('payments_validated', models.PositiveIntegerField(default=0)),
+                ('amount_validated', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='funnel_rollups', to='courses_app.batch')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['batch', 'day'], name='funnel_batch_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'batch'), name='funnel_day_batch_uniq')],
+            },
+        ),
+    ]
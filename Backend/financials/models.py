@@ -0,0 +1,42 @@
+# Backend/financials/models.py
+from django.db import models
+
+from courses_app.models import Batch
+
+
+class AdmissionFunnelDaily(models.Model):
+    """
+    Pre-aggregated admission funnel, one row per (application day, batch).
+
+    Rows are keyed by the day the application was submitted, so later events
+    (holds, expiry, payment) are credited to that application's cohort and
+    conversion reads straight across a row. Maintained incrementally by
+    financials.receivers; `manage.py rebuild_funnel_rollups` recomputes it
+    from the raw tables.
+    """
+
+    day = models.DateField()
+    batch = models.ForeignKey(
+        Batch,
+        on_delete=models.CASCADE,
+        related_name="funnel_rollups",
+    )
+
+    applications = models.PositiveIntegerField(default=0)
+    holds_placed = models.PositiveIntegerField(default=0)
+    holds_expired = models.PositiveIntegerField(default=0)
+    payments_validated = models.PositiveIntegerField(default=0)
+    amount_validated = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "batch"], name="funnel_day_batch_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["batch", "day"], name="funnel_batch_day_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} - batch {self.batch_id}"
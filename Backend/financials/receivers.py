@@ -0,0 +1,58 @@
+# Backend/financials/receivers.py
+
+from collections import Counter
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from admissions.models import AdmissionApplication, SeatHold
+from admissions.signals import applications_bulk_created, seat_holds_expired
+from payments.signals import payment_validated
+
+from .utils import bump, bump_many, cohort_day
+
+
+@receiver(post_save, sender=AdmissionApplication)
+def count_application(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        bump(cohort_day(instance.created_at), instance.batch_id, applications=1)
+
+
+@receiver(applications_bulk_created)
+def count_bulk_applications(sender, applications, **kwargs):
+    counts = Counter((cohort_day(app.created_at), app.batch_id) for app in applications)
+    bump_many({key: {"applications": n} for key, n in counts.items()})
+
+
+@receiver(post_save, sender=SeatHold)
+def count_hold(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        app_created = (
+            AdmissionApplication.objects.filter(pk=instance.application_id)
+            .values_list("created_at", flat=True)
+            .first()
+        )
+        if app_created:
+            bump(cohort_day(app_created), instance.batch_id, holds_placed=1)
+
+
+@receiver(seat_holds_expired)
+def count_expired_holds(sender, holds, **kwargs):
+    counts = Counter((cohort_day(h["application_created_at"]), h["batch_id"]) for h in holds)
+    bump_many({key: {"holds_expired": n} for key, n in counts.items()})
+
+
+@receiver(payment_validated)
+def count_validated_payment(sender, payment, **kwargs):
+    app = (
+        AdmissionApplication.objects.filter(pk=payment.application_id)
+        .only("created_at", "batch_id")
+        .first()
+    )
+    if app:
+        bump(
+            cohort_day(app.created_at),
+            app.batch_id,
+            payments_validated=1,
+            amount_validated=payment.amount,
+        )
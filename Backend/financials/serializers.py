@@ -1,2 +1,26 @@
 # Backend/financials/serializers.py
 from rest_framework import serializers
+
+from .models import AdmissionFunnelDaily
+
+
+class AdmissionFunnelDailySerializer(serializers.ModelSerializer):
+    conversion_rate = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AdmissionFunnelDaily
+        fields = [
+            "day",
+            "batch",
+            "applications",
+            "holds_placed",
+            "holds_expired",
+            "payments_validated",
+            "amount_validated",
+            "conversion_rate",
+        ]
+
+    def get_conversion_rate(self, obj):
+        if not obj.applications:
+            return None
+        return round(obj.payments_validated / obj.applications, 4)
@@ -1,4 +1,98 @@
 # Backend/financials/tests.py
-from django.test import TestCase
+import datetime
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from admissions.models import AdmissionApplication, SeatHold
+from courses_app.models import Batch, Course
+from payments.models import Payment, PaymentStatus
+from .models import AdmissionFunnelDaily
+from .receivers import count_validated_payment
+from .utils import rebuild
+
+User = get_user_model()
+
+COUNTS = ("applications", "holds_placed", "holds_expired", "payments_validated", "amount_validated")
+
+
+class FunnelRollupTests(APITestCase):
+    databases = {"default", "archive"}
+
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(title="Physics", grade_level="Class 9")
+        cls.batch = Batch.objects.create(
+            course=course, batch_number="1", days="Sat", time_slot="9:00 AM", class_name="Class 9"
+        )
+
+    def _apply(self, name):
+        return AdmissionApplication.objects.create(
+            student_name=name,
+            date_of_birth=datetime.date(2011, 1, 1),
+            sex="F",
+            current_class="class-9",
+            batch=self.batch,
+        )
+
+    def _snapshot(self):
+        return sorted(AdmissionFunnelDaily.objects.values_list("day", "batch_id", *COUNTS))
+
+    def _record_funnel(self):
+        paid, lapsed, _ = self._apply("Paid"), self._apply("Lapsed"), self._apply("Browsing")
+        now = timezone.now()
+        SeatHold.objects.create(
+            application=paid, batch=self.batch, expires_at=now + datetime.timedelta(minutes=10)
+        )
+        SeatHold.objects.create(
+            application=lapsed, batch=self.batch, expires_at=now - datetime.timedelta(minutes=1)
+        )
+        self.assertEqual(SeatHold.expire_overdue_now(), 1)
+        self.assertEqual(SeatHold.expire_overdue_now(), 0)
+
+        pay = Payment.objects.create(
+            tran_id="t-1", application=paid, amount=Decimal("4625.00"), status=PaymentStatus.VALIDATED
+        )
+        count_validated_payment(sender=Payment, payment=pay)
+
+    def test_incremental_counts_match_rebuild(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._record_funnel()
+
+        row = AdmissionFunnelDaily.objects.get()
+        self.assertEqual(
+            (row.applications, row.holds_placed, row.holds_expired, row.payments_validated),
+            (3, 2, 1, 1),
+        )
+        self.assertEqual(row.amount_validated, Decimal("4625.00"))
+
+        incremental = self._snapshot()
+        rebuild()
+        self.assertEqual(self._snapshot(), incremental)
+
+    def test_rolled_back_writes_are_not_counted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._apply("Gone")
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+        self.assertFalse(AdmissionFunnelDaily.objects.exists())
+
+    def test_funnel_report_is_staff_only_and_summarizes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._apply("A")
+            self._apply("B")
+        url = "/api/financials/funnel/"
+        self.assertIn(self.client.get(url).status_code, (401, 403))
+
+        staff = User.objects.create_user(email="s@example.com", password="x", l_name="S", is_staff=True)
+        self.client.force_authenticate(staff)
+        resp = self.client.get(url, {"batch": self.batch.pk})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data["totals"]["applications"], 2)
+        self.assertEqual(resp.data["rows"][0]["conversion_rate"], 0.0)
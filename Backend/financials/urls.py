@@ -1,4 +1,8 @@
+# Backend/financials/urls.py
 from django.urls import path
 
+from .views import AdmissionFunnelReport
 
-urlpatterns = []
\ No newline at end of file
+urlpatterns = [
+    path("financials/funnel/", AdmissionFunnelReport.as_view()),
+]
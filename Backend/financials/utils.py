@@ -0,0 +1,152 @@
+# Backend/financials/utils.py
+
+"""
+Helpers that keep AdmissionFunnelDaily in step with the raw tables.
+
+Bumps are applied once the caller's transaction commits. A rolled-back
+application, hold or payment never leaves a count behind, and writers don't
+queue on the shared (day, batch) row for the rest of their transaction
+(AdmissionPaymentCreate holds the Batch row lock meanwhile). A bump lost to a
+crash right after commit is repaired by `manage.py rebuild_funnel_rollups`.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from admissions.archive import ARCHIVE_DB, sync_archive_tables
+from admissions.models import AdmissionApplication, SeatHold, SeatHoldStatus
+from payments.models import Payment, PaymentStatus
+
+from .models import AdmissionFunnelDaily
+
+COUNTERS = (
+    "applications",
+    "holds_placed",
+    "holds_expired",
+    "payments_validated",
+    "amount_validated",
+)
+
+
+def cohort_day(created_at):
+    """The rollup day for an application submitted at `created_at`."""
+    return timezone.localdate(created_at)
+
+
+def _upsert_sql(row_count):
+    table = connection.ops.quote_name(AdmissionFunnelDaily._meta.db_table)
+    columns = ("day", "batch_id", *COUNTERS, "updated_at")
+    placeholders = ", ".join(["(" + ", ".join(["%s"] * len(columns)) + ")"] * row_count)
+    increments = ", ".join(f"{c} = {table}.{c} + EXCLUDED.{c}" for c in COUNTERS)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES {placeholders} "
+        f"ON CONFLICT (day, batch_id) DO UPDATE SET {increments}, updated_at = EXCLUDED.updated_at"
+    )
+
+
+def bump_many(deltas_by_key):
+    """
+    deltas_by_key: {(day, batch_id): {counter: delta}}. On commit, adds every
+    delta in one INSERT ... ON CONFLICT DO UPDATE, creating missing rows.
+    """
+    # Sorted so concurrent writers lock rows in the same order
+    items = sorted(
+        ((key, d) for key, d in deltas_by_key.items() if any(d.values())),
+        key=lambda item: item[0],
+    )
+    if items:
+        transaction.on_commit(lambda: _upsert(items), robust=True)
+
+
+def _upsert(items):
+    now = timezone.now()
+    params = []
+    for (day, batch_id), deltas in items:
+        params += [day, batch_id, *(deltas.get(c, 0) for c in COUNTERS), now]
+    with connection.cursor() as cursor:
+        cursor.execute(_upsert_sql(len(items)), params)
+
+
+def bump(day, batch_id, **deltas):
+    """Add `deltas` to the (day, batch) row, creating it if needed."""
+    bump_many({(day, batch_id): deltas})
+
+
+def rebuild():
+    """
+    Recompute every row from AdmissionApplication, SeatHold and Payment,
+    live and archived.
+    Returns the number of rows written.
+    """
+    # The archive alias falls back to public tables through its search_path,
+    # so a missing archive table (e.g. a restored dump) would count live rows
+    # twice; make sure they all exist first.
+    sync_archive_tables()
+    tz = timezone.get_current_timezone()
+    totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    def collect(qs, day_field, batch_field, **aggregates):
+        rows = (
+            qs.order_by()
+            .annotate(rollup_day=TruncDate(day_field, tzinfo=tz), rollup_batch=F(batch_field))
+            .values("rollup_day", "rollup_batch")
+            .annotate(**aggregates)
+        )
+        for row in rows:
+            key = (row["rollup_day"], row["rollup_batch"])
+            for name in aggregates:
+                totals[key][name] += row[name] or 0
+
+    with transaction.atomic():
+        # Bumps (INSERT ... ON CONFLICT) wait until the rebuild commits
+        # instead of landing between the reads and the delete and being lost
+        table = connection.ops.quote_name(AdmissionFunnelDaily._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+
+        # Archived seasons keep their history (admissions/archive.py)
+        for using in (DEFAULT_DB_ALIAS, ARCHIVE_DB):
+            collect(
+                AdmissionApplication.objects.using(using), "created_at", "batch", applications=Count("id")
+            )
+            collect(
+                SeatHold.objects.using(using), "application__created_at", "batch", holds_placed=Count("id")
+            )
+            collect(
+                SeatHold.objects.using(using).filter(status=SeatHoldStatus.EXPIRED),
+                "application__created_at",
+                "batch",
+                holds_expired=Count("id"),
+            )
+            collect(
+                Payment.objects.using(using).filter(status=PaymentStatus.VALIDATED),
+                "application__created_at",
+                "application__batch",
+                payments_validated=Count("id"),
+                amount_validated=Sum("amount"),
+            )
+
+        rows = [
+            AdmissionFunnelDaily(day=day, batch_id=batch_id, **counts)
+            for (day, batch_id), counts in totals.items()
+        ]
+        AdmissionFunnelDaily.objects.all().delete()
+        AdmissionFunnelDaily.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def summarize(rows):
+    """Totals and conversion rate over an iterable of AdmissionFunnelDaily."""
+    total = dict.fromkeys(COUNTERS, 0)
+    total["amount_validated"] = Decimal("0")
+    for row in rows:
+        for name in COUNTERS:
+            total[name] += getattr(row, name)
+    apps = total["applications"]
+    total["conversion_rate"] = round(total["payments_validated"] / apps, 4) if apps else None
+    return total
@@ -0,0 +1,61 @@
+# Backend/financials/views.py
+import datetime
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework import status
+
+from authentication.permissions import IsStaffOrSuperUser
+from .models import AdmissionFunnelDaily
+from .serializers import AdmissionFunnelDailySerializer
+from .utils import summarize
+
+DEFAULT_REPORT_DAYS = 30
+
+
+class AdmissionFunnelReport(APIView):
+    """
+    Applications → holds → validated payments per (application day, batch),
+    read from the rollup table.
+
+    Query params: `from` / `to` (ISO dates, inclusive; default the last 30
+    days) and `batch` (comma separated ids).
+    """
+
+    permission_classes = [IsStaffOrSuperUser]
+    read_from_replica = True
+
+    def get(self, request):
+        params = request.query_params
+        today = timezone.localdate()
+        try:
+            end = parse_date(params["to"]) if params.get("to") else today
+            start = (
+                parse_date(params["from"])
+                if params.get("from")
+                else end - datetime.timedelta(days=DEFAULT_REPORT_DAYS - 1)
+            )
+            batch_ids = [int(b) for b in params.get("batch", "").split(",") if b.strip()]
+        except ValueError:
+            start = end = None
+        if start is None or end is None:
+            return Response(
+                {"detail": "from / to must be ISO dates and batch a list of ids."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows = AdmissionFunnelDaily.objects.filter(day__gte=start, day__lte=end)
+        if batch_ids:
+            rows = rows.filter(batch_id__in=batch_ids)
+        rows = list(rows.order_by("day", "batch_id"))
+
+        return Response(
+            {
+                "from": start,
+                "to": end,
+                "rows": AdmissionFunnelDailySerializer(rows, many=True).data,
+                "totals": summarize(rows),
+            }
+        )
@@ -1,4 +1,216 @@
 # Backend/payments/tests.py
-from django.test import TestCase
+import datetime
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+try:  # runs the reservation Lua scripts in-process
+    import fakeredis
+    import lupa  # noqa: F401
+except ImportError:
+    fakeredis = None
+
+from admissions import receivers, reservations
+from admissions.models import AdmissionApplication, SeatHold
+from courses_app.models import Batch, Course
+from financials.models import AdmissionFunnelDaily
+from .models import Payment, PaymentStatus
+from .signals import payment_validated
+from .views import AdmissionPaymentCreate, HoldExists
+
+User = get_user_model()
+
+
+class PaymentFixturesMixin:
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(title="Mathematics", grade_level="Class 10")
+        cls.batch = Batch.objects.create(
+            course=course, batch_number="1", days="Sun, Tue", time_slot="10:00 AM", class_name="Class 10"
+        )
+
+    def make_application(self, **kwargs):
+        data = {
+            "student_name": "Rahim Uddin",
+            "date_of_birth": datetime.date(2010, 1, 1),
+            "sex": "M",
+            "current_class": "class-10",
+            "batch": self.batch,
+        }
+        data.update(kwargs)
+        return AdmissionApplication.objects.create(**data)
+
+    def held_seats(self):
+        return Batch.objects.values_list("held_seats", flat=True).get(pk=self.batch.pk)
+
+
+def start_payment(*, amount, currency, customer, product_name, meta=None):
+    """Stands in for SSLCommerzClient.start_payment."""
+    return meta["tran_id"], {"cus_name": customer["name"]}, {"GatewayPageURL": "https://gw.test/pay"}
+
+
+class AdmissionPaymentCreateTests(PaymentFixturesMixin, APITestCase):
+    def setUp(self):
+        cache.clear()  # anonymous throttle counts from earlier tests
+        patcher = mock.patch("payments.views.SSLCommerzClient")
+        self.gateway = patcher.start().return_value
+        self.gateway.start_payment.side_effect = start_payment
+        self.addCleanup(patcher.stop)
+
+    def test_payment_start_holds_a_seat_and_returns_the_gateway(self):
+        app = self.make_application()
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(f"/api/payments/admission/{app.pk}/")
+        self.assertEqual(resp.status_code, 201, resp.data)
+        self.assertEqual(resp.data["gateway_url"], "https://gw.test/pay")
+
+        hold = SeatHold.objects.get(application=app, status="HELD")
+        pay = Payment.objects.get(tran_id=resp.data["tran_id"])
+        self.assertEqual((pay.application_id, pay.status), (app.pk, PaymentStatus.REDIRECTED))
+        self.assertEqual(pay.create_payload["hold_token"], str(hold.hold_token))
+        self.assertEqual(pay.create_payload["cus_name"], "Rahim Uddin")
+        self.assertEqual(self.held_seats(), 1)
+        self.assertEqual(
+            AdmissionFunnelDaily.objects.get(batch=self.batch, day=timezone.localdate()).holds_placed, 1
+        )
+
+    def test_second_start_while_the_hold_is_live_is_409(self):
+        app = self.make_application()
+        self.assertEqual(self.client.post(f"/api/payments/admission/{app.pk}/").status_code, 201)
+        resp = self.client.post(f"/api/payments/admission/{app.pk}/")
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.data["detail"], "A seat is already held for this application.")
+        self.assertEqual((SeatHold.objects.count(), self.held_seats()), (1, 1))
+
+    def test_full_batch_is_409(self):
+        Batch.objects.filter(pk=self.batch.pk).update(total_seat=1)
+        self.make_application(status="PAID")
+        app = self.make_application()
+        resp = self.client.post(f"/api/payments/admission/{app.pk}/")
+        self.assertEqual(resp.status_code, 409)
+        self.assertFalse(SeatHold.objects.exists())
+        self.gateway.start_payment.assert_not_called()
+
+
+class PaymentValidatedTests(PaymentFixturesMixin, APITestCase):
+    def validate(self, app, hold=None):
+        payment = Payment(
+            application=app,
+            amount=receivers.FEE,
+            currency="BDT",
+            create_payload={"hold_token": str(hold.hold_token)} if hold else {},
+        )
+        payment_validated.send(sender=Payment, payment=payment)
+        app.refresh_from_db()
+
+    def test_held_seat_is_confirmed_and_student_linked(self):
+        app = self.make_application(student_name="Rahim Uddin Ahmed", student_email="rahim@example.com")
+        hold = SeatHold.place(
+            app, self.batch, expires_at=timezone.now() + datetime.timedelta(minutes=5)
+        )
+
+        self.validate(app, hold)
+        hold.refresh_from_db()
+        self.assertEqual((app.status, hold.status), ("PAID", "CONFIRMED"))
+        self.assertEqual(self.held_seats(), 0)
+        self.assertEqual(self.batch.confirmed_seats, 1)
+        self.assertEqual(
+            (app.user.email, app.user.f_name, app.user.l_name, app.user.is_active),
+            ("rahim@example.com", "Rahim Uddin", "Ahmed", False),
+        )
+
+        users = User.objects.count()
+        self.validate(app, hold)  # a repeated signal changes nothing
+        self.assertEqual(User.objects.count(), users)
+
+    def test_payment_without_hold_needs_a_free_seat(self):
+        batch = self.batch
+        Batch.objects.filter(pk=batch.pk).update(total_seat=1)
+        SeatHold.place(
+            self.make_application(), batch, expires_at=timezone.now() + datetime.timedelta(minutes=5)
+        )
+        app = self.make_application()
+        self.validate(app)
+        self.assertEqual(app.status, "PENDING")
+
+        # A lapsed hold frees its seat
+        SeatHold.objects.update(expires_at=timezone.now() - datetime.timedelta(minutes=1))
+        self.validate(app)
+        self.assertEqual(app.status, "PAID")
+        self.assertEqual(self.held_seats(), 0)
+
+
+@override_settings(SEAT_RESERVATION_REDIS_URL="redis://seats.test:6379/0")
+class ReservedPaymentCreateTests(PaymentFixturesMixin, APITestCase):
+    def setUp(self):
+        cache.clear()  # anonymous throttle counts from earlier tests
+        self.reserve = mock.MagicMock()
+        scripts = (mock.MagicMock(), self.reserve, mock.MagicMock(), mock.MagicMock())
+        patcher = mock.patch.object(reservations, "_scripts", return_value=scripts)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_full_batch_is_refused_without_touching_postgres_locks(self):
+        app = self.make_application()
+        self.reserve.return_value = reservations.FULL
+        with self.assertNumQueries(1):  # the application lookup
+            resp = self.client.post(f"/api/payments/admission/{app.pk}/")
+        self.assertEqual(resp.status_code, 409)
+        self.assertFalse(SeatHold.objects.exists())
+        self.assertEqual(self.reserve.call_args.kwargs["keys"][0], f"smw:seats:{{{app.batch_id}}}:holds")
+
+
+@skipUnless(fakeredis, "needs fakeredis with Lua support")
+@override_settings(SEAT_RESERVATION_REDIS_URL="redis://seats.test:6379/0")
+class ReservedHoldTests(PaymentFixturesMixin, APITestCase):
+    """The Postgres side of a Redis reservation, with the real Lua scripts on fakeredis."""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        reservations._scripts.cache_clear()
+        patcher = mock.patch.object(reservations.redis.Redis, "from_url", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(reservations._scripts.cache_clear)
+
+        Batch.objects.filter(pk=self.batch.pk).update(total_seat=2)
+        self.batch.refresh_from_db()
+        self.make_application(status="PAID")
+        self.holds_key, self.capacity_key = reservations._keys(self.batch.pk)
+
+    def test_drifted_redis_cannot_oversell(self):
+        SeatHold.place(
+            self.make_application(), self.batch, expires_at=timezone.now() + datetime.timedelta(minutes=5)
+        )
+        app = self.make_application()
+        reservations.reconcile([self.batch])
+        self.redis.set(self.capacity_key, 5)  # e.g. a failover lost the last writes
+
+        self.assertIsNone(AdmissionPaymentCreate()._reserve_then_hold(app.pk))
+        self.assertFalse(SeatHold.objects.filter(application=app).exists())
+        self.assertEqual(self.held_seats(), 1)
+        self.assertIsNone(self.redis.zscore(self.holds_key, app.pk))
+
+    def test_winner_leaves_the_batch_row_alone_until_commit(self):
+        app = self.make_application()
+        batch_table = Batch._meta.db_table
+        with self.captureOnCommitCallbacks() as callbacks, CaptureQueriesContext(connection) as queries:
+            _, hold, _ = AdmissionPaymentCreate()._reserve_then_hold(app.pk)
+        batch_writes = [q["sql"] for q in queries if batch_table in q["sql"] and "UPDATE" in q["sql"]]
+        self.assertEqual(batch_writes, [])
+        self.assertEqual(self.held_seats(), 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.held_seats(), 1)
+
+        # A retry while that hold is live is refused, not a unique-index 500
+        with self.assertRaises(HoldExists):
+            AdmissionPaymentCreate()._reserve_then_hold(app.pk)
+        self.assertEqual(list(SeatHold.objects.filter(application=app)), [hold])
+        self.assertIsNotNone(self.redis.zscore(self.holds_key, app.pk))
@@ -1,6 +1,8 @@
 # Backend/payments/views.py
 
 
+import logging
+import uuid
 from decimal import Decimal, InvalidOperation  # noqa: F401
 
 from django.conf import settings
@@ -20,6 +22,7 @@ from .serializers import PaymentSerializer
 from .services import SSLCommerzClient
 from .signals import payment_validated
 
+from admissions import reservations
 from admissions.models import AdmissionApplication, SeatHold, SeatHoldStatus
 from courses_app.models import Batch
 
@@ -27,6 +30,8 @@ from courses_app.models import Batch
 FIXED_ADMISSION_FEE = Decimal(str(getattr(settings, "ADMISSION_FEE_BDT", "4625.00")))
 HOLD_MINUTES = int(getattr(settings, "SEAT_HOLD_MINUTES", 10))
 
+logger = logging.getLogger(__name__)
+
 
 def _flatten_data(data):
     """
@@ -83,12 +88,25 @@ def _finalize_on_validation(pay: Payment, validation: dict) -> bool:
     return True
 
 
+class HoldExists(Exception):
+    """The application already has a live seat hold (and payment in progress)."""
+
+
+def _refuse_second_hold(app):
+    # Call after expiring the application's overdue holds: any HELD one left
+    # is live, and a second would break unique_active_hold_per_application
+    if SeatHold.objects.filter(application=app, status=SeatHoldStatus.HELD).exists():
+        raise HoldExists
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class AdmissionPaymentCreate(APIView):
     """
     Public endpoint to initiate a payment:
 
-      - Atomically create a seat HOLD if capacity allows
+      - Atomically create a seat HOLD if capacity allows (under a Batch row
+        lock, or checked in Redis first when SEAT_RESERVATION_REDIS_URL is set;
+        see admissions.reservations)
       - Create Payment (status REDIRECTED)
       - Start SSL session and return GatewayPageURL
     """
@@ -97,55 +115,28 @@ class AdmissionPaymentCreate(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request, application_id: int):
-        # 1) Atomically place a short-lived hold
-        with transaction.atomic():
-            app = get_object_or_404(
-                AdmissionApplication.objects.select_for_update(),
-                pk=application_id,
-            )
-            batch = Batch.objects.select_for_update().get(pk=app.batch_id)
-
-            # Expire overdue holds
-            SeatHold.expire_overdue_now()
-            active_holds = SeatHold.active_count_for_batch(batch.id)
-
-            if batch.filled_seats + active_holds >= batch.total_seat:
-                return Response(
-                    {"detail": "Seats full for this batch."},
-                    status=status.HTTP_409_CONFLICT,
-                )
-
-            hold = SeatHold.objects.create(
-                application=app,
-                batch=batch,
-                expires_at=timezone.now()
-                + timezone.timedelta(minutes=HOLD_MINUTES),
-                status=SeatHoldStatus.HELD,
+        # 1) Place a short-lived hold
+        try:
+            if reservations.enabled():
+                placed = self._reserve_then_hold(application_id)
+            else:
+                placed = self._hold_under_batch_lock(application_id)
+        except HoldExists:
+            return Response(
+                {"detail": "A seat is already held for this application."},
+                status=status.HTTP_409_CONFLICT,
             )
-
-            # Create db payment row
-            pay = Payment.objects.create(
-                tran_id=None,  # will be replaced after SSL session init
-                amount=FIXED_ADMISSION_FEE,
-                currency="BDT",
-                created_by=None,
-                application_id=application_id,
-                status=PaymentStatus.REDIRECTED,
-                create_payload={
-                    "hold_token": hold.hold_token,
-                    "application_id": application_id,
-                },
-                gateway_response={},
+        if placed is None:
+            return Response(
+                {"detail": "Seats full for this batch."},
+                status=status.HTTP_409_CONFLICT,
             )
+        app, hold, pay = placed
 
         # 2) Call SSL outside the DB lock
         client = SSLCommerzClient()
         customer = {
-            "name": (
-                f"{app.student_first_name_en} {app.student_last_name_en}".strip()
-                if app.student_first_name_en
-                else "Student"
-            ),
+            "name": app.student_name or "Student",
             "email": app.student_email or "student@example.com",
             "phone": app.student_mobile or "01700000000",
             "address": "N/A",
@@ -160,6 +151,7 @@ class AdmissionPaymentCreate(APIView):
                 currency="BDT",
                 customer=customer,
                 product_name=f"Admission Fee - App #{application_id}",
+                meta={"tran_id": pay.tran_id},
             )
         except Exception as e:
             # Release the hold on any init error
@@ -173,8 +165,7 @@ class AdmissionPaymentCreate(APIView):
                     .first()
                 )
                 if h:
-                    h.status = SeatHoldStatus.CANCELLED
-                    h.save(update_fields=["status"])
+                    h.release(SeatHoldStatus.CANCELLED)
             return Response(
                 {"detail": "SSLCommerz init error", "error": str(e)},
                 status=status.HTTP_502_BAD_GATEWAY,
@@ -184,7 +175,7 @@ class AdmissionPaymentCreate(APIView):
         pay.tran_id = tran_id
         cp = pay.create_payload or {}
         cp.update(create_payload or {})
-        cp["hold_token"] = hold.hold_token
+        cp["hold_token"] = str(hold.hold_token)
         cp["application_id"] = application_id
         pay.create_payload = cp
         pay.gateway_response = gw_resp
@@ -200,6 +191,95 @@ class AdmissionPaymentCreate(APIView):
         )
 
 
+    def _hold_under_batch_lock(self, application_id):
+        """Capacity check and hold under a row lock on the Batch. None if full."""
+        with transaction.atomic():
+            app = get_object_or_404(
+                AdmissionApplication.objects.select_for_update(),
+                pk=application_id,
+            )
+            batch = Batch.objects.select_for_update().get(pk=app.batch_id)
+
+            # Only this application's own stale hold: a new HELD one would
+            # clash with it. Other overdue holds are left to the sweeper.
+            if SeatHold.expire_overdue_now(application_id=app.pk):
+                batch.refresh_from_db(fields=["held_seats"])
+            _refuse_second_hold(app)
+
+            # held_seats is read from the locked row; only when the batch
+            # looks full do we expire its lapsed holds the sweeper hasn't reached.
+            # PAID admissions stay an indexed COUNT (adm_app_batch_status_idx).
+            confirmed = batch.confirmed_seats
+            if confirmed + batch.held_seats >= batch.total_seat and SeatHold.expire_overdue_now(
+                batch_id=batch.id
+            ):
+                batch.refresh_from_db(fields=["held_seats"])
+            if confirmed + batch.held_seats >= batch.total_seat:
+                return None
+
+            hold = SeatHold.place(
+                app,
+                batch,
+                expires_at=timezone.now() + timezone.timedelta(minutes=HOLD_MINUTES),
+            )
+            return app, hold, self._create_payment(application_id, hold)
+
+    def _reserve_then_hold(self, application_id):
+        """
+        Capacity check in Redis (admissions.reservations), then the durable
+        hold without writing (or locking) the Batch row: held_seats is bumped
+        after commit. None if full.
+        """
+        app = get_object_or_404(
+            AdmissionApplication.objects.select_related("batch"), pk=application_id
+        )
+        expires_at = timezone.now() + timezone.timedelta(minutes=HOLD_MINUTES)
+        try:
+            reserved = reservations.reserve(app.batch, app.pk, expires_at)
+        except reservations.Unavailable:
+            logger.warning("Seat reservation engine unavailable; using row locks")
+            return self._hold_under_batch_lock(application_id)
+        if reserved == reservations.FULL:
+            return None
+
+        placed = None
+        try:
+            with transaction.atomic():
+                app = AdmissionApplication.objects.select_for_update().get(pk=app.pk)
+                SeatHold.expire_overdue_now(application_id=app.pk)
+                _refuse_second_hold(app)
+                # Redis serializes the winners; this plain read catches a
+                # Redis that has drifted from Postgres (flush, eviction,
+                # failover, holds placed on the row-lock path while it was down)
+                batch = Batch.objects.with_availability().get(pk=app.batch_id)
+                if not batch.available_seats:
+                    logger.warning("Seat reservation for full batch %s refused by Postgres", batch.pk)
+                    return None
+                hold = SeatHold.place(app, batch, expires_at=expires_at, count_after_commit=True)
+                placed = app, hold, self._create_payment(application_id, hold)
+                return placed
+        finally:
+            # ALREADY_HELD is the application's own earlier reservation; keep it
+            if placed is None and reserved == reservations.RESERVED:
+                reservations.release(app.batch_id, app.pk)
+
+    @staticmethod
+    def _create_payment(application_id, hold):
+        return Payment.objects.create(
+            # Sent to SSLCommerz as our tran_id (start_payment meta)
+            tran_id=uuid.uuid4().hex,
+            amount=FIXED_ADMISSION_FEE,
+            currency="BDT",
+            application_id=application_id,
+            status=PaymentStatus.REDIRECTED,
+            create_payload={
+                "hold_token": str(hold.hold_token),
+                "application_id": application_id,
+            },
+            gateway_response={},
+        )
+
+
 @method_decorator(csrf_exempt, name="dispatch")
 class SSLSuccessView(APIView):
     """
@@ -396,5 +476,4 @@ def _release_hold_from_pay(pay: Payment):
             .first()
         )
         if h:
-            h.status = SeatHoldStatus.CANCELLED
-            h.save(update_fields=["status"])
+            h.release(SeatHoldStatus.CANCELLED)
@@ -0,0 +1,20 @@
+# Backend/smw/celery.py
+"""
+Celery app for background jobs (photo thumbnails, sweeps, queued intake).
+
+    celery -A smw worker -l info
+    celery -A smw beat -l info
+
+Configured from the CELERY_* Django settings. Without CELERY_BROKER_URL tasks
+run eagerly in-process (see CELERY_TASK_ALWAYS_EAGER in settings).
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "smw.settings")
+
+app = Celery("smw")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
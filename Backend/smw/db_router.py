@@ -0,0 +1,114 @@
+# Backend/smw/db_router.py
+
+"""
+Primary / read-replica routing.
+
+Replicas are configured with DB_REPLICA_HOSTS (see settings). Reads go to a
+replica only while a view that opted in with `read_from_replica = True`
+is handling a GET/HEAD; everything else (writes, other views, Celery,
+management commands) uses the primary.
+
+One replica is picked per request, so every read of a response (ETag
+aggregate, rows, prefetches) sees the same replication lag.
+
+Read-your-writes: any unsafe request sets a short-lived pin cookie, and a
+pinned client reads from the primary until it expires, so a dashboard
+reload right after a change never sees replica lag.
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = "smw_db_pin"
+REPLICA_PREFIX = "replica"
+
+# Replica alias the current request reads from; None = primary
+_replica = ContextVar("replica", default=None)
+
+
+def replica_aliases():
+    """Configured replica aliases; empty when running against the primary only."""
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # Related lookups / prefetches follow the object they start from
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        replica = _replica.get()
+        # Inside a transaction on the primary, keep reads consistent with it
+        if replica is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so objects from either can be related
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """Turns replica reads on for opted-in safe views, and pins after writes."""
+
+    SAFE_METHODS = ("GET", "HEAD")
+    # Runs natively under ASGI too (the seat stream), without a thread hop
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _replica.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.reset(token)
+        return self.pin_after_write(request, response)
+
+    async def __acall__(self, request):
+        token = _replica.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica.reset(token)
+        return self.pin_after_write(request, response)
+
+    def pin_after_write(self, request, response):
+        if request.method not in self.SAFE_METHODS + ("OPTIONS",) and replica_aliases():
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.DB_REPLICA_PIN_SECONDS,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None) or getattr(view_func, "cls", None)
+        replicas = replica_aliases()
+        if (
+            replicas
+            and request.method in self.SAFE_METHODS
+            and getattr(view_class, "read_from_replica", False)
+            and not request.COOKIES.get(PIN_COOKIE)
+        ):
+            _replica.set(random.choice(replicas))
+        return None
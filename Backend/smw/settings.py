@@ -4,12 +4,23 @@ from decimal import Decimal
 import os
 from dotenv import load_dotenv
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
 
 ADMISSION_FEE_BDT = Decimal(os.getenv("ADMISSION_FEE_BDT", "4625.00"))
 SEAT_HOLD_MINUTES = int(os.getenv("SEAT_HOLD_MINUTES", "10"))
+ADMISSIONS_PAGE_SIZE = int(os.getenv("ADMISSIONS_PAGE_SIZE", "50"))
+ADMISSIONS_MAX_PAGE_SIZE = int(os.getenv("ADMISSIONS_MAX_PAGE_SIZE", "200"))
+ADMISSIONS_SEARCH_LIMIT = int(os.getenv("ADMISSIONS_SEARCH_LIMIT", "50"))
+ADMISSIONS_EXPORT_CHUNK_SIZE = int(os.getenv("ADMISSIONS_EXPORT_CHUNK_SIZE", "2000"))
+ADMISSION_PHOTO_MAX_BYTES = int(os.getenv("ADMISSION_PHOTO_MAX_BYTES", str(5 * 1024 * 1024)))
+ADMISSION_THUMBNAIL_SIZE = int(os.getenv("ADMISSION_THUMBNAIL_SIZE", "320"))
+ADMISSION_IDEMPOTENCY_TTL_HOURS = int(os.getenv("ADMISSION_IDEMPOTENCY_TTL_HOURS", "24"))
+ADMISSION_IDEMPOTENCY_PRUNE_SECONDS = int(os.getenv("ADMISSION_IDEMPOTENCY_PRUNE_SECONDS", "3600"))
+ADMISSIONS_BULK_APPROVE_MAX = int(os.getenv("ADMISSIONS_BULK_APPROVE_MAX", "2000"))
+ADMISSION_INTAKE_TICKET_TTL_HOURS = int(os.getenv("ADMISSION_INTAKE_TICKET_TTL_HOURS", "72"))
 # ---------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------
@@ -71,6 +82,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     # Third-party
     "rest_framework",
@@ -124,6 +136,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "smw.db_router.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = "smw.urls"
@@ -159,6 +172,29 @@ DATABASES = {
     }
 }
 
+# Optional read replicas: comma-separated host[:port], same database name and
+# credentials as the primary. Only views marked read_from_replica use them
+# (see smw/db_router.py).
+for _n, _replica in enumerate(_get_csv("DB_REPLICA_HOSTS"), start=1):
+    _host, _, _port = _replica.partition(":")
+    DATABASES[f"replica_{_n}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Past admission seasons moved out by `manage.py archive_admissions`; same
+# database, archive schema first (see admissions/archive.py)
+DATABASES["archive"] = {
+    **DATABASES["default"],
+    "OPTIONS": {"options": "-c search_path=archive,public"},
+}
+
+DATABASE_ROUTERS = ["smw.db_router.PrimaryReplicaRouter"]
+# After a write, the same client reads from the primary for this long
+DB_REPLICA_PIN_SECONDS = int(os.getenv("DB_REPLICA_PIN_SECONDS", "15"))
+
 # ---------------------------------------------------------------------
 # Password validation
 # ---------------------------------------------------------------------
@@ -191,6 +227,7 @@ MEDIA_ROOT = BASE_DIR / "media"
 CORS_ALLOWED_ORIGINS = _get_csv("CORS_ALLOWED_ORIGINS")
 CORS_ALLOWED_ORIGIN_REGEXES = _get_csv("CORS_ALLOWED_ORIGIN_REGEXES")
 CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
 
 # ---------------------------------------------------------------------
 # Celery (optional)
@@ -198,6 +235,58 @@ CORS_ALLOW_CREDENTIALS = True
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "")
 CELERY_TIMEZONE = TIME_ZONE
+# No broker configured → run tasks inline so dev / tests work without a worker
+CELERY_TASK_ALWAYS_EAGER = _get_bool(
+    "CELERY_TASK_ALWAYS_EAGER", "false" if CELERY_BROKER_URL else "true"
+)
+
+# Queued intake: AdmissionApply only checks the payload, stores it and returns
+# 202 with a ticket; workers create the application (admissions/intake.py).
+ADMISSIONS_QUEUED_INTAKE = _get_bool("ADMISSIONS_QUEUED_INTAKE", "false")
+# Celery rate limit per worker for draining tickets, e.g. "20/s"; empty = none
+ADMISSION_INTAKE_RATE_LIMIT = os.getenv("ADMISSION_INTAKE_RATE_LIMIT", "") or None
+# Pending tickets untouched this long are sent to the workers again
+ADMISSION_INTAKE_STALE_MINUTES = int(os.getenv("ADMISSION_INTAKE_STALE_MINUTES", "15"))
+ADMISSION_INTAKE_REQUEUE_SECONDS = int(os.getenv("ADMISSION_INTAKE_REQUEUE_SECONDS", "120"))
+ADMISSION_INTAKE_PRUNE_SECONDS = int(os.getenv("ADMISSION_INTAKE_PRUNE_SECONDS", "3600"))
+
+# Seat-hold expiry sweep; run `celery -A smw beat` next to the workers
+ADMISSIONS_HOLD_SWEEP_SECONDS = int(os.getenv("ADMISSIONS_HOLD_SWEEP_SECONDS", "60"))
+ADMISSIONS_HOLD_SWEEP_CHUNK = int(os.getenv("ADMISSIONS_HOLD_SWEEP_CHUNK", "500"))
+ADMISSIONS_HOLD_SWEEP_MAX_CHUNKS = int(os.getenv("ADMISSIONS_HOLD_SWEEP_MAX_CHUNKS", "20"))
+
+# Optional Redis seat reservation engine for AdmissionPaymentCreate
+# (admissions/reservations.py); empty = capacity checks under Postgres row locks
+SEAT_RESERVATION_REDIS_URL = os.getenv("SEAT_RESERVATION_REDIS_URL", "")
+SEAT_RESERVATION_RECONCILE_SECONDS = int(os.getenv("SEAT_RESERVATION_RECONCILE_SECONDS", "60"))
+
+# Live seat counts for open admission forms over SSE (courses_app/seat_stream.py);
+# needs the ASGI app (smw.asgi:application). Empty = no stream
+SEAT_STREAM_REDIS_URL = os.getenv("SEAT_STREAM_REDIS_URL", "")
+SEAT_STREAM_KEEPALIVE_SECONDS = int(os.getenv("SEAT_STREAM_KEEPALIVE_SECONDS", "20"))
+
+CELERY_BEAT_SCHEDULE = {
+    "expire-seat-holds": {
+        "task": "admissions.tasks.expire_seat_holds",
+        "schedule": ADMISSIONS_HOLD_SWEEP_SECONDS,
+    },
+    "requeue-stale-intake-tickets": {
+        "task": "admissions.tasks.requeue_stale_intake_tickets",
+        "schedule": ADMISSION_INTAKE_REQUEUE_SECONDS,
+    },
+    "prune-intake-tickets": {
+        "task": "admissions.tasks.prune_intake_tickets",
+        "schedule": ADMISSION_INTAKE_PRUNE_SECONDS,
+    },
+    "prune-idempotency-keys": {
+        "task": "admissions.tasks.prune_idempotency_keys",
+        "schedule": ADMISSION_IDEMPOTENCY_PRUNE_SECONDS,
+    },
+    "reconcile-seat-reservations": {
+        "task": "admissions.tasks.reconcile_seat_reservations",
+        "schedule": SEAT_RESERVATION_RECONCILE_SECONDS,
+    },
+}
 
 # ---------------------------------------------------------------------
 # Email (optional)
@@ -0,0 +1,74 @@
+# Backend/smw/tests.py
+from unittest import mock
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from admissions.models import AdmissionApplication
+from admissions.views import AdmissionApply, AdmissionList
+from smw import db_router
+
+
+@mock.patch.object(db_router, "replica_aliases", return_value=["replica_1"])
+@mock.patch.object(db_router, "connections", {"default": mock.Mock(in_atomic_block=False)})
+class ReplicaRoutingTests(SimpleTestCase):
+    def run_view(self, request, view_class, reads=1):
+        """Run the middleware around a view; returns (response, alias read from)."""
+        seen = {}
+
+        def view(req):
+            router = db_router.PrimaryReplicaRouter()
+            aliases = {router.db_for_read(AdmissionApplication) for _ in range(reads)}
+            (seen["alias"],) = aliases
+            return HttpResponse()
+
+        view.view_class = view_class
+        middleware = db_router.ReplicaRoutingMiddleware(lambda req: (
+            middleware.process_view(req, view, (), {}) or view(req)
+        ))
+        return middleware(request), seen["alias"]
+
+    def test_opted_in_get_reads_from_replica(self, _replicas):
+        _, alias = self.run_view(RequestFactory().get("/"), AdmissionList)
+        self.assertEqual(alias, "replica_1")
+        # Outside the request everything is back on the primary
+        self.assertEqual(db_router.PrimaryReplicaRouter().db_for_read(AdmissionApplication), "default")
+
+    def test_writes_and_other_views_stay_on_primary(self, _replicas):
+        response, alias = self.run_view(RequestFactory().post("/"), AdmissionApply)
+        self.assertEqual(alias, "default")
+        self.assertIn(db_router.PIN_COOKIE, response.cookies)
+        _, alias = self.run_view(RequestFactory().get("/"), AdmissionApply)
+        self.assertEqual(alias, "default")
+
+    def test_one_replica_per_request(self, replicas):
+        replicas.return_value = ["replica_1", "replica_2"]
+        # run_view fails if the 20 reads were spread over both replicas
+        _, alias = self.run_view(RequestFactory().get("/"), AdmissionList, reads=20)
+        self.assertIn(alias, replicas.return_value)
+
+    def test_async_stack_keeps_the_replica_for_the_request(self, _replicas):
+        seen = {}
+
+        async def view(req):
+            seen["alias"] = db_router.PrimaryReplicaRouter().db_for_read(AdmissionApplication)
+            return HttpResponse()
+
+        view.view_class = AdmissionList
+
+        async def get_response(req):
+            return middleware.process_view(req, view, (), {}) or await view(req)
+
+        middleware = db_router.ReplicaRoutingMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = async_to_sync(middleware)(RequestFactory().post("/"))
+        self.assertIn(db_router.PIN_COOKIE, response.cookies)
+        async_to_sync(middleware)(RequestFactory().get("/"))
+        self.assertEqual(seen["alias"], "replica_1")
+
+    def test_pinned_client_reads_from_primary(self, _replicas):
+        request = RequestFactory().get("/")
+        request.COOKIES[db_router.PIN_COOKIE] = "1"
+        _, alias = self.run_view(request, AdmissionList)
+        self.assertEqual(alias, "default")
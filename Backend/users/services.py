@@ -1,14 +1,30 @@
 # Backend/users/services.py
+from django.db import connection
 from django.db.models import Max
 from .models import UserProfile
 
+def student_uid_prefix(admission_year: int, school_code: str, class_name: str, batch_number: str) -> str:
+    yy = str(admission_year)[-2:]
+    return f"{yy}-{school_code}-{class_name}-B{batch_number}-"
+
+def allocate_student_uids(admission_year: int, school_code: str, class_name: str, batch_number: str, count: int) -> list[str]:
+    """
+    Reserve `count` consecutive UIDs for one (year, school, class, batch).
+
+    Holds a transaction-scoped advisory lock on the prefix, so concurrent
+    approvals queue up instead of handing out the same numbers. Must be
+    called inside a transaction; the lock is released on commit.
+    """
+    prefix = student_uid_prefix(admission_year, school_code, class_name, batch_number)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [prefix])
+    current = UserProfile.objects.filter(student_uid__startswith=prefix).aggregate(m=Max("student_uid")).get("m")
+    last = int(current.split("-")[-1]) if current else 0
+    return [prefix + f"{n:04d}" for n in range(last + 1, last + 1 + count)]
+
 def generate_student_uid(admission_year: int, school_code: str, class_name: str, batch_number: str) -> str:
     """
     UID = YY-SCH-CLS-B<batch>-NNNN
     Sequence resets per (year, school, class, batch).
     """
-    yy = str(admission_year)[-2:]
-    prefix = f"{yy}-{school_code}-{class_name}-B{batch_number}-"
-    current = UserProfile.objects.filter(student_uid__startswith=prefix).aggregate(m=Max("student_uid")).get("m")
-    last = int(current.split("-")[-1]) if current else 0
-    return prefix + f"{last + 1:04d}"
+    return allocate_student_uids(admission_year, school_code, class_name, batch_number, 1)[0]
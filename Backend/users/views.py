@@ -31,6 +31,7 @@ class ProfileView(APIView):
 # ---------- Admin/staff: list users ----------
 class UserListView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsAdminOrStaff]
+    read_from_replica = True
 
     def get(self, request):
         # light list with optional search
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { useForm } from "react-hook-form";
 import { zodResolver } from "@hookform/resolvers/zod";
 import * as z from "zod";
@@ -235,10 +235,52 @@ type PublicBatch = {
   class_name?: string | null;
   grade_level?: string | null;
   group_name?: string | null;
+  available_seats?: number | null;
 };
 
 type BatchOptionsMap = Record<string, { value: string; label: string }[]>;
 
+// Pushed by /public/batches/stream/ whenever seat holds change
+type SeatsEvent = {
+  batches: { id: number; available_seats: number }[];
+};
+
+const seatsLeftLabel = (seatsLeft: number | undefined) =>
+  seatsLeft === undefined
+    ? ""
+    : seatsLeft > 0
+      ? ` (${seatsLeft} seat${seatsLeft === 1 ? "" : "s"} left)`
+      : " (Full)";
+
+type IntakeTicket = {
+  ticket: string;
+  status: "QUEUED" | "PROCESSING" | "DONE" | "FAILED";
+  application?: unknown;
+  errors?: unknown;
+};
+
+const INTAKE_POLL_LIMIT = 90;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Surge mode: the API answers 202 with a ticket; wait for the worker to finish it.
+const waitForIntakeTicket = async (ticket: IntakeTicket): Promise<IntakeTicket> => {
+  let current = ticket;
+  for (let attempt = 0; attempt < INTAKE_POLL_LIMIT; attempt += 1) {
+    if (current.status === "DONE" || current.status === "FAILED") {
+      return current;
+    }
+    await sleep(2000);
+    const response = await fetch(buildApiUrl(`/admissions/intake/${ticket.ticket}/`));
+    if (response.ok) {
+      current = await response.json();
+    }
+  }
+  throw new Error(
+    "Your application is still being processed. Please check back in a few minutes."
+  );
+};
+
 const CLASS_MATCHERS: { regex: RegExp; value: string }[] = [
   { regex: /class\s*-?\s*8|\b8\b|viii/i, value: "class-8" },
   { regex: /class\s*-?\s*9|\b9\b|ix/i, value: "class-9" },
@@ -265,6 +307,8 @@ const mapClassNameToFormValue = (
 export default function AdmissionForm() {
   const [photoPreview, setPhotoPreview] = useState<string | null>(null);
   const [isSubmitting, setIsSubmitting] = useState(false);
+  // Reused while the payload is unchanged so retries can't create duplicates
+  const idempotencyRef = useRef<{ body: string; key: string } | null>(null);
   const [showConfirmation, setShowConfirmation] = useState(false);
   const [submittedData, setSubmittedData] = useState<FormData | null>(null);
   const [activeSection, setActiveSection] = useState("personal");
@@ -273,6 +317,7 @@ export default function AdmissionForm() {
   const [batchLabelLookup, setBatchLabelLookup] = useState<
     Record<string, string>
   >({});
+  const [seatsLeft, setSeatsLeft] = useState<Record<string, number>>({});
   const [batchesLoading, setBatchesLoading] = useState(true);
   const [batchLoadError, setBatchLoadError] = useState<string | null>(null);
   const [submissionError, setSubmissionError] = useState<string | null>(null);
@@ -462,6 +507,7 @@ export default function AdmissionForm() {
 
         const grouped: BatchOptionsMap = {};
         const labels: Record<string, string> = {};
+        const seats: Record<string, number> = {};
 
         data.forEach((batch) => {
           const classKey =
@@ -492,6 +538,9 @@ export default function AdmissionForm() {
           }
           grouped[classKey].push({ value: optionValue, label });
           labels[optionValue] = label;
+          if (typeof batch.available_seats === "number") {
+            seats[optionValue] = batch.available_seats;
+          }
         });
 
         Object.keys(grouped).forEach((key) => {
@@ -502,6 +551,8 @@ export default function AdmissionForm() {
 
         setBatchOptionsByClass(grouped);
         setBatchLabelLookup(labels);
+        setSeatsLeft(seats);
+        listenForSeatChanges();
       } catch (error) {
         if (!cancelled) {
           console.error("Failed to load batches", error);
@@ -518,10 +569,31 @@ export default function AdmissionForm() {
       }
     };
 
+    // Live counts while the form is open; without the stream (204 or an
+    // error) the picker keeps the counts fetched above.
+    let stream: EventSource | null = null;
+    const listenForSeatChanges = () => {
+      if (typeof EventSource === "undefined") return;
+      stream = new EventSource(buildApiUrl("/public/batches/stream/"));
+      stream.addEventListener("seats", (event) => {
+        const { batches } = JSON.parse(
+          (event as MessageEvent<string>).data
+        ) as SeatsEvent;
+        setSeatsLeft((current) => {
+          const next = { ...current };
+          batches.forEach((batch) => {
+            next[String(batch.id)] = batch.available_seats;
+          });
+          return next;
+        });
+      });
+    };
+
     fetchBatches();
 
     return () => {
       cancelled = true;
+      stream?.close();
     };
   }, []);
 
@@ -771,13 +843,19 @@ export default function AdmissionForm() {
     const payload = buildSubmissionPayload(data);
     logSubmissionPayload(payload);
 
+    const body = JSON.stringify(payload);
+    if (idempotencyRef.current?.body !== body) {
+      idempotencyRef.current = { body, key: crypto.randomUUID() };
+    }
+
     try {
       const response = await fetch(buildApiUrl("/admissions/apply/"), {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
+          "Idempotency-Key": idempotencyRef.current.key,
         },
-        body: JSON.stringify(payload),
+        body,
       });
 
       if (!response.ok) {
@@ -788,7 +866,16 @@ export default function AdmissionForm() {
         );
       }
 
-      await response.json();
+      const result = await response.json();
+      if (response.status === 202) {
+        const ticket = await waitForIntakeTicket(result as IntakeTicket);
+        if (ticket.status === "FAILED") {
+          throw new Error(
+            extractSubmissionError(ticket.errors) ||
+              "We could not save your application. Please try again."
+          );
+        }
+      }
       setSubmittedData(data);
       setShowConfirmation(true);
     } catch (error) {
@@ -1738,8 +1825,14 @@ export default function AdmissionForm() {
                                       {placeholder}
                                     </option>
                                     {classOptions.map((opt) => (
-                                      <option key={opt.value} value={opt.value}>
-                                        {opt.label}
+                                      <option
+                                        key={opt.value}
+                                        value={opt.value}
+                                        disabled={seatsLeft[opt.value] === 0}
+                                      >
+                                        {`${opt.label}${seatsLeftLabel(
+                                          seatsLeft[opt.value]
+                                        )}`}
                                       </option>
                                     ))}
                                   </select>
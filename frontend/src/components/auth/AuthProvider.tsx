@@ -253,13 +253,15 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
           headers.set('Authorization', `Bearer ${token}`)
         }
       }
-      let response = await fetch(input, { ...init, headers })
+      // Carries the API's short-lived read-your-writes cookie across origins
+      const credentials = init?.credentials ?? 'include'
+      let response = await fetch(input, { ...init, headers, credentials })
 
       if (response.status === 401 && !options?.skipAuth) {
         const refreshed = await refreshAccessToken()
         if (refreshed) {
           headers.set('Authorization', `Bearer ${refreshed}`)
-          response = await fetch(input, { ...init, headers })
+          response = await fetch(input, { ...init, headers, credentials })
         }
       }
 
@@ -41,6 +41,24 @@ const timeFormatter = new Intl.DateTimeFormat('en-US', {
 
 type AdmissionApplication = AdmissionApplicationRecord
 
+// Only the columns the table shows; the detail page loads the full record
+const LIST_QUERY = new URLSearchParams({
+  fields: [
+    'id',
+    'student_name',
+    'picture',
+    'picture_thumbnail',
+    'current_class',
+    'batch',
+    'student_mobile',
+    'student_email',
+    'status',
+    'created_at',
+    'updated_at',
+  ].join(','),
+  expand: 'batch_detail',
+}).toString()
+
 export function AdmissionApplicationsPage() {
   const { fetchWithAuth } = useAuth()
   const [applications, setApplications] = React.useState<AdmissionApplication[]>([])
@@ -51,7 +69,7 @@ export function AdmissionApplicationsPage() {
     setLoading(true)
     setError(null)
     try {
-      const response = await fetchWithAuth(buildApiUrl('/admissions/'))
+      const response = await fetchWithAuth(buildApiUrl(`/admissions/?${LIST_QUERY}`))
       if (!response.ok) {
         let message = response.statusText || 'Failed to load applications.'
         try {
@@ -225,7 +243,10 @@ function createApplicationColumns(
       render: (application) => (
         <div className="flex items-center gap-3">
           <Avatar className="h-10 w-10 ring-2 ring-background">
-            <AvatarImage src={application.picture} alt={application.studentName} />
+            <AvatarImage
+              src={application.pictureThumbnail ?? application.picture ?? undefined}
+              alt={application.studentName}
+            />
             <AvatarFallback>{initials(application.studentName)}</AvatarFallback>
           </Avatar>
           <div className="flex flex-col">
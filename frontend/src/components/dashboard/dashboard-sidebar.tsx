@@ -73,12 +73,12 @@ export function DashboardSidebar({ open, onClose, pathname }: DashboardSidebarPr
 
     const loadCounts = async () => {
       try {
-        const response = await fetchWithAuth(buildApiUrl('/admissions/'))
+        const response = await fetchWithAuth(buildApiUrl('/admissions/stats/?days=1'))
         if (!response.ok) {
           return
         }
         const data = await response.json()
-        const admissionsCount = Array.isArray(data) ? data.length : 0
+        const admissionsCount = typeof data?.total === 'number' ? data.total : 0
         if (!cancelled) {
           setCounts((prev) => ({ ...prev, admissions: admissionsCount }))
         }
@@ -39,6 +39,7 @@ export type AdmissionApplicationRecord = {
   homeLocation?: string | null
   homeDistrict?: string | null
   picture?: string | null
+  pictureThumbnail?: string | null
   isSubmitted: boolean
   isReviewed: boolean
   isApproved: boolean
@@ -99,6 +100,7 @@ export type AdmissionApplicationApi = {
   student_email?: string | null
   home_location?: string | null
   picture?: string | null
+  picture_thumbnail?: string | null
   hear_about_us?: string | null
   prev_student?: boolean
   status?: string | null
@@ -186,6 +188,7 @@ export function mapAdmissionApplication(api: AdmissionApplicationApi): Admission
     homeLocation: api.home_location ?? null,
     homeDistrict: api.home_district ?? null,
     picture: api.picture ?? null,
+    pictureThumbnail: api.picture_thumbnail ?? null,
     isSubmitted: true,
     isReviewed: Boolean(api.is_reviewed),
     isApproved: status === 'paid',